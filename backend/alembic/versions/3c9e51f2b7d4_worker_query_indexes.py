@@ -0,0 +1,52 @@
+"""Add partial/composite indexes for worker and dispatcher queries
+
+Revision ID: 3c9e51f2b7d4
+Revises: ad1aae5e1b71
+Create Date: 2024-03-05 09:41:17.530962
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e51f2b7d4'
+down_revision: Union[str, Sequence[str], None] = 'ad1aae5e1b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_call_logs_pending",
+            "call_logs",
+            ["business_id", "created_at"],
+            postgresql_where=sa.text("webhook_processed IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_notifications_retry_due",
+            "notifications",
+            ["business_id", "next_retry_at"],
+            postgresql_where=sa.text("status IN ('FAILED', 'RETRYING')"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_jobs_business_status_date",
+            "jobs",
+            ["business_id", "status", "scheduled_date"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_jobs_business_status_date", table_name="jobs", postgresql_concurrently=True)
+        op.drop_index("ix_notifications_retry_due", table_name="notifications", postgresql_concurrently=True)
+        op.drop_index("ix_call_logs_pending", table_name="call_logs", postgresql_concurrently=True)
@@ -0,0 +1,54 @@
+"""Generate time-ordered UUIDv7 primary keys for append-heavy tables
+
+Revision ID: 4a6c2e0b9d17
+Revises: e05a7d93c1f8
+Create Date: 2024-03-07 15:48:39.022715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a6c2e0b9d17'
+down_revision: Union[str, Sequence[str], None] = 'e05a7d93c1f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["jobs", "job_status_history", "notifications", "call_logs"]
+
+# Frozen copy of the function as of this revision
+UUID_V7_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid
+$$ LANGUAGE sql VOLATILE
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(UUID_V7_FUNCTION_SQL)
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=sa.text("uuid_generate_v7()"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=None)
+    op.execute("DROP FUNCTION IF EXISTS uuid_generate_v7()")
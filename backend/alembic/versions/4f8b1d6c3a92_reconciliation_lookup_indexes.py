@@ -0,0 +1,61 @@
+"""Cover the reconciler's call-log lookup and index jobs by source call
+
+Revision ID: 4f8b1d6c3a92
+Revises: 8d4c2a7e9f13
+Create Date: 2024-03-15 10:38:04.291576
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8b1d6c3a92'
+down_revision: Union[str, Sequence[str], None] = '8d4c2a7e9f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # Swap the unique index for a covering one (build, drop, rename) so
+        # uniqueness is enforced throughout
+        op.create_index(
+            "ix_call_logs_external_call_id_covering",
+            "call_logs",
+            ["external_call_id"],
+            unique=True,
+            postgresql_include=["id", "webhook_processed"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_call_logs_external_call_id", table_name="call_logs", postgresql_concurrently=True)
+        op.execute(
+            "ALTER INDEX ix_call_logs_external_call_id_covering RENAME TO ix_call_logs_external_call_id"
+        )
+        op.create_index(
+            "ix_jobs_source_call_id",
+            "jobs",
+            ["source_call_id"],
+            postgresql_where=sa.text("source_call_id IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_jobs_source_call_id", table_name="jobs", postgresql_concurrently=True)
+        op.create_index(
+            "ix_call_logs_external_call_id_plain",
+            "call_logs",
+            ["external_call_id"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_call_logs_external_call_id", table_name="call_logs", postgresql_concurrently=True)
+        op.execute(
+            "ALTER INDEX ix_call_logs_external_call_id_plain RENAME TO ix_call_logs_external_call_id"
+        )
@@ -0,0 +1,39 @@
+"""Make call_logs.was_reconciled NOT NULL with a false default
+
+Revision ID: 5a3e9c7f1d28
+Revises: 4f8b1d6c3a92
+Create Date: 2024-03-15 14:02:51.736419
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a3e9c7f1d28'
+down_revision: Union[str, Sequence[str], None] = '4f8b1d6c3a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("UPDATE call_logs SET was_reconciled = false WHERE was_reconciled IS NULL")
+    op.alter_column(
+        "call_logs", "was_reconciled",
+        existing_type=sa.Boolean(),
+        nullable=False,
+        server_default=sa.false(),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "call_logs", "was_reconciled",
+        existing_type=sa.Boolean(),
+        nullable=True,
+        server_default=None,
+    )
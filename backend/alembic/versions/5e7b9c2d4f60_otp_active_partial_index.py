@@ -0,0 +1,44 @@
+"""Index unverified OTP codes by (phone, code)
+
+Revision ID: 5e7b9c2d4f60
+Revises: c2f8e4a61b93
+Create Date: 2024-03-11 16:02:19.448217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7b9c2d4f60'
+down_revision: Union[str, Sequence[str], None] = 'c2f8e4a61b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_otp_codes_active",
+            "otp_codes",
+            ["phone", "code"],
+            postgresql_where=sa.text("verified = false"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_otp_codes_phone_hash", table_name="otp_codes", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_otp_codes_phone_hash",
+            "otp_codes",
+            ["phone"],
+            postgresql_using="hash",
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_otp_codes_active", table_name="otp_codes", postgresql_concurrently=True)
@@ -0,0 +1,36 @@
+"""Index unassigned pending jobs by age for the escalation sweep
+
+Revision ID: 6b1e4d8a2f57
+Revises: d3a7f61c8e24
+Create Date: 2024-03-13 11:27:45.019384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b1e4d8a2f57'
+down_revision: Union[str, Sequence[str], None] = 'd3a7f61c8e24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_escalation_due",
+            "jobs",
+            ["business_id", "created_at"],
+            postgresql_where=sa.text("status = 'pending' AND technician_id IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_jobs_escalation_due", table_name="jobs", postgresql_concurrently=True)
@@ -0,0 +1,64 @@
+"""Rename job enum types and store enum values as labels
+
+Revision ID: 7f2d08c4e915
+Revises: 3c9e51f2b7d4
+Create Date: 2024-03-05 14:22:03.884510
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f2d08c4e915'
+down_revision: Union[str, Sequence[str], None] = '3c9e51f2b7d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (old type name, new type name, [(member name, value label), ...]), frozen
+# as of this revision
+ENUM_TYPES = [
+    ("jobstatus", "job_status", [
+        ("PENDING", "pending"),
+        ("SCHEDULED", "scheduled"),
+        ("DISPATCHED", "dispatched"),
+        ("EN_ROUTE", "en_route"),
+        ("IN_PROGRESS", "in_progress"),
+        ("COMPLETED", "completed"),
+        ("CANCELLED", "cancelled"),
+        ("AWAITING_PARTS", "awaiting_parts"),
+    ]),
+    ("jobpriority", "job_priority", [
+        ("LOW", "low"),
+        ("NORMAL", "normal"),
+        ("URGENT", "urgent"),
+        ("EMERGENCY", "emergency"),
+    ]),
+    ("jobsource", "job_source", [
+        ("CUSTOMER_APP", "customer_app"),
+        ("PHONE_AGENT", "phone_agent"),
+        ("ADMIN_DASHBOARD", "admin_dashboard"),
+        ("WEBSITE", "website"),
+    ]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for old_name, new_name, members in ENUM_TYPES:
+        op.execute(f"ALTER TYPE {old_name} RENAME TO {new_name}")
+        for name, value in members:
+            op.execute(
+                f"ALTER TYPE {new_name} RENAME VALUE '{name}' TO '{value}'"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for old_name, new_name, members in ENUM_TYPES:
+        for name, value in members:
+            op.execute(
+                f"ALTER TYPE {new_name} RENAME VALUE '{value}' TO '{name}'"
+            )
+        op.execute(f"ALTER TYPE {new_name} RENAME TO {old_name}")
@@ -0,0 +1,40 @@
+"""Include queued notifications in the retry-due index
+
+Revision ID: 8d4c2a7e9f13
+Revises: 6b1e4d8a2f57
+Create Date: 2024-03-14 16:05:22.648107
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4c2a7e9f13'
+down_revision: Union[str, Sequence[str], None] = '6b1e4d8a2f57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recreate_retry_due_index(statuses: str) -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_notifications_retry_due", table_name="notifications", postgresql_concurrently=True)
+        op.create_index(
+            "ix_notifications_retry_due",
+            "notifications",
+            ["business_id", "next_retry_at"],
+            postgresql_where=sa.text(f"status IN ({statuses})"),
+            postgresql_concurrently=True,
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_retry_due_index("'FAILED', 'RETRYING', 'PENDING'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_retry_due_index("'FAILED', 'RETRYING'")
@@ -0,0 +1,38 @@
+"""Replace otp_codes.phone B-tree index with a hash index
+
+Revision ID: 91d5b3f07a2e
+Revises: 4a6c2e0b9d17
+Create Date: 2024-03-08 09:17:55.310482
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '91d5b3f07a2e'
+down_revision: Union[str, Sequence[str], None] = '4a6c2e0b9d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_otp_codes_phone_hash",
+            "otp_codes",
+            ["phone"],
+            postgresql_using="hash",
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_otp_codes_phone", table_name="otp_codes", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index("ix_otp_codes_phone", "otp_codes", ["phone"], postgresql_concurrently=True)
+        op.drop_index("ix_otp_codes_phone_hash", table_name="otp_codes", postgresql_concurrently=True)
@@ -0,0 +1,59 @@
+"""Generate created_at / updated_at defaults in UTC
+
+Revision ID: 9b2f6e4d1a85
+Revises: 5a3e9c7f1d28
+Create Date: 2024-03-18 09:12:44.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2f6e4d1a85'
+down_revision: Union[str, Sequence[str], None] = '5a3e9c7f1d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMP_COLUMNS = [
+    ("businesses", "created_at"),
+    ("businesses", "updated_at"),
+    ("customers", "created_at"),
+    ("customers", "updated_at"),
+    ("customer_addresses", "created_at"),
+    ("otp_codes", "created_at"),
+    ("users", "created_at"),
+    ("users", "updated_at"),
+    ("technicians", "created_at"),
+    ("technicians", "updated_at"),
+    ("technician_skills", "created_at"),
+    ("schedule_blocks", "created_at"),
+    ("schedule_blocks", "updated_at"),
+    ("time_off", "created_at"),
+    ("slot_reservations", "created_at"),
+    ("jobs", "created_at"),
+    ("jobs", "updated_at"),
+    ("job_notes", "created_at"),
+    ("job_photos", "created_at"),
+    ("job_status_history", "created_at"),
+    ("notifications", "created_at"),
+    ("call_logs", "created_at"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Naive columns: stamp UTC wall time like the app's datetime.utcnow(),
+    # not the session time zone's
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table, column, server_default=sa.text("timezone('utc', now())")
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=sa.func.now())
@@ -0,0 +1,62 @@
+"""Use native integer/numeric/boolean types for counters and flags
+
+Revision ID: ad1aae5e1b71
+Revises:
+Create Date: 2024-03-04 10:12:41.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ad1aae5e1b71'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "jobs", "escalation_level",
+        type_=sa.SmallInteger(),
+        postgresql_using="escalation_level::smallint",
+    )
+    op.alter_column(
+        "jobs", "emergency_confidence_score",
+        type_=sa.Numeric(4, 3),
+        postgresql_using="emergency_confidence_score::numeric(4,3)",
+    )
+    op.alter_column(
+        "notifications", "retry_count",
+        type_=sa.SmallInteger(),
+        postgresql_using="retry_count::smallint",
+    )
+    op.alter_column(
+        "notifications", "max_retries",
+        type_=sa.SmallInteger(),
+        postgresql_using="max_retries::smallint",
+    )
+    op.alter_column(
+        "call_logs", "duration_seconds",
+        type_=sa.Integer(),
+        postgresql_using="duration_seconds::integer",
+    )
+    op.alter_column(
+        "call_logs", "was_reconciled",
+        type_=sa.Boolean(),
+        postgresql_using="was_reconciled::boolean",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column("call_logs", "was_reconciled", type_=sa.String(10))
+    op.alter_column("call_logs", "duration_seconds", type_=sa.String(10))
+    op.alter_column("notifications", "max_retries", type_=sa.String(10))
+    op.alter_column("notifications", "retry_count", type_=sa.String(10))
+    op.alter_column("jobs", "emergency_confidence_score", type_=sa.String(10))
+    op.alter_column("jobs", "escalation_level", type_=sa.String(10))
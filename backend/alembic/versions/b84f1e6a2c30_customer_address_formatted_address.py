@@ -0,0 +1,40 @@
+"""Add customer_addresses.formatted_address
+
+Revision ID: b84f1e6a2c30
+Revises: 7f2d08c4e915
+Create Date: 2024-03-06 11:05:48.271934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b84f1e6a2c30'
+down_revision: Union[str, Sequence[str], None] = '7f2d08c4e915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "customer_addresses",
+        sa.Column("formatted_address", sa.String(400), nullable=True),
+    )
+    # Backfill with the same format as CustomerAddress.format_address()
+    op.execute(
+        """
+        UPDATE customer_addresses
+        SET formatted_address = street
+            || CASE WHEN unit IS NOT NULL AND unit <> '' THEN ', Unit ' || unit ELSE '' END
+            || ', ' || city || ', ' || state || ' ' || zip_code
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("customer_addresses", "formatted_address")
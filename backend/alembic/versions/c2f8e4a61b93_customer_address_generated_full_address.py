@@ -0,0 +1,48 @@
+"""Replace formatted_address with a generated full_address column
+
+Revision ID: c2f8e4a61b93
+Revises: 91d5b3f07a2e
+Create Date: 2024-03-11 13:26:40.771058
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f8e4a61b93'
+down_revision: Union[str, Sequence[str], None] = '91d5b3f07a2e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of the generated-column expression as of this revision
+FULL_ADDRESS_SQL = (
+    "street"
+    " || CASE WHEN unit IS NULL OR unit = '' THEN '' ELSE ', Unit ' || unit END"
+    " || ', ' || city || ', ' || state || ' ' || zip_code"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_column("customer_addresses", "formatted_address")
+    op.add_column(
+        "customer_addresses",
+        sa.Column(
+            "full_address",
+            sa.String(400),
+            sa.Computed(FULL_ADDRESS_SQL, persisted=True),
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        "customer_addresses",
+        sa.Column("formatted_address", sa.String(400), nullable=True),
+    )
+    op.execute("UPDATE customer_addresses SET formatted_address = full_address")
+    op.drop_column("customer_addresses", "full_address")
@@ -0,0 +1,53 @@
+"""Store users.role as a smallint code instead of a Postgres enum
+
+Revision ID: d3a7f61c8e24
+Revises: 5e7b9c2d4f60
+Create Date: 2024-03-12 09:41:57.302816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7f61c8e24'
+down_revision: Union[str, Sequence[str], None] = '5e7b9c2d4f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Role name -> smallint code, frozen as of this revision
+USER_ROLE_CODES = {
+    "OWNER": 1,
+    "ADMIN": 2,
+    "DISPATCHER": 3,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The old enum type stored member names ('OWNER', ...)
+    cases = " ".join(
+        f"WHEN '{role}' THEN {code}" for role, code in USER_ROLE_CODES.items()
+    )
+    op.alter_column(
+        "users", "role",
+        type_=sa.SmallInteger(),
+        postgresql_using=f"CASE role::text {cases} END",
+    )
+    op.execute("DROP TYPE userrole")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    labels = ", ".join(f"'{role}'" for role in USER_ROLE_CODES)
+    op.execute(f"CREATE TYPE userrole AS ENUM ({labels})")
+    cases = " ".join(
+        f"WHEN {code} THEN '{role}'" for role, code in USER_ROLE_CODES.items()
+    )
+    op.alter_column(
+        "users", "role",
+        type_=sa.Enum(name="userrole"),
+        postgresql_using=f"(CASE role {cases} END)::userrole",
+    )
@@ -0,0 +1,55 @@
+"""Generate created_at / updated_at defaults in the database
+
+Revision ID: e05a7d93c1f8
+Revises: b84f1e6a2c30
+Create Date: 2024-03-07 10:31:12.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e05a7d93c1f8'
+down_revision: Union[str, Sequence[str], None] = 'b84f1e6a2c30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMP_COLUMNS = [
+    ("businesses", "created_at"),
+    ("businesses", "updated_at"),
+    ("customers", "created_at"),
+    ("customers", "updated_at"),
+    ("customer_addresses", "created_at"),
+    ("otp_codes", "created_at"),
+    ("users", "created_at"),
+    ("users", "updated_at"),
+    ("technicians", "created_at"),
+    ("technicians", "updated_at"),
+    ("technician_skills", "created_at"),
+    ("schedule_blocks", "created_at"),
+    ("schedule_blocks", "updated_at"),
+    ("time_off", "created_at"),
+    ("slot_reservations", "created_at"),
+    ("jobs", "created_at"),
+    ("jobs", "updated_at"),
+    ("job_notes", "created_at"),
+    ("job_photos", "created_at"),
+    ("job_status_history", "created_at"),
+    ("notifications", "created_at"),
+    ("call_logs", "created_at"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=None)
@@ -10,7 +10,7 @@ from typing import Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
-from app.integrations.openai_client import OpenAIClient
+from app.integrations.openai_client import OpenAIClient, get_openai_client
 
 
 class UrgencyLevel(str, Enum):
@@ -83,7 +83,7 @@ class EmergencyDetector:
     """
     
     def __init__(self, openai_client: Optional[OpenAIClient] = None):
-        self.openai = openai_client or OpenAIClient()
+        self.openai = openai_client or get_openai_client()
         
         # Compile regex patterns for efficiency
         self.patterns = {}
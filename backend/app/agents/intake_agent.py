@@ -10,7 +10,7 @@ from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 from app.agents.emergency_detector import EmergencyDetector, UrgencyLevel
-from app.integrations.openai_client import OpenAIClient
+from app.integrations.openai_client import get_openai_client
 from app.config import get_settings
 
 settings = get_settings()
@@ -75,7 +75,7 @@ class IntakeAgent:
         self.business_id = business_id
         self.business_name = business_name
         self.db = db_session
-        self.openai = OpenAIClient()
+        self.openai = get_openai_client()
         self.emergency_detector = EmergencyDetector(self.openai)
         
         # Build the graph
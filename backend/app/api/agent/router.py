@@ -12,7 +12,8 @@ from app.models.business import Business
 from app.models.customer import Customer
 from app.agents.intake_agent import IntakeAgent
 from app.agents.emergency_detector import EmergencyDetector
-from app.integrations.vapi_client import VapiClient
+from app.services.customer_service import CustomerService
+from app.integrations.vapi_client import VapiClient, get_vapi_client
 
 agent_router = APIRouter()
 
@@ -122,13 +123,15 @@ async def get_call_token(
     db: AsyncSession = Depends(get_db),
     business: Business = Depends(get_current_business),
     customer: Customer = Depends(get_current_customer),
+    vapi: VapiClient = Depends(get_vapi_client),
 ):
     """
     Get a token for initiating a VoIP call through the app.
     The token includes customer context so the AI knows who's calling.
     """
     
-    vapi = VapiClient()
+    customer_service = CustomerService(db, business.id)
+    addresses = await customer_service.list_addresses(customer.id)
     
     # Build customer context
     customer_context = {
@@ -141,7 +144,7 @@ async def get_call_token(
                 "label": addr.label,
                 "full_address": addr.full_address,
             }
-            for addr in customer.addresses
+            for addr in addresses
         ],
     }
     
@@ -197,8 +197,6 @@ async def register_owner(
     )
     db.add(user)
     await db.commit()
-    await db.refresh(user)
-    await db.refresh(business)
     
     # Create token
     access_token = create_access_token(
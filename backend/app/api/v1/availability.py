@@ -113,12 +113,18 @@ async def reserve_slot(
         )
     
     # Create reservation
-    reservation = await schedule_service.reserve_slot(
-        customer_id=customer.id,
-        slot_date=data.date,
-        start_time=data.start_time,
-        end_time=data.end_time,
-    )
+    try:
+        reservation = await schedule_service.reserve_slot(
+            customer_id=customer.id,
+            slot_date=data.date,
+            start_time=data.start_time,
+            end_time=data.end_time,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     
     return SlotReservationResponse(
         reservation_token=reservation.reservation_token,
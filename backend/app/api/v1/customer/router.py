@@ -5,7 +5,7 @@ from typing import Optional, List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
 
@@ -161,10 +161,13 @@ async def update_profile(
     if data.app_platform is not None:
         customer.app_platform = data.app_platform
     
-    customer.updated_at = datetime.utcnow()
     customer.last_active_at = datetime.utcnow()
     await db.commit()
     
+    # Job listing pages embed the customer's name and contact details
+    if data.name is not None or data.email is not None:
+        await JobService(db, customer.business_id).invalidate_job_lists()
+    
     return {"message": "Profile updated"}
 
 
@@ -210,16 +213,16 @@ async def add_address(
     customer: Customer = Depends(get_current_customer),
 ):
     """Add a new address."""
-    # If this is set as default, unset other defaults
+    # If this is set as default, unset other defaults (one UPDATE)
     if data.is_default:
-        result = await db.execute(
-            select(CustomerAddress).where(
+        await db.execute(
+            update(CustomerAddress)
+            .where(
                 CustomerAddress.customer_id == customer.id,
                 CustomerAddress.is_default == True
             )
+            .values(is_default=False)
         )
-        for addr in result.scalars():
-            addr.is_default = False
     
     address = CustomerAddress(
         customer_id=customer.id,
@@ -236,7 +239,6 @@ async def add_address(
     
     db.add(address)
     await db.commit()
-    await db.refresh(address)
     
     return AddressResponse(
         id=str(address.id),
@@ -22,10 +22,13 @@ router = APIRouter()
 
 @router.get("/me", response_model=CustomerResponse)
 async def get_profile(
+    db: AsyncSession = Depends(get_db),
+    business: Business = Depends(get_current_business),
     customer: Customer = Depends(get_current_customer),
 ):
     """Get current customer's profile."""
-    return customer
+    customer_service = CustomerService(db, business.id)
+    return await customer_service.get_by_id(customer.id)
 
 
 @router.patch("/me", response_model=CustomerResponse)
@@ -52,10 +55,13 @@ async def update_profile(
 
 @router.get("/me/addresses", response_model=List[CustomerAddressResponse])
 async def list_addresses(
+    db: AsyncSession = Depends(get_db),
+    business: Business = Depends(get_current_business),
     customer: Customer = Depends(get_current_customer),
 ):
     """List customer's saved addresses."""
-    return customer.addresses
+    customer_service = CustomerService(db, business.id)
+    return await customer_service.list_addresses(customer.id)
 
 
 @router.post("/me/addresses", response_model=CustomerAddressResponse, status_code=status.HTTP_201_CREATED)
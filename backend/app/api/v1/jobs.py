@@ -1,9 +1,10 @@
 """Job endpoints for customer app."""
 
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -23,6 +24,9 @@ from app.services.notification_service import NotificationService
 
 router = APIRouter()
 
+# Validates a whole page of ORM jobs in one pydantic-core call
+_job_list_adapter = TypeAdapter(List[JobResponse])
+
 
 @router.post("", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 async def create_job(
@@ -37,7 +41,7 @@ async def create_job(
     """
     job_service = JobService(db, business.id)
     schedule_service = ScheduleService(db, business.id)
-    notification_service = NotificationService(db, business.id)
+    notification_service = NotificationService(db, business.id, business)
     
     # If reservation token provided, validate it
     if data.reservation_token:
@@ -87,7 +91,7 @@ async def create_job(
         await notification_service.notify_job_created(job, customer)
         
         # Reload with relationships
-        job = await job_service.get_by_id(job.id)
+        job = await job_service.get_by_id(job.id, load_notes=True)
         
         return job
         
@@ -118,7 +122,7 @@ async def list_jobs(
     )
     
     return JobListResponse(
-        jobs=jobs,
+        jobs=_job_list_adapter.validate_python(jobs, from_attributes=True),
         total=total,
         page=page,
         page_size=page_size,
@@ -136,7 +140,7 @@ async def get_job(
     """Get a specific job."""
     job_service = JobService(db, business.id)
     
-    job = await job_service.get_by_id(job_id)
+    job = await job_service.get_by_id(job_id, load_notes=True)
     
     if not job or job.customer_id != customer.id:
         raise HTTPException(
@@ -4,9 +4,10 @@ from datetime import date, datetime, timedelta
 from typing import Optional, List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, TypeAdapter
 
 from app.database import get_db
 from app.api.deps import (
@@ -17,7 +18,7 @@ from app.api.deps import (
 from app.models.user import User, UserRole
 from app.models.business import Business
 from app.models.technician import Technician
-from app.models.customer import Customer
+from app.models.customer import Customer, CustomerAddress
 from app.models.job import Job, JobStatus, JobPriority
 from app.services.job_service import JobService
 from app.services.schedule_service import ScheduleService
@@ -63,6 +64,9 @@ class JobResponse(BaseModel):
         from_attributes = True
 
 
+_job_list_adapter = TypeAdapter(List[JobResponse])
+
+
 class TechnicianResponse(BaseModel):
     """Technician response for listings."""
     id: str
@@ -115,6 +119,8 @@ async def get_dashboard_stats(
 ):
     """Get dashboard statistics for the owner."""
     today = date.today()
+    today_start = datetime.combine(today, datetime.min.time())
+    tomorrow_start = today_start + timedelta(days=1)
     
     # Total jobs today
     result = await db.execute(
@@ -148,7 +154,8 @@ async def get_dashboard_stats(
         select(func.count(Job.id)).where(
             Job.business_id == business.id,
             Job.status == JobStatus.COMPLETED,
-            func.date(Job.completed_at) == today
+            Job.completed_at >= today_start,
+            Job.completed_at < tomorrow_start
         )
     )
     completed_today = result.scalar() or 0
@@ -218,14 +225,21 @@ async def list_jobs(
     page_size: int = Query(20, ge=1, le=100),
 ):
     """List all jobs with filters."""
-    from sqlalchemy.orm import selectinload
+    from sqlalchemy.orm import joinedload
+    
+    job_service = JobService(db, business.id)
+    cache_filters = (status, priority, technician_id, date_from, date_to, page, page_size)
+    cache_key, cached = await job_service.get_cached_job_list(cache_filters)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
     
     query = (
         select(Job)
         .options(
-            selectinload(Job.customer),
-            selectinload(Job.technician),
-            selectinload(Job.address),
+            # Many-to-one joins: the whole page comes back in one statement
+            joinedload(Job.customer).load_only(Customer.name, Customer.phone),
+            joinedload(Job.technician).load_only(Technician.name),
+            joinedload(Job.address).load_only(CustomerAddress.full_address),
         )
         .where(Job.business_id == business.id)
     )
@@ -259,9 +273,9 @@ async def list_jobs(
     query = query.offset((page - 1) * page_size).limit(page_size)
     
     result = await db.execute(query)
-    jobs = result.scalars().all()
+    jobs = result.unique().scalars().all()
     
-    return [
+    responses = [
         JobResponse(
             id=str(job.id),
             confirmation_code=job.confirmation_code or "",
@@ -281,6 +295,11 @@ async def list_jobs(
         )
         for job in jobs
     ]
+    
+    await job_service.cache_job_list(
+        cache_key, _job_list_adapter.dump_json(responses).decode()
+    )
+    return responses
 
 
 @router.get("/jobs/{job_id}", response_model=JobResponse)
@@ -429,7 +448,6 @@ async def create_technician(
     
     db.add(technician)
     await db.commit()
-    await db.refresh(technician)
     
     return TechnicianResponse(
         id=str(technician.id),
@@ -477,8 +495,10 @@ async def update_technician(
     if is_on_call is not None:
         technician.is_on_call = is_on_call
     
-    technician.updated_at = datetime.utcnow()
     await db.commit()
+    # Job listing pages embed the technician's name and phone
+    if name is not None or phone is not None:
+        await JobService(db, business.id).invalidate_job_lists()
     
     return {"message": "Technician updated successfully"}
 
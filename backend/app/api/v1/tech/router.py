@@ -5,9 +5,10 @@ from typing import Optional, List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, lambda_stmt
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
+from typing_extensions import TypedDict
 
 from app.database import get_db
 from app.api.deps import get_current_technician, get_business_from_token
@@ -24,8 +25,8 @@ router = APIRouter()
 # Pydantic Schemas
 # =============================================================================
 
-class TechJobResponse(BaseModel):
-    """Job response for technician app."""
+class TechJobResponse(TypedDict):
+    """Job response for technician app (built as a plain dict per row)."""
     id: str
     confirmation_code: str
     status: str
@@ -54,13 +55,10 @@ class TechJobResponse(BaseModel):
     scheduled_time_end: Optional[str]
     
     # Notes
-    notes: List[dict] = []
+    notes: List[dict]
     
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class UpdateStatusRequest(BaseModel):
     """Request to update job status."""
@@ -83,72 +81,90 @@ class UpdateLocationRequest(BaseModel):
 # My Jobs
 # =============================================================================
 
-@router.get("/my-jobs", response_model=List[TechJobResponse])
-async def get_my_jobs(
-    db: AsyncSession = Depends(get_db),
-    technician: Technician = Depends(get_current_technician),
-    status_filter: Optional[str] = Query(None, alias="status"),
-    date_filter: Optional[date] = Query(None, alias="date"),
+def _my_jobs_stmt(
+    technician_id: UUID,
+    status_enum: Optional[JobStatus],
+    date_filter: Optional[date],
+    today: date,
 ):
-    """Get jobs assigned to the current technician."""
-    query = (
-        select(Job)
+    """
+    Build the open-jobs query as a lambda statement so SQLAlchemy caches
+    the compiled SQL and only rebinds the parameters per request.
+    """
+    stmt = lambda_stmt(
+        lambda: select(Job)
         .options(
             selectinload(Job.customer),
             selectinload(Job.address),
             selectinload(Job.notes),
         )
         .where(
-            Job.technician_id == technician.id,
+            Job.technician_id == technician_id,
             Job.status.notin_([JobStatus.CANCELLED, JobStatus.COMPLETED])
         )
     )
     
-    # Apply filters
-    if status_filter:
-        try:
-            status_enum = JobStatus(status_filter)
-            query = query.where(Job.status == status_enum)
-        except ValueError:
-            pass
+    if status_enum is not None:
+        stmt += lambda s: s.where(Job.status == status_enum)
     
-    if date_filter:
-        query = query.where(Job.scheduled_date == date_filter)
+    if date_filter is not None:
+        stmt += lambda s: s.where(Job.scheduled_date == date_filter)
     else:
         # Default: today and future jobs
-        query = query.where(Job.scheduled_date >= date.today())
+        stmt += lambda s: s.where(Job.scheduled_date >= today)
     
-    # Order by date and time
-    query = query.order_by(Job.scheduled_date, Job.scheduled_time_start)
-    
-    result = await db.execute(query)
-    jobs = result.scalars().all()
-    
-    return [_job_to_response(job) for job in jobs]
+    stmt += lambda s: s.order_by(Job.scheduled_date, Job.scheduled_time_start)
+    return stmt
 
 
-@router.get("/my-jobs/today", response_model=List[TechJobResponse])
-async def get_todays_jobs(
-    db: AsyncSession = Depends(get_db),
-    technician: Technician = Depends(get_current_technician),
-):
-    """Get today's jobs for the current technician."""
-    query = (
-        select(Job)
+def _todays_jobs_stmt(technician_id: UUID, today: date):
+    """Build the today's-jobs query as a cached lambda statement."""
+    return lambda_stmt(
+        lambda: select(Job)
         .options(
             selectinload(Job.customer),
             selectinload(Job.address),
             selectinload(Job.notes),
         )
         .where(
-            Job.technician_id == technician.id,
-            Job.scheduled_date == date.today(),
+            Job.technician_id == technician_id,
+            Job.scheduled_date == today,
             Job.status.notin_([JobStatus.CANCELLED])
         )
         .order_by(Job.scheduled_time_start)
     )
+
+
+@router.get("/my-jobs", response_model=List[TechJobResponse])
+async def get_my_jobs(
+    db: AsyncSession = Depends(get_db),
+    technician: Technician = Depends(get_current_technician),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    date_filter: Optional[date] = Query(None, alias="date"),
+):
+    """Get jobs assigned to the current technician."""
+    status_enum = None
+    if status_filter:
+        try:
+            status_enum = JobStatus(status_filter)
+        except ValueError:
+            pass
+    
+    result = await db.execute(
+        _my_jobs_stmt(technician.id, status_enum, date_filter, date.today())
+    )
+    jobs = result.scalars().all()
     
-    result = await db.execute(query)
+    return [_job_to_response(job) for job in jobs]
+
+
+@router.get("/my-jobs/today", response_model=List[TechJobResponse])
+async def get_todays_jobs(
+    db: AsyncSession = Depends(get_db),
+    technician: Technician = Depends(get_current_technician),
+):
+    """Get today's jobs for the current technician."""
+    result = await db.execute(_todays_jobs_stmt(technician.id, date.today()))
     jobs = result.scalars().all()
     
     return [_job_to_response(job) for job in jobs]
@@ -348,7 +364,7 @@ async def upload_job_photo(
     photo_url = f"https://storage.example.com/jobs/{job_id}/{file.filename}"
     
     photo = JobPhoto(
-        job_id=UUID(job_id),
+        job_id=job.id,
         url=photo_url,
         caption=caption,
         photo_type=photo_type,
@@ -358,7 +374,6 @@ async def upload_job_photo(
     
     db.add(photo)
     await db.commit()
-    await db.refresh(photo)
     
     return {
         "message": "Photo uploaded successfully",
@@ -416,7 +431,6 @@ async def update_profile(
     if app_platform is not None:
         technician.app_platform = app_platform
     
-    technician.updated_at = datetime.utcnow()
     await db.commit()
     
     return {"message": "Profile updated"}
@@ -428,6 +442,10 @@ async def update_profile(
 
 def _job_to_response(job: Job) -> TechJobResponse:
     """Convert Job model to TechJobResponse."""
+    # Bind relationships once; each access walks the attribute descriptor
+    customer = job.customer
+    address = job.address
+    
     notes = []
     if hasattr(job, 'notes') and job.notes:
         notes = [
@@ -435,32 +453,32 @@ def _job_to_response(job: Job) -> TechJobResponse:
                 "id": str(note.id),
                 "content": note.content,
                 "author_name": note.author_name,
-                "created_at": note.created_at.isoformat(),
+                "created_at": note.created_at,
             }
             for note in job.notes
         ]
     
-    return TechJobResponse(
-        id=str(job.id),
-        confirmation_code=job.confirmation_code or "",
-        status=job.status.value,
-        priority=job.priority.value,
-        service_type=job.service_type,
-        description=job.description,
-        customer_name=job.customer.name if job.customer else None,
-        customer_phone=job.customer.phone if job.customer else None,
-        address_street=job.address.street if job.address else None,
-        address_city=job.address.city if job.address else None,
-        address_state=job.address.state if job.address else None,
-        address_zip=job.address.zip_code if job.address else None,
-        address_full=job.address.full_address if job.address else None,
-        gate_code=job.address.gate_code if job.address else None,
-        access_notes=job.address.access_notes if job.address else None,
-        latitude=job.address.latitude if job.address else None,
-        longitude=job.address.longitude if job.address else None,
-        scheduled_date=job.scheduled_date,
-        scheduled_time_start=str(job.scheduled_time_start) if job.scheduled_time_start else None,
-        scheduled_time_end=str(job.scheduled_time_end) if job.scheduled_time_end else None,
-        notes=notes,
-        created_at=job.created_at,
-    )
+    return {
+        "id": str(job.id),
+        "confirmation_code": job.confirmation_code or "",
+        "status": job.status.value,
+        "priority": job.priority.value,
+        "service_type": job.service_type,
+        "description": job.description,
+        "customer_name": customer.name if customer else None,
+        "customer_phone": customer.phone if customer else None,
+        "address_street": address.street if address else None,
+        "address_city": address.city if address else None,
+        "address_state": address.state if address else None,
+        "address_zip": address.zip_code if address else None,
+        "address_full": address.full_address if address else None,
+        "gate_code": address.gate_code if address else None,
+        "access_notes": address.access_notes if address else None,
+        "latitude": address.latitude if address else None,
+        "longitude": address.longitude if address else None,
+        "scheduled_date": job.scheduled_date,
+        "scheduled_time_start": str(job.scheduled_time_start) if job.scheduled_time_start else None,
+        "scheduled_time_end": str(job.scheduled_time_end) if job.scheduled_time_end else None,
+        "notes": notes,
+        "created_at": job.created_at,
+    }
@@ -3,14 +3,17 @@
 from datetime import date
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from fastapi.responses import Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
 from app.api.deps import get_current_technician, get_current_business
 from app.models.technician import Technician
 from app.models.business import Business
-from app.models.job import JobStatus
+from app.models.customer import Customer
+from app.models.job import Job, JobStatus
 from app.schemas.job import TechnicianJobResponse, JobStatusUpdate, JobNoteCreate, JobNoteResponse
 from app.schemas.technician import TechnicianLocationUpdate
 from app.services.job_service import JobService
@@ -18,6 +21,20 @@ from app.services.notification_service import NotificationService
 
 router = APIRouter()
 
+# Status transitions a technician may make, as (from, to) pairs
+_VALID_TRANSITIONS = frozenset({
+    (JobStatus.SCHEDULED, JobStatus.EN_ROUTE),
+    (JobStatus.DISPATCHED, JobStatus.EN_ROUTE),
+    (JobStatus.EN_ROUTE, JobStatus.IN_PROGRESS),
+    (JobStatus.IN_PROGRESS, JobStatus.COMPLETED),
+    (JobStatus.IN_PROGRESS, JobStatus.AWAITING_PARTS),
+    (JobStatus.AWAITING_PARTS, JobStatus.IN_PROGRESS),
+    (JobStatus.AWAITING_PARTS, JobStatus.COMPLETED),
+})
+
+# Built once at import; serializes cached /me/jobs pages
+_TECH_JOB_LIST_ADAPTER = TypeAdapter(List[TechnicianJobResponse])
+
 
 @router.get("/me/jobs", response_model=List[TechnicianJobResponse])
 async def get_my_jobs(
@@ -32,6 +49,12 @@ async def get_my_jobs(
     # Default to today
     filter_date = date_filter or date.today()
     
+    # Served from the business job-list cache; any job write bumps its version
+    cache_filters = ("technician", technician.id, filter_date)
+    cache_key, cached = await job_service.get_cached_job_list(cache_filters)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
     jobs, _ = await job_service.list_jobs(
         technician_id=technician.id,
         date_from=filter_date,
@@ -41,35 +64,11 @@ async def get_my_jobs(
     )
     
     # Convert to technician view (includes customer contact info)
-    result = []
-    for job in jobs:
-        result.append(TechnicianJobResponse(
-            id=job.id,
-            confirmation_code=job.confirmation_code,
-            service_type=job.service_type,
-            description=job.description,
-            priority=job.priority,
-            status=job.status,
-            scheduled_date=job.scheduled_date,
-            scheduled_time_start=job.scheduled_time_start,
-            scheduled_time_end=job.scheduled_time_end,
-            customer_name=job.customer.name if job.customer else None,
-            customer_phone=job.customer.phone if job.customer else "",
-            address_street=job.address.street if job.address else "",
-            address_unit=job.address.unit if job.address else None,
-            address_city=job.address.city if job.address else "",
-            address_state=job.address.state if job.address else "",
-            address_zip=job.address.zip_code if job.address else "",
-            address_full=job.address.full_address if job.address else "",
-            address_latitude=job.address.latitude if job.address else None,
-            address_longitude=job.address.longitude if job.address else None,
-            gate_code=job.address.gate_code if job.address else None,
-            access_notes=job.address.access_notes if job.address else None,
-            notes=[JobNoteResponse.model_validate(n) for n in job.notes],
-            created_at=job.created_at,
-        ))
-    
-    return result
+    responses = [_job_to_response(job) for job in jobs]
+    await job_service.cache_job_list(
+        cache_key, _TECH_JOB_LIST_ADAPTER.dump_json(responses).decode()
+    )
+    return responses
 
 
 @router.get("/me/jobs/{job_id}", response_model=TechnicianJobResponse)
@@ -82,7 +81,7 @@ async def get_job_detail(
     """Get a specific job assigned to this technician."""
     job_service = JobService(db, business.id)
     
-    job = await job_service.get_by_id(job_id)
+    job = await job_service.get_by_id(job_id, load_notes=True)
     
     if not job or job.technician_id != technician.id:
         raise HTTPException(
@@ -90,37 +89,14 @@ async def get_job_detail(
             detail="Job not found"
         )
     
-    return TechnicianJobResponse(
-        id=job.id,
-        confirmation_code=job.confirmation_code,
-        service_type=job.service_type,
-        description=job.description,
-        priority=job.priority,
-        status=job.status,
-        scheduled_date=job.scheduled_date,
-        scheduled_time_start=job.scheduled_time_start,
-        scheduled_time_end=job.scheduled_time_end,
-        customer_name=job.customer.name if job.customer else None,
-        customer_phone=job.customer.phone if job.customer else "",
-        address_street=job.address.street if job.address else "",
-        address_unit=job.address.unit if job.address else None,
-        address_city=job.address.city if job.address else "",
-        address_state=job.address.state if job.address else "",
-        address_zip=job.address.zip_code if job.address else "",
-        address_full=job.address.full_address if job.address else "",
-        address_latitude=job.address.latitude if job.address else None,
-        address_longitude=job.address.longitude if job.address else None,
-        gate_code=job.address.gate_code if job.address else None,
-        access_notes=job.address.access_notes if job.address else None,
-        notes=[JobNoteResponse.model_validate(n) for n in job.notes],
-        created_at=job.created_at,
-    )
+    return _job_to_response(job)
 
 
 @router.patch("/me/jobs/{job_id}/status", response_model=TechnicianJobResponse)
 async def update_job_status(
     job_id: UUID,
     data: JobStatusUpdate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     business: Business = Depends(get_current_business),
     technician: Technician = Depends(get_current_technician),
@@ -133,7 +109,6 @@ async def update_job_status(
     - IN_PROGRESS -> COMPLETED (finished)
     """
     job_service = JobService(db, business.id)
-    notification_service = NotificationService(db, business.id)
     
     job = await job_service.get_by_id(job_id)
     
@@ -144,16 +119,7 @@ async def update_job_status(
         )
     
     # Validate status transition
-    valid_transitions = {
-        JobStatus.SCHEDULED: [JobStatus.EN_ROUTE],
-        JobStatus.DISPATCHED: [JobStatus.EN_ROUTE],
-        JobStatus.EN_ROUTE: [JobStatus.IN_PROGRESS],
-        JobStatus.IN_PROGRESS: [JobStatus.COMPLETED, JobStatus.AWAITING_PARTS],
-        JobStatus.AWAITING_PARTS: [JobStatus.IN_PROGRESS, JobStatus.COMPLETED],
-    }
-    
-    allowed = valid_transitions.get(job.status, [])
-    if data.status not in allowed:
+    if (job.status, data.status) not in _VALID_TRANSITIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot transition from {job.status.value} to {data.status.value}"
@@ -167,42 +133,19 @@ async def update_job_status(
         changed_by_id=technician.id,
     )
     
-    # Send notifications based on status
+    # Send notifications based on status (after the response goes out)
     if data.status == JobStatus.EN_ROUTE and job.customer:
-        await notification_service.notify_tech_en_route(
+        background_tasks.add_task(
+            _notify_tech_en_route,
+            business_id=business.id,
             job=updated_job,
             customer=job.customer,
             technician=technician,
             eta_minutes=15,  # TODO: Calculate actual ETA
         )
     
-    # Reload and return
-    job = await job_service.get_by_id(job_id)
-    return TechnicianJobResponse(
-        id=job.id,
-        confirmation_code=job.confirmation_code,
-        service_type=job.service_type,
-        description=job.description,
-        priority=job.priority,
-        status=job.status,
-        scheduled_date=job.scheduled_date,
-        scheduled_time_start=job.scheduled_time_start,
-        scheduled_time_end=job.scheduled_time_end,
-        customer_name=job.customer.name if job.customer else None,
-        customer_phone=job.customer.phone if job.customer else "",
-        address_street=job.address.street if job.address else "",
-        address_unit=job.address.unit if job.address else None,
-        address_city=job.address.city if job.address else "",
-        address_state=job.address.state if job.address else "",
-        address_zip=job.address.zip_code if job.address else "",
-        address_full=job.address.full_address if job.address else "",
-        address_latitude=job.address.latitude if job.address else None,
-        address_longitude=job.address.longitude if job.address else None,
-        gate_code=job.address.gate_code if job.address else None,
-        access_notes=job.address.access_notes if job.address else None,
-        notes=[JobNoteResponse.model_validate(n) for n in job.notes],
-        created_at=job.created_at,
-    )
+    # update_status returns the job with its relations still loaded
+    return _job_to_response(updated_job)
 
 
 @router.post("/me/jobs/{job_id}/notes", response_model=JobNoteResponse, status_code=status.HTTP_201_CREATED)
@@ -252,3 +195,63 @@ async def update_location(
     await db.commit()
     
     return {"status": "location updated"}
+
+
+async def _notify_tech_en_route(
+    business_id: UUID,
+    job: Job,
+    customer: Customer,
+    technician: Technician,
+    eta_minutes: int,
+):
+    """Send the en-route notification with its own session (runs as a background task)."""
+    async with AsyncSessionLocal() as db:
+        notification_service = NotificationService(db, business_id)
+        await notification_service.notify_tech_en_route(
+            job=job,
+            customer=customer,
+            technician=technician,
+            eta_minutes=eta_minutes,
+        )
+
+
+def _job_to_response(job: Job) -> TechnicianJobResponse:
+    """Convert Job model to the technician view (includes customer contact info)."""
+    # Bind relationships once; each access walks the attribute descriptor
+    customer = job.customer
+    address = job.address
+    
+    return {
+        "id": job.id,
+        "confirmation_code": job.confirmation_code,
+        "service_type": job.service_type,
+        "description": job.description,
+        "priority": job.priority,
+        "status": job.status,
+        "scheduled_date": job.scheduled_date,
+        "scheduled_time_start": job.scheduled_time_start,
+        "scheduled_time_end": job.scheduled_time_end,
+        "customer_name": customer.name if customer else None,
+        "customer_phone": customer.phone if customer else "",
+        "address_street": address.street if address else "",
+        "address_unit": address.unit if address else None,
+        "address_city": address.city if address else "",
+        "address_state": address.state if address else "",
+        "address_zip": address.zip_code if address else "",
+        "address_full": address.full_address if address else "",
+        "address_latitude": address.latitude if address else None,
+        "address_longitude": address.longitude if address else None,
+        "gate_code": address.gate_code if address else None,
+        "access_notes": address.access_notes if address else None,
+        "notes": [
+            {
+                "id": note.id,
+                "content": note.content,
+                "author_type": note.author_type,
+                "author_name": note.author_name,
+                "created_at": note.created_at,
+            }
+            for note in job.notes
+        ],
+        "created_at": job.created_at,
+    }
@@ -2,19 +2,44 @@
 
 import hmac
 import hashlib
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Header, Request
+from uuid import UUID
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Header, Request
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError, field_validator
 
-from app.database import get_db
-from app.models.notification import CallLog
+from app.database import AsyncSessionLocal, get_db
+from app.models.notification import CallLog, NotificationStatus
 from app.config import get_settings
 
 settings = get_settings()
 router = APIRouter()
 
+# Call outcomes the webhook fully handles (marked processed when logged)
+PROCESSED_CALL_OUTCOMES = frozenset({
+    "booking_confirmed",
+    "emergency_dispatched",
+    "callback_requested",
+})
+
+# Map Twilio message status to our status
+TWILIO_STATUS_MAP = {
+    "queued": NotificationStatus.SENT,
+    "sent": NotificationStatus.SENT,
+    "delivered": NotificationStatus.DELIVERED,
+    "failed": NotificationStatus.FAILED,
+    "undelivered": NotificationStatus.FAILED,
+}
+
+# Keyed HMAC state is computed once; each request copies it
+_VAPI_HMAC_TEMPLATE = hmac.new(
+    settings.VAPI_WEBHOOK_SECRET.encode(),
+    digestmod=hashlib.sha256,
+)
+
 
 class VapiCallEndPayload(BaseModel):
     """Payload from Vapi when a call ends."""
@@ -25,16 +50,31 @@ class VapiCallEndPayload(BaseModel):
     summary: Optional[str] = None
     outcome: Optional[str] = None
     duration_seconds: Optional[int] = None
-    started_at: Optional[str] = None
-    ended_at: Optional[str] = None
+    started_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
     # Custom data we pass to Vapi
     metadata: Optional[dict] = None
+    
+    @field_validator("started_at", "ended_at", mode="wrap")
+    @classmethod
+    def naive_utc_timestamp(cls, v, handler) -> Optional[datetime]:
+        """
+        Timestamps are stored in naive UTC columns. Offsets are converted
+        to UTC; an unparsable value becomes None so the call is still logged.
+        """
+        try:
+            value = handler(v)
+        except ValidationError:
+            return None
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
 
 
 @router.post("/vapi/call-end")
 async def vapi_call_end(
-    payload: VapiCallEndPayload,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     x_vapi_signature: Optional[str] = Header(None),
 ):
@@ -42,15 +82,14 @@ async def vapi_call_end(
     Webhook called by Vapi when a call ends.
     This is critical for creating jobs from phone conversations.
     """
+    # Raw body is read once: signed bytes are verified, then parsed directly
+    body = await request.body()
     
     # Verify webhook signature (if configured)
     if settings.VAPI_WEBHOOK_SECRET and x_vapi_signature:
-        body = await request.body()
-        expected_sig = hmac.new(
-            settings.VAPI_WEBHOOK_SECRET.encode(),
-            body,
-            hashlib.sha256
-        ).hexdigest()
+        mac = _VAPI_HMAC_TEMPLATE.copy()
+        mac.update(body)
+        expected_sig = mac.hexdigest()
         
         if not hmac.compare_digest(expected_sig, x_vapi_signature):
             raise HTTPException(
@@ -58,66 +97,69 @@ async def vapi_call_end(
                 detail="Invalid webhook signature"
             )
     
+    try:
+        payload = VapiCallEndPayload.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    
     # Extract business ID from metadata
     business_id = payload.metadata.get("business_id") if payload.metadata else None
     if not business_id:
         # Log error but don't fail - we'll reconcile later
         return {"status": "error", "message": "No business_id in metadata"}
     
-    # Log the call for reconciliation purposes
-    call_log = CallLog(
-        business_id=business_id,
-        external_call_id=payload.call_id,
-        provider="vapi",
-        caller_phone=payload.phone_number,
-        call_direction="inbound",
-        call_type="intake",
-        transcript=payload.transcript,
-        call_summary=payload.summary,
-        call_outcome=payload.outcome,
-        duration_seconds=str(payload.duration_seconds) if payload.duration_seconds else None,
-        webhook_received=datetime.utcnow(),
-    )
+    # Outcomes handled here; jobs for bookings and emergencies were already
+    # created by the agent's tool calls during the call
+    now = datetime.utcnow()
+    processed_at = now if payload.outcome in PROCESSED_CALL_OUTCOMES else None
     
-    if payload.started_at:
-        try:
-            call_log.started_at = datetime.fromisoformat(payload.started_at.replace("Z", "+00:00"))
-        except:
-            pass
+    # Log the call for reconciliation purposes (single INSERT, no ORM tracking)
+    await db.execute(
+        insert(CallLog).values(
+            business_id=business_id,
+            external_call_id=payload.call_id,
+            provider="vapi",
+            caller_phone=payload.phone_number,
+            call_direction="inbound",
+            call_type="intake",
+            transcript=payload.transcript,
+            call_summary=payload.summary,
+            call_outcome=payload.outcome,
+            duration_seconds=payload.duration_seconds,
+            started_at=payload.started_at,
+            ended_at=payload.ended_at,
+            webhook_received=now,
+            webhook_processed=processed_at,
+        )
+    )
+    await db.commit()
     
-    if payload.ended_at:
-        try:
-            call_log.ended_at = datetime.fromisoformat(payload.ended_at.replace("Z", "+00:00"))
-        except:
-            pass
+    if payload.outcome == "callback_requested":
+        # Customer requested callback - notify owner after responding
+        background_tasks.add_task(
+            _notify_callback_requested,
+            UUID(business_id),
+            payload.phone_number,
+            payload.summary,
+        )
     
-    db.add(call_log)
+    return {"status": "processed", "call_id": payload.call_id}
+
+
+async def _notify_callback_requested(
+    business_id: UUID,
+    phone_number: Optional[str],
+    summary: Optional[str],
+):
+    """Notify the owner of a callback request (runs after the webhook returns)."""
+    from app.services.notification_service import NotificationService
     
-    # Process the call based on outcome
-    if payload.outcome == "booking_confirmed":
-        # The agent should have already created the job during the call
-        # via tool calls. This is just for tracking.
-        call_log.webhook_processed = datetime.utcnow()
-        
-    elif payload.outcome == "emergency_dispatched":
-        # Emergency jobs are created immediately during the call
-        call_log.webhook_processed = datetime.utcnow()
-        
-    elif payload.outcome == "callback_requested":
-        # Customer requested callback - notify owner
-        from app.services.notification_service import NotificationService
-        from uuid import UUID
-        
-        notification_service = NotificationService(db, UUID(business_id))
+    async with AsyncSessionLocal() as db:
+        notification_service = NotificationService(db, business_id)
         await notification_service.notify_owner(
-            message=f"Callback requested from {payload.phone_number}. Summary: {payload.summary}",
+            message=f"Callback requested from {phone_number}. Summary: {summary}",
             trigger_event="callback_requested",
         )
-        call_log.webhook_processed = datetime.utcnow()
-    
-    await db.commit()
-    
-    return {"status": "processed", "call_id": payload.call_id}
 
 
 class TwilioStatusPayload(BaseModel):
@@ -130,44 +172,23 @@ class TwilioStatusPayload(BaseModel):
 
 
 @router.post("/twilio/status")
-async def twilio_message_status(
-    payload: TwilioStatusPayload,
-    db: AsyncSession = Depends(get_db),
-):
+async def twilio_message_status(payload: TwilioStatusPayload):
     """
     Webhook for Twilio SMS delivery status updates.
-    Updates our notification tracking.
+    Updates are queued and applied in bulk by the status flush worker.
     """
-    from sqlalchemy import select, update
-    from app.models.notification import Notification, NotificationStatus
-    
-    # Map Twilio status to our status
-    status_map = {
-        "queued": NotificationStatus.SENT,
-        "sent": NotificationStatus.SENT,
-        "delivered": NotificationStatus.DELIVERED,
-        "failed": NotificationStatus.FAILED,
-        "undelivered": NotificationStatus.FAILED,
-    }
+    from app.workers.twilio_status import enqueue_status_update
     
-    new_status = status_map.get(payload.MessageStatus.lower())
+    # Twilio sends lowercase statuses; anything else is ignored
+    new_status = TWILIO_STATUS_MAP.get(payload.MessageStatus)
     if not new_status:
         return {"status": "ignored"}
     
-    # Update notification record
-    stmt = (
-        update(Notification)
-        .where(Notification.external_id == payload.MessageSid)
-        .values(
-            status=new_status,
-            external_status=payload.MessageStatus,
-            error_message=payload.ErrorMessage if payload.ErrorCode else None,
-            delivered_at=datetime.utcnow() if new_status == NotificationStatus.DELIVERED else None,
-            failed_at=datetime.utcnow() if new_status == NotificationStatus.FAILED else None,
-        )
+    await enqueue_status_update(
+        message_sid=payload.MessageSid,
+        status=new_status,
+        external_status=payload.MessageStatus,
+        error_message=payload.ErrorMessage if payload.ErrorCode else None,
     )
     
-    await db.execute(stmt)
-    await db.commit()
-    
-    return {"status": "updated"}
+    return {"status": "queued"}
@@ -1,20 +1,46 @@
 """Database connection and session management."""
 
+import asyncio
+from uuid import uuid4
+from sqlalchemy import DDL, event, func
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 from redis import asyncio as aioredis
 from app.config import get_settings
 
 settings = get_settings()
 
 # SQLAlchemy async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+if settings.DATABASE_PGBOUNCER:
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        query_cache_size=1200,
+        poolclass=NullPool,
+        connect_args={
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            # Unique names so statements never collide across backends
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    )
+else:
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        # Compiled SQL cache (default 500); sized for all app statements
+        query_cache_size=1200,
+        pool_pre_ping=True,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        connect_args={
+            # asyncpg per-connection prepared statement cache, plus SQLAlchemy's
+            # own cache of prepared statement handles
+            "statement_cache_size": 1024,
+            "prepared_statement_cache_size": 256,
+        },
+    )
 
 # Session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -25,8 +51,44 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+
+def utcnow_sql():
+    """
+    Current time as naive UTC in SQL, on the same clock as Python's
+    datetime.utcnow() (plain now() would follow the session time zone).
+    """
+    return func.timezone("utc", func.now())
+
+
 # Base class for models
 Base = declarative_base()
+# Timestamps are generated by the database (server_default / onupdate=utcnow_sql());
+# fetch them with RETURNING on flush since expired attributes can't lazy-load
+# under asyncio
+Base.__mapper_args__ = {"eager_defaults": True}
+
+# Time-ordered UUIDv7 generator for append-heavy tables (jobs, notifications,
+# call logs, status history). Keys land at the right edge of the primary key
+# index instead of random pages. Plain SQL so it works without extensions.
+UUID_V7_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid
+$$ LANGUAGE sql VOLATILE
+"""
+event.listen(Base.metadata, "before_create", DDL(UUID_V7_FUNCTION_SQL))
 
 # Redis client
 redis_client = None
@@ -59,6 +121,26 @@ async def init_db():
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def warm_db_pool():
+    """
+    Open the pool's connections concurrently so a worker's first queries
+    don't pay the connection handshakes one after another. No-op behind
+    PgBouncer (no client-side pool to fill).
+    """
+    if settings.DATABASE_PGBOUNCER:
+        return
+    
+    async def open_connection():
+        async with engine.connect():
+            pass
+    
+    # A failed connection is simply opened later on first use
+    await asyncio.gather(
+        *(open_connection() for _ in range(settings.DATABASE_POOL_SIZE)),
+        return_exceptions=True,
+    )
+
+
 async def close_db():
     """Close database connections."""
     await engine.dispose()
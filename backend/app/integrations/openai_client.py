@@ -1,14 +1,44 @@
 """OpenAI integration with fallback and timeout handling."""
 
 import asyncio
+import httpx
+import orjson
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from openai import AsyncOpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.config import get_settings
 
 settings = get_settings()
 
+OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+API_ATTEMPTS = 2
+API_RETRY_BASE_DELAY = 0.5  # seconds, doubled per attempt
+
+# Shared HTTP client (HTTP/2, keep-alive pool reused across requests)
+http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared OpenAI HTTP client (lazy initialization)."""
+    global http_client
+    if http_client is None:
+        http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS * 2, connect=2.0),
+        )
+    return http_client
+
+
+async def close_http_client():
+    """Close the shared OpenAI HTTP client."""
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
 
 class OpenAIClient:
     """
@@ -19,10 +49,14 @@ class OpenAIClient:
     """
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY) if settings.OPENAI_API_KEY else None
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=get_http_client(),
+        ) if settings.OPENAI_API_KEY else None
         self.primary_model = settings.OPENAI_MODEL_PRIMARY
         self.fallback_model = settings.OPENAI_MODEL_FALLBACK
         self.timeout = settings.LLM_TIMEOUT_SECONDS
+        self._auth_headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
     
     async def complete(
         self,
@@ -63,10 +97,6 @@ class OpenAIClient:
             else:
                 raise Exception("LLM request timed out")
     
-    @retry(
-        stop=stop_after_attempt(2),
-        wait=wait_exponential(multiplier=0.5, min=0.5, max=2)
-    )
     async def _call_api(
         self,
         messages: List[Dict[str, str]],
@@ -75,13 +105,42 @@ class OpenAIClient:
         max_tokens: int,
     ) -> str:
         """Make the actual API call with retry."""
-        response = await self.client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
+        for attempt in range(API_ATTEMPTS):
+            try:
+                return await self._raw_chat(messages, model, temperature, max_tokens)
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retryable = (
+                    isinstance(e, httpx.TransportError)
+                    or e.response.status_code == 429
+                    or e.response.status_code >= 500
+                )
+                if not retryable or attempt == API_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(API_RETRY_BASE_DELAY * (2 ** attempt))
+    
+    async def _raw_chat(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """
+        Plain-text chat completion over the shared HTTP client.
+        Skips the SDK's request/response models; we only need the content.
+        """
+        response = await get_http_client().post(
+            OPENAI_CHAT_COMPLETIONS_URL,
+            headers=self._auth_headers,
+            json={
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            },
         )
-        return response.choices[0].message.content
+        response.raise_for_status()
+        return orjson.loads(response.content)["choices"][0]["message"]["content"]
     
     async def complete_with_functions(
         self,
@@ -137,3 +196,9 @@ class OpenAIClient:
             input=text,
         )
         return response.data[0].embedding
+
+
+@lru_cache()
+def get_openai_client() -> OpenAIClient:
+    """Get the app-wide OpenAI client."""
+    return OpenAIClient()
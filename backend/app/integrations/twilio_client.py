@@ -1,70 +1,246 @@
 """Twilio integration for SMS and voice calls."""
 
 import asyncio
-from typing import Optional
-from twilio.rest import Client
-from twilio.base.exceptions import TwilioRestException
-from tenacity import retry, stop_after_attempt, wait_exponential
+import time
+import httpx
+from functools import lru_cache
+from typing import Optional, Tuple
+from urllib.parse import quote
 
 from app.config import get_settings
+from app.database import get_redis
 
 settings = get_settings()
 
+TWILIO_BASE_URL = "https://api.twilio.com/2010-04-01"
+TWILIO_LOOKUP_URL = "https://lookups.twilio.com/v2"
+
+SEND_ATTEMPTS = 3
+SENT_KEY_TTL = 24 * 3600  # seconds an idempotency key remembers its send
+SEND_PENDING = "pending"  # idempotency key claimed, send outcome not yet known
+SEND_RETRY_BASE_DELAY = 2  # seconds, doubled per attempt
+
+# Shared HTTP client (keep-alive pool reused across requests)
+http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared Twilio HTTP client (lazy initialization)."""
+    global http_client
+    if http_client is None:
+        http_client = httpx.AsyncClient(
+            base_url=f"{TWILIO_BASE_URL}/Accounts/{settings.TWILIO_ACCOUNT_SID}/",
+            auth=(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN),
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+    return http_client
+
+
+async def close_http_client():
+    """Close the shared Twilio HTTP client."""
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
+
+@lru_cache(maxsize=16)
+def _twiml_template(voice: str) -> Tuple[str, str]:
+    """
+    TwiML for an acknowledgement call, split around the spoken message.
+    Rendered once per voice.
+    """
+    prefix = f'<Response><Say voice="{voice}">'
+    suffix = (
+        f'</Say>'
+        f'<Pause length="1"/>'
+        f'<Say voice="{voice}">Press 1 to acknowledge this message.</Say>'
+        f'<Gather numDigits="1" timeout="10"></Gather>'
+        f'<Say voice="{voice}">No response received. Goodbye.</Say>'
+        f'</Response>'
+    )
+    return prefix, suffix
+
+
+class TwilioError(Exception):
+    """A Twilio API request that came back with an error status."""
+    
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+    
+    @property
+    def retryable(self) -> bool:
+        """4xx errors (bad number, unverified recipient...) won't succeed on retry."""
+        return self.status_code == 429 or self.status_code >= 500
+
+
+async def _acquire_send_slot(kind: str, rate_per_sec: int):
+    """
+    Wait until the sending number has capacity for another request of this
+    kind. Counts requests per one-second window in Redis, so the cap holds
+    across all API and worker processes.
+    """
+    redis = await get_redis()
+    while True:
+        now = time.time()
+        window = int(now)
+        key = f"twilio_rate:{settings.TWILIO_PHONE_NUMBER}:{kind}:{window}"
+        
+        pipe = redis.pipeline(transaction=True)
+        pipe.incr(key)
+        pipe.expire(key, 2)
+        count, _ = await pipe.execute()
+        if count <= rate_per_sec:
+            return
+        
+        await asyncio.sleep(window + 1 - now)
+
+
+def _error_message(response: httpx.Response) -> str:
+    """Extract Twilio's error message from a failed response."""
+    try:
+        return response.json().get("message", response.text)
+    except ValueError:
+        return response.text
+
 
 class TwilioClient:
     """Client for Twilio SMS and voice services."""
     
     def __init__(self):
-        self.client = Client(
-            settings.TWILIO_ACCOUNT_SID,
-            settings.TWILIO_AUTH_TOKEN
-        ) if settings.TWILIO_ACCOUNT_SID else None
+        self.client = get_http_client() if settings.TWILIO_ACCOUNT_SID else None
         self.from_number = settings.TWILIO_PHONE_NUMBER
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
-    async def send_sms(self, to: str, message: str) -> dict:
+    async def _post_with_retry(
+        self, endpoint: str, data: dict, kind: str, rate_per_sec: int
+    ) -> httpx.Response:
+        """
+        POST to the Twilio API, retrying 429/5xx responses and connection
+        failures with exponential backoff. Other responses are returned as-is.
+        Read timeouts and other mid-request errors are raised, not retried:
+        Twilio may already have accepted the POST.
+        Every attempt waits for a slot under the sending number's rate cap.
+        """
+        for attempt in range(SEND_ATTEMPTS):
+            last_attempt = attempt == SEND_ATTEMPTS - 1
+            await _acquire_send_slot(kind, rate_per_sec)
+            try:
+                response = await self.client.post(endpoint, data=data)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                # The request never reached Twilio
+                if last_attempt:
+                    raise
+            else:
+                retryable = response.status_code == 429 or response.status_code >= 500
+                if not retryable or last_attempt:
+                    return response
+            await asyncio.sleep(SEND_RETRY_BASE_DELAY * (2 ** attempt))
+    
+    async def _claim_send(self, idempotency_key: Optional[str]) -> Optional[dict]:
+        """
+        Claim an idempotency key before sending (SET NX, so concurrent
+        senders can't both pass). Returns None if this caller may send, or
+        the earlier send's result. A key still pending means an earlier
+        attempt's outcome is unknown (e.g. its response timed out), so it
+        is not sent again.
+        """
+        if not idempotency_key:
+            return None
+        redis = await get_redis()
+        key = f"twilio:sent:{idempotency_key}"
+        if await redis.set(key, SEND_PENDING, ex=SENT_KEY_TTL, nx=True):
+            return None
+        
+        sid = await redis.get(key)
+        if sid is None:
+            # Expired between the two calls; claim it again
+            return await self._claim_send(idempotency_key)
+        if sid == SEND_PENDING:
+            raise TwilioError(
+                "Outcome of an earlier send with this key is unknown; not resending",
+                409,
+            )
+        return {"sid": sid, "status": "already_sent"}
+    
+    async def _record_sent(self, idempotency_key: Optional[str], sid: str):
+        """Replace the pending claim with the sid so a retry is skipped."""
+        if idempotency_key:
+            redis = await get_redis()
+            await redis.set(f"twilio:sent:{idempotency_key}", sid, ex=SENT_KEY_TTL)
+    
+    async def _release_claim(self, idempotency_key: Optional[str]):
+        """Drop a pending claim after a send Twilio definitely didn't accept."""
+        if idempotency_key:
+            redis = await get_redis()
+            await redis.delete(f"twilio:sent:{idempotency_key}")
+    
+    async def _send(
+        self, endpoint: str, data: dict, kind: str, rate_per_sec: int,
+        idempotency_key: Optional[str], error_label: str,
+    ) -> dict:
+        """
+        POST a send under its idempotency claim. A rejected request or one
+        that never connected releases the claim so a later retry can send;
+        any other error leaves it pending (Twilio may have accepted it).
+        """
+        previous = await self._claim_send(idempotency_key)
+        if previous:
+            return previous
+        
+        try:
+            response = await self._post_with_retry(endpoint, data, kind, rate_per_sec)
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+            await self._release_claim(idempotency_key)
+            raise
+        if response.is_error:
+            await self._release_claim(idempotency_key)
+            raise TwilioError(f"{error_label}: {_error_message(response)}", response.status_code)
+        
+        result = response.json()
+        await self._record_sent(idempotency_key, result["sid"])
+        return {
+            "sid": result["sid"],
+            "status": result["status"],
+        }
+    
+    async def send_sms(
+        self,
+        to: str,
+        message: str,
+        idempotency_key: Optional[str] = None,
+    ) -> dict:
         """
         Send an SMS message.
-        Returns dict with 'sid' and 'status'.
+        Returns dict with 'sid' and 'status'. Sends with an idempotency key
+        go out at most once per key (24h); repeats return the original sid.
         """
         if not self.client:
             # Dev mode - just log
             print(f"[DEV] SMS to {to}: {message}")
             return {"sid": "dev_mode", "status": "sent"}
         
-        try:
-            # Twilio SDK is synchronous, run in executor
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.client.messages.create(
-                    body=message,
-                    from_=self.from_number,
-                    to=to,
-                    status_callback=f"{settings.API_V1_PREFIX}/webhooks/twilio/status"
-                )
-            )
-            
-            return {
-                "sid": result.sid,
-                "status": result.status,
-            }
-            
-        except TwilioRestException as e:
-            raise Exception(f"Twilio SMS error: {e.msg}")
+        return await self._send(
+            "Messages.json",
+            {
+                "Body": message,
+                "From": self.from_number,
+                "To": to,
+                "StatusCallback": f"{settings.API_V1_PREFIX}/webhooks/twilio/status",
+            },
+            kind="sms",
+            rate_per_sec=settings.TWILIO_SMS_RATE_PER_SEC,
+            idempotency_key=idempotency_key,
+            error_label="Twilio SMS error",
+        )
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
     async def make_call(
-        self, 
-        to: str, 
+        self,
+        to: str,
         message: str,
-        voice: str = "alice"
+        voice: str = "alice",
+        idempotency_key: Optional[str] = None,
     ) -> dict:
         """
         Make a voice call with TTS message.
@@ -75,35 +251,21 @@ class TwilioClient:
             return {"sid": "dev_mode", "status": "initiated"}
         
         # Create TwiML for the call
-        twiml = f"""
-        <Response>
-            <Say voice="{voice}">{message}</Say>
-            <Pause length="1"/>
-            <Say voice="{voice}">Press 1 to acknowledge this message.</Say>
-            <Gather numDigits="1" timeout="10">
-            </Gather>
-            <Say voice="{voice}">No response received. Goodbye.</Say>
-        </Response>
-        """
+        prefix, suffix = _twiml_template(voice)
+        twiml = f"{prefix}{message}{suffix}"
         
-        try:
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.client.calls.create(
-                    twiml=twiml,
-                    from_=self.from_number,
-                    to=to,
-                )
-            )
-            
-            return {
-                "sid": result.sid,
-                "status": result.status,
-            }
-            
-        except TwilioRestException as e:
-            raise Exception(f"Twilio call error: {e.msg}")
+        return await self._send(
+            "Calls.json",
+            {
+                "Twiml": twiml,
+                "From": self.from_number,
+                "To": to,
+            },
+            kind="call",
+            rate_per_sec=settings.TWILIO_CALL_RATE_PER_SEC,
+            idempotency_key=idempotency_key,
+            error_label="Twilio call error",
+        )
     
     async def verify_phone_number(self, phone: str) -> bool:
         """
@@ -113,11 +275,10 @@ class TwilioClient:
             return True  # Dev mode
         
         try:
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.client.lookups.v2.phone_numbers(phone).fetch()
+            response = await self.client.get(
+                f"{TWILIO_LOOKUP_URL}/PhoneNumbers/{quote(phone)}"
             )
-            return result.valid
-        except:
+            response.raise_for_status()
+            return bool(response.json().get("valid"))
+        except (httpx.HTTPError, ValueError):
             return False
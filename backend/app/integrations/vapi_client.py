@@ -1,6 +1,7 @@
 """Vapi.ai integration for voice AI."""
 
 import httpx
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 
@@ -10,10 +11,40 @@ settings = get_settings()
 
 VAPI_BASE_URL = "https://api.vapi.ai"
 
+# Shared HTTP client (keep-alive pool reused across requests)
+http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared Vapi HTTP client (lazy initialization)."""
+    global http_client
+    if http_client is None:
+        http_client = httpx.AsyncClient(
+            base_url=VAPI_BASE_URL,
+            headers={
+                "Authorization": f"Bearer {settings.VAPI_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=30.0,
+        )
+    return http_client
+
+
+async def close_http_client():
+    """Close the shared Vapi HTTP client."""
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
 
 class VapiClient:
     """Client for Vapi.ai voice AI platform."""
     
+    __slots__ = ("api_key", "assistant_id")
+    
     def __init__(self):
         self.api_key = settings.VAPI_API_KEY
         self.assistant_id = settings.VAPI_ASSISTANT_ID
@@ -23,24 +54,21 @@ class VapiClient:
         method: str,
         endpoint: str,
         data: Optional[dict] = None,
+        params: Optional[dict] = None,
     ) -> dict:
         """Make authenticated request to Vapi API."""
         if not self.api_key:
             return {"dev_mode": True}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method=method,
-                url=f"{VAPI_BASE_URL}{endpoint}",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json=data,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            return response.json()
+        # Auth headers are set once on the shared client
+        response = await get_http_client().request(
+            method=method,
+            url=endpoint,
+            json=data,
+            params=params,
+        )
+        response.raise_for_status()
+        return response.json()
     
     async def list_calls(
         self,
@@ -58,9 +86,7 @@ class VapiClient:
         if status:
             params["status"] = status
         
-        # Vapi uses query params, convert to endpoint
-        query = "&".join(f"{k}={v}" for k, v in params.items())
-        result = await self._request("GET", f"/call?{query}")
+        result = await self._request("GET", "/call", params=params)
         
         return result if isinstance(result, list) else result.get("calls", [])
     
@@ -125,35 +151,54 @@ class VapiClient:
         return await self._request("POST", "/call/phone", data)
 
 
+@lru_cache()
+def get_vapi_client() -> VapiClient:
+    """Get the app-wide Vapi client (also usable as a FastAPI dependency)."""
+    return VapiClient()
+
+
 class VapiWebhookPayload:
-    """Helper class to parse Vapi webhook payloads."""
+    """
+    Helper class to parse Vapi webhook payloads.
+    Routing fields are extracted up front; transcript, summary and outcome
+    are read from the payload only when accessed.
+    """
+    
+    __slots__ = (
+        "data",
+        "call_id",
+        "type",
+        "metadata",
+        "business_id",
+        "customer_id",
+        "phone_number",
+        "duration_seconds",
+        "_analysis",
+    )
     
     def __init__(self, data: dict):
+        call = data.get("call") or {}
+        metadata = call.get("metadata") or {}
+        
         self.data = data
-        self.call_id = data.get("call", {}).get("id")
-        self.type = data.get("type")  # 'call.started', 'call.ended', etc.
-        self.transcript = data.get("transcript")
-        self.summary = data.get("summary")
-        self.metadata = data.get("call", {}).get("metadata", {})
-    
-    @property
-    def business_id(self) -> Optional[str]:
-        return self.metadata.get("business_id")
-    
-    @property
-    def customer_id(self) -> Optional[str]:
-        return self.metadata.get("customer_id")
+        self.call_id: Optional[str] = call.get("id")
+        self.type: Optional[str] = data.get("type")  # 'call.started', 'call.ended', etc.
+        self.metadata: dict = metadata
+        self.business_id: Optional[str] = metadata.get("business_id")
+        self.customer_id: Optional[str] = metadata.get("customer_id")
+        self.phone_number: Optional[str] = (call.get("customer") or {}).get("number")
+        self.duration_seconds: Optional[int] = call.get("duration")
+        self._analysis: dict = data.get("analysis") or {}
     
     @property
-    def phone_number(self) -> Optional[str]:
-        return self.data.get("call", {}).get("customer", {}).get("number")
+    def transcript(self) -> Optional[str]:
+        return self.data.get("transcript")
     
     @property
-    def duration_seconds(self) -> Optional[int]:
-        return self.data.get("call", {}).get("duration")
+    def summary(self) -> Optional[str]:
+        return self.data.get("summary")
     
     @property
     def outcome(self) -> Optional[str]:
-        """Extract outcome from call analysis or metadata."""
-        analysis = self.data.get("analysis", {})
-        return analysis.get("outcome") or self.metadata.get("outcome")
+        """Outcome from call analysis, falling back to metadata."""
+        return self._analysis.get("outcome") or self.metadata.get("outcome")
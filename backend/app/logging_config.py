@@ -0,0 +1,20 @@
+"""Process-wide logging setup."""
+
+import logging
+import logging.handlers
+import queue
+
+
+def start_log_listener() -> logging.handlers.QueueListener:
+    """
+    Route log records through a queue so the event loop only enqueues them;
+    a background thread does the stderr writes.
+    """
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+    )
+    listener.start()
+    return listener
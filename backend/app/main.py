@@ -2,14 +2,23 @@
 ServiceAI MVP - Main FastAPI Application
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 
 from app.config import get_settings
+from app.logging_config import start_log_listener
 from app.database import init_db, close_db
+from app.integrations.twilio_client import close_http_client as close_twilio_client
+from app.integrations.openai_client import close_http_client as close_openai_client
+from app.integrations.vapi_client import close_http_client as close_vapi_client
+from app.workers.twilio_status import run_status_flusher
+from app.workers.notification_dispatch import run_notification_dispatcher
+from app.workers.reconciliation import run_reconciliation_loop
 from app.api.v1.router import api_router
 from app.api.agent.router import agent_router
 
@@ -20,16 +29,30 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
     # Startup
+    log_listener = start_log_listener()
     print("Starting ServiceAI MVP...")
     await init_db()
     print("Database initialized")
+    status_flusher = asyncio.create_task(run_status_flusher())
+    notification_dispatcher = asyncio.create_task(run_notification_dispatcher())
+    reconciler = asyncio.create_task(run_reconciliation_loop())
     
     yield
     
     # Shutdown
     print("Shutting down...")
+    for task in (status_flusher, notification_dispatcher, reconciler):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
     await close_db()
     print("Database connections closed")
+    await close_twilio_client()
+    await close_openai_client()
+    await close_vapi_client()
+    log_listener.stop()
 
 
 # Create FastAPI app
@@ -38,31 +61,37 @@ app = FastAPI(
     description="Agentic AI SaaS for Plumbing/HVAC Small Businesses",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure properly for production
+    allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=settings.CORS_MAX_AGE,
 )
 
+# Compress larger responses (job lists, dashboards)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 
 # Exception handlers
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors with clear messages."""
-    errors = []
-    for error in exc.errors():
-        errors.append({
-            "field": ".".join(str(x) for x in error["loc"]),
+    errors = [
+        {
+            "field": ".".join(map(str, error["loc"])),
             "message": error["msg"],
             "type": error["type"],
-        })
+        }
+        for error in exc.errors()
+    ]
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "detail": "Validation error",
@@ -76,7 +105,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions."""
     # In production, log this and don't expose internal errors
     if settings.DEBUG:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 "detail": str(exc),
@@ -84,7 +113,7 @@ async def general_exception_handler(request: Request, exc: Exception):
             },
         )
     else:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"detail": "Internal server error"},
         )
@@ -1,11 +1,10 @@
 """Business (tenant) model."""
 
 import uuid
-from datetime import datetime
 from sqlalchemy import Column, String, Boolean, DateTime, JSON, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class Business(Base):
@@ -63,15 +62,16 @@ class Business(Base):
     partner_businesses = Column(JSON, default=list)  # List of partner business IDs
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
     
     # Relationships
-    users = relationship("User", back_populates="business")
-    customers = relationship("Customer", back_populates="business")
-    technicians = relationship("Technician", back_populates="business")
-    jobs = relationship("Job", back_populates="business")
-    schedule_blocks = relationship("ScheduleBlock", back_populates="business")
+    # lazy="raise": callers must choose a loader (selectinload etc.) explicitly
+    users = relationship("User", back_populates="business", lazy="raise")
+    customers = relationship("Customer", back_populates="business", lazy="raise")
+    technicians = relationship("Technician", back_populates="business", lazy="raise")
+    jobs = relationship("Job", back_populates="business", lazy="raise")
+    schedule_blocks = relationship("ScheduleBlock", back_populates="business", lazy="raise")
     
     def __repr__(self):
-        return f"<Business {self.name}>"
+        return f"<Business {self.__dict__.get('name')}>"
@@ -1,11 +1,10 @@
 """Customer models including addresses and OTP verification."""
 
 import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, Index, Integer
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, Index, Integer, Computed
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class Customer(Base):
@@ -29,14 +28,15 @@ class Customer(Base):
     app_platform = Column(String(20))  # 'ios' or 'android'
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
     last_active_at = Column(DateTime)
     
     # Relationships
-    business = relationship("Business", back_populates="customers")
-    addresses = relationship("CustomerAddress", back_populates="customer", cascade="all, delete-orphan")
-    jobs = relationship("Job", back_populates="customer")
+    # lazy="raise": callers must choose a loader (selectinload etc.) explicitly
+    business = relationship("Business", back_populates="customers", lazy="raise")
+    addresses = relationship("CustomerAddress", back_populates="customer", cascade="all, delete-orphan", lazy="raise")
+    jobs = relationship("Job", back_populates="customer", lazy="raise")
     
     # Unique constraint: one phone per business
     __table_args__ = (
@@ -44,7 +44,17 @@ class Customer(Base):
     )
     
     def __repr__(self):
-        return f"<Customer {self.name or self.phone}>"
+        state = self.__dict__  # loaded attributes only; never triggers a lazy load
+        return f"<Customer {state.get('name') or state.get('phone')}>"
+
+
+# "street, Unit 4B, city, state zip" (unit part omitted when empty).
+# Only immutable operators, as required for a generated column.
+FULL_ADDRESS_SQL = (
+    "street"
+    " || CASE WHEN unit IS NULL OR unit = '' THEN '' ELSE ', Unit ' || unit END"
+    " || ', ' || city || ', ' || state || ' ' || zip_code"
+)
 
 
 class CustomerAddress(Base):
@@ -65,6 +75,13 @@ class CustomerAddress(Base):
     state = Column(String(50), nullable=False)
     zip_code = Column(String(20), nullable=False)
     
+    # Generated by Postgres from the components above, so reads (job lists,
+    # address lists) serialize a stored string instead of formatting per row
+    full_address = Column(
+        String(400),
+        Computed(FULL_ADDRESS_SQL, persisted=True),
+    )
+    
     # Geocoded coordinates
     latitude = Column(String(20))
     longitude = Column(String(20))
@@ -77,23 +94,15 @@ class CustomerAddress(Base):
     is_default = Column(Boolean, default=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
     
     # Relationships
     customer = relationship("Customer", back_populates="addresses")
     jobs = relationship("Job", back_populates="address")
     
-    @property
-    def full_address(self) -> str:
-        """Return formatted full address."""
-        parts = [self.street]
-        if self.unit:
-            parts.append(f"Unit {self.unit}")
-        parts.append(f"{self.city}, {self.state} {self.zip_code}")
-        return ", ".join(parts)
-    
     def __repr__(self):
-        return f"<CustomerAddress {self.street}, {self.city}>"
+        state = self.__dict__
+        return f"<CustomerAddress {state.get('street')}, {state.get('city')}>"
 
 
 class OTPCode(Base):
@@ -103,7 +112,7 @@ class OTPCode(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
-    phone = Column(String(20), nullable=False, index=True)
+    phone = Column(String(20), nullable=False)
     code = Column(String(6), nullable=False)
     
     # For multi-tenant, track which business context
@@ -114,9 +123,19 @@ class OTPCode(Base):
     attempts = Column(Integer, default=0)  # Track failed attempts
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
     expires_at = Column(DateTime, nullable=False)
     verified_at = Column(DateTime)
     
+    # Issue/verify only ever look at unverified codes for a phone
+    __table_args__ = (
+        Index(
+            "ix_otp_codes_active",
+            "phone",
+            "code",
+            postgresql_where=(verified == False),
+        ),
+    )
+    
     def __repr__(self):
-        return f"<OTPCode {self.phone}>"
+        return f"<OTPCode {self.__dict__.get('phone')}>"
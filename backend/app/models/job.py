@@ -1,12 +1,12 @@
 """Job models - the core entity of the system."""
 
 import uuid
-from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, Date, Time, Index, Enum
+from sqlalchemy import Column, String, Boolean, SmallInteger, Numeric, DateTime, ForeignKey, Text, Date, Time, Index, Enum
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import text
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class JobStatus(str, PyEnum):
@@ -37,12 +37,17 @@ class JobSource(str, PyEnum):
     WEBSITE = "website"
 
 
+def _enum_values(enum_cls) -> list:
+    """Store enum values (not member names) as the Postgres ENUM labels."""
+    return [member.value for member in enum_cls]
+
+
 class Job(Base):
     """Job entity - represents a service request/appointment."""
     
     __tablename__ = "jobs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v7()"))
     business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False)
     customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id"), nullable=False)
     address_id = Column(UUID(as_uuid=True), ForeignKey("customer_addresses.id"))
@@ -51,8 +56,8 @@ class Job(Base):
     # Job Details
     service_type = Column(String(100), nullable=False)  # 'plumbing', 'hvac', 'water_heater', etc.
     description = Column(Text)
-    priority = Column(Enum(JobPriority), default=JobPriority.NORMAL)
-    status = Column(Enum(JobStatus), default=JobStatus.PENDING)
+    priority = Column(Enum(JobPriority, name="job_priority", values_callable=_enum_values), default=JobPriority.NORMAL)
+    status = Column(Enum(JobStatus, name="job_status", values_callable=_enum_values), default=JobStatus.PENDING)
     
     # Scheduling
     scheduled_date = Column(Date)
@@ -60,22 +65,22 @@ class Job(Base):
     scheduled_time_end = Column(Time)
     
     # Tracking
-    source = Column(Enum(JobSource), default=JobSource.CUSTOMER_APP)
+    source = Column(Enum(JobSource, name="job_source", values_callable=_enum_values), default=JobSource.CUSTOMER_APP)
     source_call_id = Column(String(100))  # Vapi call ID for reconciliation
     confirmation_code = Column(String(20))
     
     # Emergency Detection
     emergency_keywords_matched = Column(Boolean, default=False)
-    emergency_confidence_score = Column(String(10))  # LLM confidence: "0.95"
+    emergency_confidence_score = Column(Numeric(4, 3))  # LLM confidence: 0.950
     review_recommended = Column(Boolean, default=False)
     
     # Escalation Tracking
-    escalation_level = Column(String(10), default="0")  # 0, 1, 2, 3, 4
+    escalation_level = Column(SmallInteger, default=0)  # 0, 1, 2, 3, 4
     last_escalation_at = Column(DateTime)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
     assigned_at = Column(DateTime)
     started_at = Column(DateTime)
     completed_at = Column(DateTime)
@@ -91,7 +96,9 @@ class Job(Base):
     status_history = relationship("JobStatusHistory", back_populates="job", cascade="all, delete-orphan")
     
     # Prevent double-booking: unique constraint on business + date + time
-    # Only applies to non-cancelled jobs
+    # Only applies to non-cancelled jobs. The predicate is spelled as a fixed
+    # literal (status <> 'cancelled') so queries filtering with
+    # Job.status != JobStatus.CANCELLED can be matched to this partial index.
     __table_args__ = (
         Index(
             "ix_jobs_unique_slot",
@@ -100,12 +107,28 @@ class Job(Base):
             "scheduled_time_start",
             "technician_id",
             unique=True,
-            postgresql_where=(status != JobStatus.CANCELLED)
+            postgresql_where=text("status <> 'cancelled'"),
+        ),
+        # Dispatcher / dashboard lookups by status for a given day
+        Index("ix_jobs_business_status_date", "business_id", "status", "scheduled_date"),
+        # Escalation sweep: unassigned pending jobs by age
+        Index(
+            "ix_jobs_escalation_due",
+            "business_id",
+            "created_at",
+            postgresql_where=text("status = 'pending' AND technician_id IS NULL"),
+        ),
+        # Reconciliation: which missed calls already produced a job
+        Index(
+            "ix_jobs_source_call_id",
+            "source_call_id",
+            postgresql_where=text("source_call_id IS NOT NULL"),
         ),
     )
     
     def __repr__(self):
-        return f"<Job {self.confirmation_code or self.id}>"
+        state = self.__dict__  # loaded attributes only; never triggers a lazy load
+        return f"<Job {state.get('confirmation_code') or state.get('id')}>"
 
 
 class JobNote(Base):
@@ -125,13 +148,13 @@ class JobNote(Base):
     author_name = Column(String(255))
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
     
     # Relationships
     job = relationship("Job", back_populates="notes")
     
     def __repr__(self):
-        return f"<JobNote {self.job_id}>"
+        return f"<JobNote {self.__dict__.get('job_id')}>"
 
 
 class JobPhoto(Base):
@@ -152,13 +175,13 @@ class JobPhoto(Base):
     uploaded_by_id = Column(UUID(as_uuid=True))
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
     
     # Relationships
     job = relationship("Job", back_populates="photos")
     
     def __repr__(self):
-        return f"<JobPhoto {self.job_id}>"
+        return f"<JobPhoto {self.__dict__.get('job_id')}>"
 
 
 class JobStatusHistory(Base):
@@ -166,7 +189,7 @@ class JobStatusHistory(Base):
     
     __tablename__ = "job_status_history"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v7()"))
     job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False)
     
     # Status change
@@ -181,10 +204,11 @@ class JobStatusHistory(Base):
     reason = Column(Text)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
     
     # Relationships
     job = relationship("Job", back_populates="status_history")
     
     def __repr__(self):
-        return f"<JobStatusHistory {self.from_status} -> {self.to_status}>"
+        state = self.__dict__
+        return f"<JobStatusHistory {state.get('from_status')} -> {state.get('to_status')}>"
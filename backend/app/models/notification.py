@@ -1,11 +1,10 @@
 """Notification tracking models."""
 
-import uuid
-from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, String, Integer, SmallInteger, Boolean, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
-from app.database import Base
+from sqlalchemy.sql import text, false
+from app.database import Base, utcnow_sql
 
 
 class NotificationChannel(str, PyEnum):
@@ -40,7 +39,7 @@ class Notification(Base):
     
     __tablename__ = "notifications"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v7()"))
     business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False)
     
     # What triggered this notification
@@ -65,18 +64,34 @@ class Notification(Base):
     
     # Error handling
     error_message = Column(Text)
-    retry_count = Column(String(10), default="0")
-    max_retries = Column(String(10), default="3")
+    retry_count = Column(SmallInteger, default=0)
+    max_retries = Column(SmallInteger, default=3)
     next_retry_at = Column(DateTime)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
     sent_at = Column(DateTime)
     delivered_at = Column(DateTime)
     failed_at = Column(DateTime)
     
+    # Retry worker: failed/retrying notifications that are due, plus queued
+    # ones the dispatcher hasn't sent in time
+    __table_args__ = (
+        Index(
+            "ix_notifications_retry_due",
+            "business_id",
+            "next_retry_at",
+            postgresql_where=status.in_([
+                NotificationStatus.FAILED,
+                NotificationStatus.RETRYING,
+                NotificationStatus.PENDING,
+            ]),
+        ),
+    )
+    
     def __repr__(self):
-        return f"<Notification {self.channel} to {self.recipient_type}>"
+        state = self.__dict__  # loaded attributes only; never triggers a lazy load
+        return f"<Notification {state.get('channel')} to {state.get('recipient_type')}>"
 
 
 class CallLog(Base):
@@ -87,11 +102,11 @@ class CallLog(Base):
     
     __tablename__ = "call_logs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v7()"))
     business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False)
     
     # Vapi/Twilio identifiers
-    external_call_id = Column(String(100), unique=True, nullable=False, index=True)
+    external_call_id = Column(String(100), nullable=False)
     provider = Column(String(50), default="vapi")  # 'vapi', 'twilio'
     
     # Call details
@@ -107,7 +122,7 @@ class CallLog(Base):
     # Duration
     started_at = Column(DateTime)
     ended_at = Column(DateTime)
-    duration_seconds = Column(String(10))
+    duration_seconds = Column(Integer)
     
     # Linking
     job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"))  # If a job was created
@@ -119,11 +134,28 @@ class CallLog(Base):
     processing_error = Column(Text)
     
     # Reconciliation
-    was_reconciled = Column(String(10), default="false")  # 'true' if recovered by reconciliation job
+    was_reconciled = Column(Boolean, nullable=False, default=False, server_default=false())  # True if recovered by reconciliation job
     reconciled_at = Column(DateTime)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    
+    __table_args__ = (
+        # Reconciliation: recent calls whose webhook was never processed
+        Index(
+            "ix_call_logs_pending",
+            "business_id",
+            "created_at",
+            postgresql_where=webhook_processed.is_(None),
+        ),
+        # One log per provider call; covers the reconciler's dedup lookup
+        Index(
+            "ix_call_logs_external_call_id",
+            "external_call_id",
+            unique=True,
+            postgresql_include=["id", "webhook_processed"],
+        ),
+    )
     
     def __repr__(self):
-        return f"<CallLog {self.external_call_id}>"
+        return f"<CallLog {self.__dict__.get('external_call_id')}>"
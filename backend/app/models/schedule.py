@@ -1,11 +1,10 @@
 """Schedule and availability models."""
 
 import uuid
-from datetime import datetime
 from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Time, Integer, Date
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class ScheduleBlock(Base):
@@ -29,21 +28,23 @@ class ScheduleBlock(Base):
     label = Column(String(100))  # "Regular Hours", "On Call", etc.
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
     
     # Relationships
     business = relationship("Business", back_populates="schedule_blocks")
     technician = relationship("Technician", back_populates="schedule_blocks")
     
     def __repr__(self):
-        return f"<ScheduleBlock day={self.day_of_week} {self.start_time}-{self.end_time}>"
+        state = self.__dict__  # loaded attributes only; never triggers a lazy load
+        return f"<ScheduleBlock day={state.get('day_of_week')} {state.get('start_time')}-{state.get('end_time')}>"
 
 
 class SlotReservation(Base):
     """
     Temporary slot reservations to prevent double-booking.
-    These are short-lived (5 minutes) and stored in both DB and Redis.
+    Active holds are short-lived (5 minutes) and live only in Redis;
+    a row is written here when the hold is confirmed into a job.
     """
     
     __tablename__ = "slot_reservations"
@@ -65,12 +66,13 @@ class SlotReservation(Base):
     job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"))  # Set when confirmed
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
     expires_at = Column(DateTime, nullable=False)
     confirmed_at = Column(DateTime)
     
     def __repr__(self):
-        return f"<SlotReservation {self.slot_date} {self.slot_start_time}>"
+        state = self.__dict__
+        return f"<SlotReservation {state.get('slot_date')} {state.get('slot_start_time')}>"
 
 
 class TimeOff(Base):
@@ -95,7 +97,8 @@ class TimeOff(Base):
     reason = Column(String(255))  # "Vacation", "Sick", "Holiday", etc.
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
     
     def __repr__(self):
-        return f"<TimeOff {self.start_date} - {self.end_date}>"
+        state = self.__dict__
+        return f"<TimeOff {state.get('start_date')} - {state.get('end_date')}>"
@@ -1,11 +1,10 @@
 """Technician models."""
 
 import uuid
-from datetime import datetime
 from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Float
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class Technician(Base):
@@ -38,17 +37,18 @@ class Technician(Base):
     location_updated_at = Column(DateTime)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
     
     # Relationships
-    business = relationship("Business", back_populates="technicians")
-    skills = relationship("TechnicianSkill", back_populates="technician", cascade="all, delete-orphan")
-    jobs = relationship("Job", back_populates="technician")
-    schedule_blocks = relationship("ScheduleBlock", back_populates="technician")
+    # lazy="raise": callers must choose a loader (selectinload etc.) explicitly
+    business = relationship("Business", back_populates="technicians", lazy="raise")
+    skills = relationship("TechnicianSkill", back_populates="technician", cascade="all, delete-orphan", lazy="raise")
+    jobs = relationship("Job", back_populates="technician", lazy="raise")
+    schedule_blocks = relationship("ScheduleBlock", back_populates="technician", lazy="raise")
     
     def __repr__(self):
-        return f"<Technician {self.name}>"
+        return f"<Technician {self.__dict__.get('name')}>"
 
 
 class TechnicianSkill(Base):
@@ -66,10 +66,10 @@ class TechnicianSkill(Base):
     expiry_date = Column(DateTime)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
     
     # Relationships
     technician = relationship("Technician", back_populates="skills")
     
     def __repr__(self):
-        return f"<TechnicianSkill {self.skill_type}>"
+        return f"<TechnicianSkill {self.__dict__.get('skill_type')}>"
@@ -1,12 +1,12 @@
 """User model for business owners/admins."""
 
 import uuid
-from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum, Index
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index, SmallInteger
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class UserRole(str, PyEnum):
@@ -16,6 +16,32 @@ class UserRole(str, PyEnum):
     DISPATCHER = "dispatcher" # Can manage jobs but not settings
 
 
+# Stored as SMALLINT; codes are persisted, so never renumber them
+USER_ROLE_CODES = {
+    UserRole.OWNER: 1,
+    UserRole.ADMIN: 2,
+    UserRole.DISPATCHER: 3,
+}
+USER_ROLES_BY_CODE = {code: role for role, code in USER_ROLE_CODES.items()}
+
+
+class UserRoleType(TypeDecorator):
+    """UserRole stored as a small integer code instead of a Postgres ENUM."""
+    
+    impl = SmallInteger
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return USER_ROLE_CODES[UserRole(value)]
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return USER_ROLES_BY_CODE[value]
+
+
 class User(Base):
     """User entity - business owners and admin staff."""
     
@@ -33,19 +59,19 @@ class User(Base):
     phone = Column(String(20))
     
     # Role
-    role = Column(Enum(UserRole), default=UserRole.ADMIN, nullable=False)
+    role = Column(UserRoleType(), default=UserRole.ADMIN, nullable=False)
     
     # Status
     is_active = Column(Boolean, default=True)
     email_verified = Column(Boolean, default=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
     last_login_at = Column(DateTime)
     
     # Relationships
-    business = relationship("Business", back_populates="users")
+    business = relationship("Business", back_populates="users", lazy="raise")
     
     # Unique constraint: one email per business
     __table_args__ = (
@@ -53,4 +79,6 @@ class User(Base):
     )
     
     def __repr__(self):
-        return f"<User {self.email} ({self.role.value})>"
+        state = self.__dict__  # loaded attributes only; never triggers a lazy load
+        role = state.get("role")
+        return f"<User {state.get('email')} ({role.value if role else None})>"
@@ -3,9 +3,42 @@
 from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+import re
 import phonenumbers
 
+# Common case: a US number written with optional +1 and punctuation.
+# Area code and exchange must start with 2-9 (NANP).
+_US_PHONE_SEPARATORS = re.compile(r"[\s().-]")
+_US_PHONE_FAST = re.compile(r"^(?:\+?1)?([2-9]\d{2}[2-9]\d{6})$")
+
+
+def normalize_phone(v: str) -> str:
+    """
+    Validate a phone number and return it in E.164 format.
+    Plain US numbers are handled without phonenumbers; anything else is
+    parsed with it (US as default region).
+    """
+    match = _US_PHONE_FAST.match(_US_PHONE_SEPARATORS.sub("", v))
+    if match:
+        return "+1" + match.group(1)
+    
+    try:
+        parsed = phonenumbers.parse(v, "US")
+        if not phonenumbers.is_valid_number(parsed):
+            raise ValueError("Invalid phone number")
+        return phonenumbers.format_number(
+            parsed, phonenumbers.PhoneNumberFormat.E164
+        )
+    except phonenumbers.NumberParseException as e:
+        raise ValueError(f"Invalid phone number: {e}")
+
+
+# phonenumbers loads region metadata lazily on first use. Load the default
+# region at import so it happens once in the gunicorn master (preload_app)
+# and is inherited by workers, not on a worker's first login request.
+phonenumbers.is_valid_number(phonenumbers.parse("+14155552671", "US"))
+
 
 class CustomerAddressCreate(BaseModel):
     """Schema for creating a customer address."""
@@ -43,8 +76,7 @@ class CustomerAddressResponse(BaseModel):
     full_address: str
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CustomerCreate(BaseModel):
@@ -58,15 +90,7 @@ class CustomerCreate(BaseModel):
     @classmethod
     def validate_phone(cls, v: str) -> str:
         """Validate and normalize phone number."""
-        try:
-            parsed = phonenumbers.parse(v, "US")
-            if not phonenumbers.is_valid_number(parsed):
-                raise ValueError("Invalid phone number")
-            return phonenumbers.format_number(
-                parsed, phonenumbers.PhoneNumberFormat.E164
-            )
-        except phonenumbers.NumberParseException as e:
-            raise ValueError(f"Invalid phone number: {e}")
+        return normalize_phone(v)
 
 
 class CustomerUpdate(BaseModel):
@@ -89,8 +113,7 @@ class CustomerResponse(BaseModel):
     addresses: List[CustomerAddressResponse] = []
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Auth schemas
@@ -103,15 +126,7 @@ class OTPRequest(BaseModel):
     @field_validator("phone")
     @classmethod
     def validate_phone(cls, v: str) -> str:
-        try:
-            parsed = phonenumbers.parse(v, "US")
-            if not phonenumbers.is_valid_number(parsed):
-                raise ValueError("Invalid phone number")
-            return phonenumbers.format_number(
-                parsed, phonenumbers.PhoneNumberFormat.E164
-            )
-        except phonenumbers.NumberParseException as e:
-            raise ValueError(f"Invalid phone number: {e}")
+        return normalize_phone(v)
 
 
 class OTPVerify(BaseModel):
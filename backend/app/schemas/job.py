@@ -3,7 +3,8 @@
 from datetime import datetime, date, time
 from typing import Optional, List
 from uuid import UUID
-from pydantic import BaseModel, Field
+from typing_extensions import TypedDict
+from pydantic import BaseModel, ConfigDict, Field
 from app.models.job import JobStatus, JobPriority, JobSource
 
 
@@ -75,8 +76,7 @@ class JobNoteResponse(BaseModel):
     author_name: Optional[str]
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class JobTechnicianResponse(BaseModel):
@@ -86,8 +86,7 @@ class JobTechnicianResponse(BaseModel):
     name: str
     phone: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class JobCustomerResponse(BaseModel):
@@ -97,8 +96,7 @@ class JobCustomerResponse(BaseModel):
     name: Optional[str]
     phone: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class JobAddressResponse(BaseModel):
@@ -116,8 +114,7 @@ class JobAddressResponse(BaseModel):
     gate_code: Optional[str]
     access_notes: Optional[str]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class JobResponse(BaseModel):
@@ -157,8 +154,7 @@ class JobResponse(BaseModel):
     started_at: Optional[datetime]
     completed_at: Optional[datetime]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class JobListResponse(BaseModel):
@@ -173,8 +169,22 @@ class JobListResponse(BaseModel):
 
 # Technician app schemas
 
-class TechnicianJobResponse(BaseModel):
-    """Job response for technician app (includes customer contact info)."""
+class TechnicianJobNote(TypedDict):
+    """Job note as returned to the technician app."""
+    
+    id: UUID
+    content: str
+    author_type: Optional[str]
+    author_name: Optional[str]
+    created_at: datetime
+
+
+class TechnicianJobResponse(TypedDict):
+    """
+    Job response for technician app (includes customer contact info).
+    Plain TypedDict: rows are built as dicts straight from the ORM, with no
+    per-row model instantiation.
+    """
     
     id: UUID
     confirmation_code: Optional[str]
@@ -207,10 +217,7 @@ class TechnicianJobResponse(BaseModel):
     access_notes: Optional[str]
     
     # Notes
-    notes: List[JobNoteResponse] = []
+    notes: List[TechnicianJobNote]
     
     # Timestamps
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
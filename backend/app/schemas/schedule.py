@@ -3,7 +3,7 @@
 from datetime import datetime, date, time
 from typing import Optional, List
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TimeSlot(BaseModel):
@@ -77,8 +77,7 @@ class ScheduleBlockResponse(BaseModel):
     is_available: bool
     label: Optional[str]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TimeOffCreate(BaseModel):
@@ -105,5 +104,4 @@ class TimeOffResponse(BaseModel):
     end_time: Optional[time]
     reason: Optional[str]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
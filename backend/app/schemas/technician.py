@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TechnicianSkillCreate(BaseModel):
@@ -24,8 +24,7 @@ class TechnicianSkillResponse(BaseModel):
     certified_date: Optional[datetime]
     expiry_date: Optional[datetime]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TechnicianCreate(BaseModel):
@@ -72,8 +71,7 @@ class TechnicianResponse(BaseModel):
     location_updated_at: Optional[datetime]
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TechnicianBriefResponse(BaseModel):
@@ -85,5 +83,4 @@ class TechnicianBriefResponse(BaseModel):
     is_active: bool
     is_on_call: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -2,9 +2,10 @@
 
 import secrets
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, List
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import select, update, exists, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -14,6 +15,7 @@ from app.schemas.customer import (
     CustomerUpdate,
     CustomerAddressCreate,
 )
+from app.services.job_service import JobService
 from app.config import get_settings
 
 settings = get_settings()
@@ -57,10 +59,10 @@ class CustomerService:
             phone=data.phone,
             name=data.name,
             email=data.email,
+            addresses=[],
         )
         self.db.add(customer)
         await self.db.commit()
-        await self.db.refresh(customer)
         return customer
     
     async def update(self, customer_id: UUID, data: CustomerUpdate) -> Optional[Customer]:
@@ -73,9 +75,9 @@ class CustomerService:
         for field, value in update_data.items():
             setattr(customer, field, value)
         
-        customer.updated_at = datetime.utcnow()
         await self.db.commit()
-        await self.db.refresh(customer)
+        # Job listing pages embed the customer's contact details
+        await JobService(self.db, self.business_id).invalidate_job_lists()
         return customer
     
     async def add_address(
@@ -84,24 +86,35 @@ class CustomerService:
         data: CustomerAddressCreate
     ) -> Optional[CustomerAddress]:
         """Add an address to customer."""
-        customer = await self.get_by_id(customer_id)
-        if not customer:
-            return None
-        
-        # If this is default, unset other defaults
+        # If this is default, unset other defaults (one statement, nothing loaded)
         if data.is_default:
-            for addr in customer.addresses:
-                addr.is_default = False
+            await self.db.execute(
+                update(CustomerAddress)
+                .where(
+                    CustomerAddress.customer_id == customer_id,
+                    CustomerAddress.is_default == True
+                )
+                .values(is_default=False)
+            )
         
         address = CustomerAddress(
             customer_id=customer_id,
             **data.model_dump()
         )
         self.db.add(address)
+        # id, created_at and full_address come back via INSERT ... RETURNING
         await self.db.commit()
-        await self.db.refresh(address)
         return address
     
+    async def list_addresses(self, customer_id: UUID) -> List[CustomerAddress]:
+        """Get all addresses for a customer, default first."""
+        result = await self.db.execute(
+            select(CustomerAddress)
+            .where(CustomerAddress.customer_id == customer_id)
+            .order_by(CustomerAddress.is_default.desc(), CustomerAddress.created_at)
+        )
+        return list(result.scalars())
+    
     async def get_address(self, address_id: UUID, customer_id: UUID) -> Optional[CustomerAddress]:
         """Get a specific address."""
         result = await self.db.execute(
@@ -127,19 +140,10 @@ class CustomerService:
     async def create_otp(self, phone: str) -> str:
         """Generate and store OTP code."""
         # Generate 6-digit code
-        code = "".join([str(secrets.randbelow(10)) for _ in range(6)])
-        
-        # Expire any existing OTPs for this phone
-        existing = await self.db.execute(
-            select(OTPCode).where(
-                OTPCode.phone == phone,
-                OTPCode.verified == False
-            )
-        )
-        for otp in existing.scalars():
-            await self.db.delete(otp)
+        code = f"{secrets.randbelow(1_000_000):06d}"
         
-        # Create new OTP
+        # Create new OTP. Older codes stop verifying (verify_otp only accepts
+        # the newest) and are purged in bulk by workers/otp_cleanup.py.
         otp = OTPCode(
             phone=phone,
             code=code,
@@ -152,37 +156,78 @@ class CustomerService:
         return code
     
     async def verify_otp(self, phone: str, code: str) -> bool:
-        """Verify OTP code."""
-        result = await self.db.execute(
-            select(OTPCode).where(
+        """
+        Verify OTP code.
+        Only the phone's newest unverified code is accepted, so issuing a new
+        code invalidates earlier ones. Marks the code used and the customer's
+        phone verified in a single statement (data-modifying CTEs), so a code
+        can only be redeemed once.
+        """
+        now = datetime.utcnow()
+        
+        latest_otp_id = (
+            select(OTPCode.id)
+            .where(
                 OTPCode.phone == phone,
-                OTPCode.code == code,
+                OTPCode.business_id == self.business_id,
                 OTPCode.verified == False,
-                OTPCode.expires_at > datetime.utcnow()
             )
+            .order_by(OTPCode.created_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        verified_otp = (
+            update(OTPCode)
+            .where(
+                OTPCode.id == latest_otp_id,
+                OTPCode.code == code,
+                OTPCode.expires_at > now
+            )
+            .values(verified=True, verified_at=now)
+            .returning(OTPCode.id)
+            .cte("verified_otp")
+        )
+        verified_customer = (
+            update(Customer)
+            .where(
+                Customer.phone == phone,
+                Customer.business_id == self.business_id,
+                exists(select(verified_otp.c.id))
+            )
+            .values(phone_verified=True)
+            .cte("verified_customer")
         )
-        otp = result.scalar_one_or_none()
-        
-        if not otp:
-            # Track failed attempt (optional: implement rate limiting)
-            return False
-        
-        # Mark as verified
-        otp.verified = True
-        otp.verified_at = datetime.utcnow()
-        
-        # Mark customer phone as verified
-        customer = await self.get_by_phone(phone)
-        if customer:
-            customer.phone_verified = True
         
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(verified_otp)
+            .add_cte(verified_customer)
+        )
         await self.db.commit()
-        return True
+        
+        # Track failed attempts here if rate limiting is added
+        return result.scalar_one() > 0
     
     async def get_or_create_by_phone(self, phone: str, name: Optional[str] = None) -> Customer:
-        """Get existing customer or create new one."""
-        customer = await self.get_by_phone(phone)
-        if customer:
-            return customer
+        """
+        Get existing customer or create new one.
+        Single INSERT ... ON CONFLICT on (business_id, phone), so concurrent
+        callers for the same phone can't race. An existing name is kept.
+        """
+        data = CustomerCreate(phone=phone, name=name)
+        stmt = insert(Customer).values(
+            business_id=self.business_id,
+            phone=data.phone,
+            name=data.name,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Customer.business_id, Customer.phone],
+            set_={"name": func.coalesce(Customer.name, stmt.excluded.name)},
+        ).returning(Customer)
         
-        return await self.create(CustomerCreate(phone=phone, name=name))
+        result = await self.db.execute(
+            stmt, execution_options={"populate_existing": True}
+        )
+        customer = result.scalar_one()
+        await self.db.commit()
+        return customer
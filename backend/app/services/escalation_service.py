@@ -1,5 +1,6 @@
 """Escalation service - handles job escalation for unassigned jobs."""
 
+import secrets
 from datetime import datetime, timedelta
 from typing import List, Optional
 from uuid import UUID
@@ -9,11 +10,63 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.job import Job, JobStatus
 from app.models.business import Business
 from app.services.notification_service import NotificationService
-from app.services.job_service import JobService
+from app.services.job_service import JobService, ESCALATION_BATCH_SIZE
+from app.database import get_redis
 from app.config import get_settings
 
 settings = get_settings()
 
+# A sweep holds a per-business Redis lock so overlapping runs (several
+# workers, manual triggers) don't escalate the same jobs twice
+ESCALATION_SWEEP_LOCK_SECONDS = 300
+
+# Delete the lock only if it still holds our token, in one atomic step
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Owner alert queued by each escalation action:
+# action -> (message template, trigger event, urgent, action result)
+# Urgent alerts also place a voice call.
+OWNER_ALERTS = {
+    "first_reminder": (
+        "⚠️ Job {code} needs assignment. Service: {service}. Created {age} ago.",
+        "escalation_reminder_1",
+        False,
+        "first_reminder_sent",
+    ),
+    "second_reminder_call": (
+        "🚨 URGENT: Job {code} still unassigned! Customer waiting for {age}. "
+        "Please assign immediately.",
+        "escalation_reminder_2",
+        True,
+        "second_reminder_with_call",
+    ),
+    "auto_assign_or_alert": (
+        "🔴 CRITICAL: Job {code} unassigned for {age}! "
+        "Customer may call competitor. Action required NOW.",
+        "escalation_critical",
+        True,
+        "critical_alert_sent",
+    ),
+    "customer_outreach": (
+        "⛔ SLA BREACH: Job {code} unassigned for 24+ hours. "
+        "Customer has been notified of delay. This will affect service metrics.",
+        "escalation_sla_breach",
+        True,
+        "customer_outreach_completed",
+    ),
+}
+
+CUSTOMER_APOLOGY_MESSAGE = (
+    "We apologize for the delay in confirming your service request. "
+    "We're working to assign a technician. "
+    "Please call us if you need immediate assistance."
+)
+
 
 class EscalationService:
     """Service for handling job escalation ladder."""
@@ -27,50 +80,123 @@ class EscalationService:
         4: {"delay_minutes": 1440, "action": "customer_outreach"},
     }
     
+    # level -> delay, highest level first (the order the SQL CASE tests them)
+    LEVEL_DELAYS = {
+        level: config["delay_minutes"]
+        for level, config in sorted(ESCALATION_LEVELS.items(), reverse=True)
+    }
+    
     def __init__(self, db: AsyncSession, business_id: UUID):
         self.db = db
         self.business_id = business_id
         self.notification_service = NotificationService(db, business_id)
         self.job_service = JobService(db, business_id)
+        self._business: Optional[Business] = None
+        self._auto_assign: Optional[bool] = None
+        self._schedule_service = None
     
     async def check_and_escalate_jobs(self) -> List[dict]:
         """
         Check all pending jobs and escalate as needed.
-        Returns list of actions taken.
+        Due jobs are processed in batches so a large backlog is never
+        loaded into memory at once. Returns list of actions taken (empty
+        if another sweep for this business is already running).
         """
+        redis = await get_redis()
+        lock_key = f"escalation_sweep:{self.business_id}"
+        lock_token = secrets.token_hex(8)
+        if not await redis.set(lock_key, lock_token, ex=ESCALATION_SWEEP_LOCK_SECONDS, nx=True):
+            return []
+        
+        try:
+            return await self._run_sweep()
+        finally:
+            # Release only our own lock (it may have expired and been retaken)
+            release = redis.register_script(RELEASE_LOCK_SCRIPT)
+            await release(keys=[lock_key], args=[lock_token])
+    
+    async def _run_sweep(self) -> List[dict]:
+        """Escalate every due job for the business, batch by batch."""
         actions = []
+        now = datetime.utcnow()  # one clock for the whole sweep's messages
+        after = None
         
-        # Get all pending unassigned jobs
-        pending_jobs = await self.job_service.get_pending_jobs_for_escalation()
+        while True:
+            # Only jobs whose age crossed a higher level, with that level
+            due_jobs = await self.job_service.get_jobs_needing_escalation(
+                self.LEVEL_DELAYS, after=after
+            )
+            if not due_jobs:
+                break
+            
+            actions.extend(await self._escalate_batch(due_jobs, now))
+            
+            if len(due_jobs) < ESCALATION_BATCH_SIZE:
+                break
+            last_job = due_jobs[-1][0]
+            after = (last_job.created_at, last_job.id)
         
-        for job in pending_jobs:
-            action = await self._check_job_escalation(job)
-            if action:
-                actions.append(action)
+        if actions:
+            await self.job_service.invalidate_job_lists()
         
         return actions
     
-    async def _check_job_escalation(self, job: Job) -> Optional[dict]:
-        """Check if a job needs escalation and perform it."""
+    async def _escalate_batch(self, due_jobs: List[tuple], now: datetime) -> List[dict]:
+        """Escalate one batch of due jobs and commit it as one transaction."""
+        actions = []
+        new_levels = {}
+        owner_alerts = []
+        customer_alerts = []
         
-        current_level = int(job.escalation_level or "0")
-        job_age_minutes = (datetime.utcnow() - job.created_at).total_seconds() / 60
+        # Auto-assignments stay pending in the session until the batch
+        # commits, so their job UPDATEs and status-history INSERTs are
+        # flushed together instead of once per job
+        with self.db.no_autoflush:
+            for job, next_level in due_jobs:
+                actions.append(
+                    await self._escalate_job(job, next_level, now, owner_alerts, customer_alerts)
+                )
+                new_levels[job.id] = next_level
         
-        # Find the appropriate escalation level
-        next_level = None
-        for level, config in self.ESCALATION_LEVELS.items():
-            if level > current_level and job_age_minutes >= config["delay_minutes"]:
-                next_level = level
+        # Notifications and the new levels are written in one transaction;
+        # the notifications are only queued for sending once it commits
+        try:
+            notifications = await self.notification_service.notify_customer_bulk(
+                customer_alerts, commit=False
+            )
+            notifications += await self.notification_service.notify_owner_bulk(
+                owner_alerts, commit=False
+            )
+            await self.job_service.set_escalation_levels(new_levels)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
         
-        if next_level is None:
-            return None
+        await self.notification_service.enqueue_dispatch(notifications)
+        
+        return actions
+    
+    async def _escalate_job(
+        self,
+        job: Job,
+        next_level: int,
+        now: datetime,
+        owner_alerts: List[dict],
+        customer_alerts: List[dict],
+    ) -> dict:
+        """
+        Perform the escalation for a job that reached next_level.
+        Notifications are queued onto owner_alerts/customer_alerts.
+        """
+        
+        current_level = job.escalation_level or 0
         
         # Perform escalation
         config = self.ESCALATION_LEVELS[next_level]
-        action_taken = await self._perform_escalation(job, next_level, config["action"])
-        
-        # Update job escalation level
-        await self.job_service.update_escalation_level(job.id, next_level)
+        action_taken = await self._perform_escalation(
+            job, next_level, config["action"], now, owner_alerts, customer_alerts
+        )
         
         return {
             "job_id": str(job.id),
@@ -84,99 +210,52 @@ class EscalationService:
         self, 
         job: Job, 
         level: int, 
-        action: str
+        action: str,
+        now: datetime,
+        owner_alerts: List[dict],
+        customer_alerts: List[dict],
     ) -> str:
-        """Perform the escalation action."""
-        
-        # Load customer for notifications
-        await self.db.refresh(job, ["customer"])
+        """
+        Perform the escalation action (job.customer/address are preloaded).
+        Notifications are queued for the sweep's bulk send, not sent here.
+        """
         
         if action == "initial_notification":
             # Already sent when job created
             return "initial_notification_skipped"
         
-        elif action == "first_reminder":
-            message = (
-                f"⚠️ Job {job.confirmation_code} needs assignment. "
-                f"Service: {job.service_type}. "
-                f"Created {self._format_age(job.created_at)} ago."
-            )
-            await self.notification_service.notify_owner(
-                message=message,
-                job_id=job.id,
-                trigger_event="escalation_reminder_1",
-            )
-            return "first_reminder_sent"
+        alert = OWNER_ALERTS.get(action)
+        if alert is None:
+            return "unknown_action"
         
-        elif action == "second_reminder_call":
-            message = (
-                f"🚨 URGENT: Job {job.confirmation_code} still unassigned! "
-                f"Customer waiting for {self._format_age(job.created_at)}. "
-                f"Please assign immediately."
-            )
-            await self.notification_service.notify_owner(
-                message=message,
-                job_id=job.id,
-                trigger_event="escalation_reminder_2",
-                urgent=True,  # This triggers a phone call
-            )
-            return "second_reminder_with_call"
-        
-        elif action == "auto_assign_or_alert":
+        if action == "auto_assign_or_alert":
             # Check if business has auto-assign enabled
-            business = await self._get_business()
-            auto_assign = business.settings.get("auto_assign_enabled", False)
-            
-            if auto_assign:
-                # Try to auto-assign
-                assigned = await self._try_auto_assign(job)
-                if assigned:
+            if await self._auto_assign_enabled():
+                # Try to auto-assign; otherwise fall through to the critical alert
+                if await self._try_auto_assign(job):
                     return "auto_assigned"
-            
-            # If not auto-assigned, send critical alert
-            message = (
-                f"🔴 CRITICAL: Job {job.confirmation_code} unassigned for "
-                f"{self._format_age(job.created_at)}! "
-                f"Customer may call competitor. Action required NOW."
-            )
-            await self.notification_service.notify_owner(
-                message=message,
-                job_id=job.id,
-                trigger_event="escalation_critical",
-                urgent=True,
-            )
-            return "critical_alert_sent"
         
-        elif action == "customer_outreach":
+        elif action == "customer_outreach" and job.customer:
             # Contact customer to apologize and offer to reschedule
-            if job.customer:
-                customer_message = (
-                    f"We apologize for the delay in confirming your service request. "
-                    f"We're working to assign a technician. "
-                    f"Please call us if you need immediate assistance."
-                )
-                await self.notification_service.notify_customer(
-                    customer=job.customer,
-                    message=customer_message,
-                    job_id=job.id,
-                    trigger_event="escalation_customer_apology",
-                )
-            
-            # Final owner alert
-            message = (
-                f"⛔ SLA BREACH: Job {job.confirmation_code} unassigned for 24+ hours. "
-                f"Customer has been notified of delay. "
-                f"This will affect service metrics."
-            )
-            await self.notification_service.notify_owner(
-                message=message,
-                job_id=job.id,
-                trigger_event="escalation_sla_breach",
-                urgent=True,
-            )
-            return "customer_outreach_completed"
+            customer_alerts.append({
+                "customer": job.customer,
+                "message": CUSTOMER_APOLOGY_MESSAGE,
+                "job_id": job.id,
+                "trigger_event": "escalation_customer_apology",
+            })
         
-        return "unknown_action"
+        template, trigger_event, urgent, result = alert
+        owner_alerts.append({
+            "message": template.format(
+                code=job.confirmation_code,
+                service=job.service_type,
+                age=self._format_age(job.created_at, now),
+            ),
+            "job_id": job.id,
+            "trigger_event": trigger_event,
+            "urgent": urgent,
+        })
+        return result
     
     async def _try_auto_assign(self, job: Job) -> bool:
         """Attempt to auto-assign a technician to the job."""
@@ -185,10 +264,12 @@ class EscalationService:
         if not job.address:
             return False
         
-        schedule_service = ScheduleService(self.db, self.business_id)
+        # One instance per sweep, so the technician roster is loaded once
+        if self._schedule_service is None:
+            self._schedule_service = ScheduleService(self.db, self.business_id)
         
         # Find available tech
-        tech_info = await schedule_service.find_available_technician(
+        tech_info = await self._schedule_service.find_available_technician(
             service_type=job.service_type,
             location_lat=float(job.address.latitude or 0),
             location_lng=float(job.address.longitude or 0),
@@ -198,9 +279,9 @@ class EscalationService:
         if not tech_info:
             return False
         
-        # Assign the technician
-        await self.job_service.assign_technician(
-            job_id=job.id,
+        # Staged only; written with the rest of the batch at commit
+        self.job_service.stage_assignment(
+            job,
             technician_id=tech_info["tech_id"],
             changed_by_type="system",
         )
@@ -208,15 +289,24 @@ class EscalationService:
         return True
     
     async def _get_business(self) -> Business:
-        """Get the business entity."""
-        result = await self.db.execute(
-            select(Business).where(Business.id == self.business_id)
-        )
-        return result.scalar_one()
+        """Get the business entity (loaded once per service instance)."""
+        if self._business is None:
+            result = await self.db.execute(
+                select(Business).where(Business.id == self.business_id)
+            )
+            self._business = result.scalar_one()
+        return self._business
+    
+    async def _auto_assign_enabled(self) -> bool:
+        """Whether the business has auto-assign on (read once per instance)."""
+        if self._auto_assign is None:
+            business = await self._get_business()
+            self._auto_assign = bool((business.settings or {}).get("auto_assign_enabled", False))
+        return self._auto_assign
     
-    def _format_age(self, created_at: datetime) -> str:
-        """Format job age in human-readable form."""
-        age = datetime.utcnow() - created_at
+    def _format_age(self, created_at: datetime, now: datetime) -> str:
+        """Format job age (as of now) in human-readable form."""
+        age = now - created_at
         minutes = int(age.total_seconds() / 60)
         
         if minutes < 60:
@@ -1,11 +1,12 @@
 """Job service - handles job-related business logic."""
 
+import hashlib
 import secrets
 import string
-from datetime import datetime, date, time
-from typing import Optional, List, Tuple
+from datetime import datetime, date, time, timedelta
+from typing import Optional, List, Tuple, Dict, Set
 from uuid import UUID
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, update, exists, and_, func, case, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError
@@ -15,15 +16,34 @@ from app.models.customer import CustomerAddress
 from app.schemas.job import JobCreate, JobUpdate, JobStatusUpdate, JobNoteCreate
 from app.services.notification_service import NotificationService
 from app.config import get_settings
+from app.database import get_redis, utcnow_sql
 
 settings = get_settings()
 
+# Short TTL for cached job listing pages; job writes, and edits to the
+# customer/technician fields the pages embed, bump a per-business version
+# so stale pages are not served after a change
+JOB_LIST_CACHE_TTL_SECONDS = 15
+
+# Escalation sweeps load and process due jobs this many at a time
+ESCALATION_BATCH_SIZE = 200
+
+
+CONFIRMATION_CODE_CHARS = string.ascii_uppercase + string.digits
+CONFIRMATION_CODE_LENGTH = 6
+
 
 def generate_confirmation_code() -> str:
-    """Generate a unique confirmation code like 'SVC-A1B2C3'."""
-    chars = string.ascii_uppercase + string.digits
-    random_part = "".join(secrets.choice(chars) for _ in range(6))
-    return f"SVC-{random_part}"
+    """
+    Generate a unique confirmation code like 'SVC-A1B2C3'.
+    One random draw, written out in base 36.
+    """
+    n = secrets.randbelow(len(CONFIRMATION_CODE_CHARS) ** CONFIRMATION_CODE_LENGTH)
+    random_part = []
+    for _ in range(CONFIRMATION_CODE_LENGTH):
+        n, digit = divmod(n, len(CONFIRMATION_CODE_CHARS))
+        random_part.append(CONFIRMATION_CODE_CHARS[digit])
+    return f"SVC-{''.join(random_part)}"
 
 
 class JobService:
@@ -33,21 +53,66 @@ class JobService:
         self.db = db
         self.business_id = business_id
     
-    async def get_by_id(self, job_id: UUID) -> Optional[Job]:
-        """Get job by ID with all relations."""
-        result = await self.db.execute(
+    async def _job_list_cache_key(self, filters: tuple) -> str:
+        """Build the cache key for a job listing page."""
+        redis = await get_redis()
+        version = await redis.get(f"jobs_ver:{self.business_id}") or "0"
+        digest = hashlib.blake2b(repr(filters).encode(), digest_size=12).hexdigest()
+        return f"jobs:{self.business_id}:{version}:{digest}"
+    
+    async def get_cached_job_list(self, filters: tuple) -> Tuple[str, Optional[str]]:
+        """
+        Get a cached job listing page (serialized JSON) if present.
+        Returns (cache key, page or None). The key pins the version read
+        before the listing query; pass it to cache_job_list so a write that
+        lands during the query can't get a pre-write page stored under the
+        new version.
+        """
+        redis = await get_redis()
+        key = await self._job_list_cache_key(filters)
+        return key, await redis.get(key)
+    
+    async def cache_job_list(self, cache_key: str, payload: str) -> None:
+        """Cache a serialized job listing page under the key from get_cached_job_list."""
+        redis = await get_redis()
+        await redis.setex(cache_key, JOB_LIST_CACHE_TTL_SECONDS, payload)
+    
+    async def invalidate_job_lists(self) -> None:
+        """Invalidate cached job listings for this business."""
+        redis = await get_redis()
+        await redis.incr(f"jobs_ver:{self.business_id}")
+    
+    async def get_by_id(self, job_id: UUID, load_notes: bool = False) -> Optional[Job]:
+        """
+        Get job by ID with customer, technician and address.
+        Notes are only loaded with load_notes=True (job detail responses).
+        """
+        query = (
             select(Job)
             .options(
                 selectinload(Job.customer),
                 selectinload(Job.technician),
                 selectinload(Job.address),
-                selectinload(Job.notes),
             )
             .where(
                 Job.id == job_id,
                 Job.business_id == self.business_id
             )
         )
+        if load_notes:
+            query = query.options(selectinload(Job.notes))
+        
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+    
+    async def _get_bare(self, job_id: UUID) -> Optional[Job]:
+        """Get job by ID without loading any relations (for mutations)."""
+        result = await self.db.execute(
+            select(Job).where(
+                Job.id == job_id,
+                Job.business_id == self.business_id
+            )
+        )
         return result.scalar_one_or_none()
     
     async def get_by_confirmation_code(self, code: str) -> Optional[Job]:
@@ -76,13 +141,17 @@ class JobService:
         page: int = 1,
         page_size: int = 20,
     ) -> Tuple[List[Job], int]:
-        """List jobs with filters and pagination."""
+        """
+        List jobs with filters and pagination.
+        The total comes from count(*) OVER () on the page query itself.
+        """
         query = (
-            select(Job)
+            select(Job, func.count().over().label("total"))
             .options(
                 selectinload(Job.customer),
                 selectinload(Job.technician),
                 selectinload(Job.address),
+                selectinload(Job.notes),
             )
             .where(Job.business_id == self.business_id)
         )
@@ -99,18 +168,21 @@ class JobService:
         if customer_id:
             query = query.where(Job.customer_id == customer_id)
         
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await self.db.execute(count_query)).scalar()
-        
         # Apply pagination
-        query = query.order_by(Job.scheduled_date, Job.scheduled_time_start)
-        query = query.offset((page - 1) * page_size).limit(page_size)
+        paged = query.order_by(Job.scheduled_date, Job.scheduled_time_start)
+        paged = paged.offset((page - 1) * page_size).limit(page_size)
         
-        result = await self.db.execute(query)
-        jobs = list(result.scalars())
+        rows = (await self.db.execute(paged)).all()
+        if rows:
+            return [job for job, _ in rows], rows[0].total
         
-        return jobs, total
+        # Past the last page there is no row to carry the total
+        if page == 1:
+            return [], 0
+        count_query = select(func.count()).select_from(
+            query.with_only_columns(Job.id).subquery()
+        )
+        return [], (await self.db.execute(count_query)).scalar()
     
     async def create(
         self,
@@ -120,15 +192,16 @@ class JobService:
         priority: JobPriority = JobPriority.NORMAL,
         source_call_id: Optional[str] = None,
         emergency_keywords_matched: bool = False,
-        emergency_confidence_score: Optional[str] = None,
+        emergency_confidence_score: Optional[float] = None,
     ) -> Job:
         """Create a new job."""
         
         # Handle address - either use existing or create from inline
         address_id = data.address_id
+        new_address = None
         if not address_id and data.address:
             # Create address from inline data
-            address = CustomerAddress(
+            new_address = CustomerAddress(
                 customer_id=customer_id,
                 label="Service Address",
                 street=data.address.street,
@@ -139,9 +212,6 @@ class JobService:
                 gate_code=data.address.gate_code,
                 access_notes=data.address.access_notes,
             )
-            self.db.add(address)
-            await self.db.flush()
-            address_id = address.id
         
         # Create job
         job = Job(
@@ -162,11 +232,16 @@ class JobService:
             emergency_confidence_score=emergency_confidence_score,
         )
         
+        if new_address is not None:
+            # Attached through the relationship, so the unit of work inserts
+            # the address first (no separate flush round-trip)
+            job.address = new_address
+        
         self.db.add(job)
         
         # Record initial status
         history = JobStatusHistory(
-            job_id=job.id,
+            job=job,
             from_status=None,
             to_status=JobStatus.PENDING.value,
             changed_by_type="system",
@@ -174,13 +249,14 @@ class JobService:
         )
         self.db.add(history)
         
+        # id, timestamps and defaults come back via INSERT ... RETURNING
         try:
             await self.db.commit()
-            await self.db.refresh(job)
         except IntegrityError:
             await self.db.rollback()
             raise ValueError("Time slot is no longer available")
         
+        await self.invalidate_job_lists()
         return job
     
     async def create_emergency(
@@ -215,7 +291,7 @@ class JobService:
         
         # Record status
         history = JobStatusHistory(
-            job_id=job.id,
+            job=job,
             from_status=None,
             to_status=JobStatus.DISPATCHED.value,
             changed_by_type="system",
@@ -224,7 +300,7 @@ class JobService:
         self.db.add(history)
         
         await self.db.commit()
-        await self.db.refresh(job)
+        await self.invalidate_job_lists()
         
         return job
     
@@ -235,11 +311,32 @@ class JobService:
         changed_by_type: str = "admin",
         changed_by_id: Optional[UUID] = None,
     ) -> Optional[Job]:
-        """Assign a technician to a job."""
-        job = await self.get_by_id(job_id)
+        """
+        Assign a technician to a job.
+        Returns the job without relations loaded.
+        """
+        job = await self._get_bare(job_id)
         if not job:
             return None
         
+        self.stage_assignment(job, technician_id, changed_by_type, changed_by_id)
+        
+        await self.db.commit()
+        await self.invalidate_job_lists()
+        
+        return job
+    
+    def stage_assignment(
+        self,
+        job: Job,
+        technician_id: UUID,
+        changed_by_type: str = "admin",
+        changed_by_id: Optional[UUID] = None,
+    ) -> None:
+        """
+        Apply a technician assignment to a loaded job in the session only.
+        The caller commits, which lets many assignments share one flush.
+        """
         old_status = job.status
         job.technician_id = technician_id
         job.assigned_at = datetime.utcnow()
@@ -258,12 +355,6 @@ class JobService:
                 reason="Technician assigned",
             )
             self.db.add(history)
-        
-        job.updated_at = datetime.utcnow()
-        await self.db.commit()
-        await self.db.refresh(job)
-        
-        return job
     
     async def update_status(
         self,
@@ -273,13 +364,13 @@ class JobService:
         changed_by_id: Optional[UUID] = None,
     ) -> Optional[Job]:
         """Update job status."""
-        job = await self.get_by_id(job_id)
+        # Callers render the returned job in full, notes included
+        job = await self.get_by_id(job_id, load_notes=True)
         if not job:
             return None
         
         old_status = job.status
         job.status = data.status
-        job.updated_at = datetime.utcnow()
         
         # Set timestamps based on status
         if data.status == JobStatus.EN_ROUTE:
@@ -300,8 +391,11 @@ class JobService:
         )
         self.db.add(history)
         
+        # Relations loaded by get_by_id stay loaded (expire_on_commit=False)
+        # and updated_at comes back via RETURNING, so callers can serialize
+        # the returned job without a refresh
         await self.db.commit()
-        await self.db.refresh(job)
+        await self.invalidate_job_lists()
         
         return job
     
@@ -314,8 +408,13 @@ class JobService:
         author_name: Optional[str] = None,
     ) -> Optional[JobNote]:
         """Add a note to a job."""
-        job = await self.get_by_id(job_id)
-        if not job:
+        job_exists = await self.db.scalar(
+            select(exists().where(
+                Job.id == job_id,
+                Job.business_id == self.business_id
+            ))
+        )
+        if not job_exists:
             return None
         
         note = JobNote(
@@ -327,37 +426,80 @@ class JobService:
         )
         self.db.add(note)
         await self.db.commit()
-        await self.db.refresh(note)
+        await self.invalidate_job_lists()
         
         return note
     
-    async def get_pending_jobs_for_escalation(self) -> List[Job]:
-        """Get jobs that need escalation."""
-        result = await self.db.execute(
-            select(Job)
+    async def get_jobs_needing_escalation(
+        self,
+        level_delays: Dict[int, int],
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int = ESCALATION_BATCH_SIZE,
+    ) -> List[Tuple[Job, int]]:
+        """
+        Get pending unassigned jobs old enough for a higher escalation level.
+        level_delays maps level -> minutes after creation; the database
+        computes each job's target level, so only jobs that must change are
+        returned, as (job, target_level) with customer and address loaded.
+        Paged by (created_at, id): pass the last job's key as `after`.
+        """
+        target_level = case(
+            *[
+                (Job.created_at <= utcnow_sql() - timedelta(minutes=delay), level)
+                for level, delay in sorted(level_delays.items(), reverse=True)
+            ],
+            else_=0,
+        ).label("target_level")
+        
+        # Jobs younger than the first reminder can't be due; this bound is
+        # what lets the planner use ix_jobs_escalation_due
+        first_delay = min(delay for level, delay in level_delays.items() if level > 0)
+        
+        query = (
+            select(Job, target_level)
+            .options(selectinload(Job.customer), selectinload(Job.address))
             .where(
                 Job.business_id == self.business_id,
                 Job.status == JobStatus.PENDING,
                 Job.technician_id.is_(None),
+                Job.created_at <= utcnow_sql() - timedelta(minutes=first_delay),
+                func.coalesce(Job.escalation_level, 0) < target_level,
             )
-            .order_by(Job.created_at)
+            .order_by(Job.created_at, Job.id)
+            .limit(limit)
         )
-        return list(result.scalars())
+        if after:
+            query = query.where(tuple_(Job.created_at, Job.id) > after)
+        
+        result = await self.db.execute(query)
+        return list(result.tuples())
     
-    async def update_escalation_level(self, job_id: UUID, level: int) -> None:
-        """Update job escalation level."""
-        job = await self.get_by_id(job_id)
-        if job:
-            job.escalation_level = str(level)
-            job.last_escalation_at = datetime.utcnow()
-            await self.db.commit()
+    async def set_escalation_levels(self, levels: Dict[UUID, int]) -> None:
+        """
+        Update escalation levels for many jobs in a single UPDATE.
+        Does not commit; the caller commits and invalidates job lists.
+        """
+        if not levels:
+            return
+        
+        await self.db.execute(
+            update(Job)
+            .where(Job.business_id == self.business_id, Job.id.in_(levels))
+            .values(
+                escalation_level=case(levels, value=Job.id),
+                last_escalation_at=utcnow_sql(),
+            )
+            .execution_options(synchronize_session=False)
+        )
     
-    async def get_jobs_by_call_id(self, call_id: str) -> Optional[Job]:
-        """Get job by source call ID (for reconciliation)."""
+    async def get_call_ids_with_jobs(self, call_ids: List[str]) -> Set[str]:
+        """Which of these source call IDs already have a job (for reconciliation)."""
+        if not call_ids:
+            return set()
         result = await self.db.execute(
-            select(Job).where(
-                Job.source_call_id == call_id,
+            select(Job.source_call_id).where(
+                Job.source_call_id.in_(call_ids),
                 Job.business_id == self.business_id
             )
         )
-        return result.scalar_one_or_none()
+        return set(result.scalars())
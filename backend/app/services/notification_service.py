@@ -1,5 +1,7 @@
 """Notification service - handles multi-channel notifications with tracking."""
 
+import asyncio
+import random
 from datetime import datetime, timedelta
 from typing import Optional, List
 from uuid import UUID
@@ -16,19 +18,103 @@ from app.models.job import Job
 from app.models.customer import Customer
 from app.models.technician import Technician
 from app.models.business import Business
-from app.integrations.twilio_client import TwilioClient
+from app.integrations.twilio_client import TwilioClient, TwilioError
+from app.workers.notification_dispatch import enqueue_dispatch
 from app.config import get_settings
 
 settings = get_settings()
 
+# Max provider requests in flight for one bulk send
+BULK_SEND_CONCURRENCY = 10
+
+# A queued notification the dispatcher hasn't sent by then is picked up by
+# the retry worker (e.g. the enqueue was lost in a crash)
+DISPATCH_TIMEOUT_MINUTES = 10
+
+# Message copy for the pre-built notifications, filled with str.format
+MESSAGE_TEMPLATES = {
+    "job_created_customer": (
+        "Your service request has been received! "
+        "Confirmation: {code}. "
+        "We'll confirm your appointment shortly."
+    ),
+    "job_created_owner": "New job request: {service} - {code}. Customer: {customer}",
+    "job_recovered_customer": (
+        "Your service request has been received. Confirmation: {code}. "
+        "We'll contact you shortly to confirm details."
+    ),
+    "job_recovered_owner": (
+        "⚠️ RECOVERED JOB: {code} was created from a call that didn't process correctly. "
+        "Please review and confirm details with customer."
+    ),
+    "tech_assigned_customer": (
+        "Great news! {tech} has been assigned to your "
+        "{service} appointment on {date} "
+        "between {start}-{end}."
+    ),
+    "tech_assigned_technician": (
+        "New job assigned: {service} at {address}. "
+        "Scheduled: {date} {start}."
+    ),
+    "tech_en_route_customer": (
+        "{tech} is on the way! "
+        "ETA: {eta} minutes. "
+        "Track your technician in the app."
+    ),
+    "emergency_dispatch_customer": (
+        "🚨 Emergency help is on the way! {tech} "
+        "will arrive in approximately {eta} minutes. "
+        "Confirmation: {code}"
+    ),
+    "emergency_dispatch_technician": (
+        "🚨 EMERGENCY DISPATCH: {service} at {address}. "
+        "Customer: {phone}. RESPOND IMMEDIATELY."
+    ),
+    "emergency_dispatch_owner": (
+        "🚨 Emergency dispatched: {tech} sent to "
+        "{customer} for {service}. "
+        "Job: {code}"
+    ),
+}
+
+# Due retries claimed (row-locked) per batch by the retry worker
+RETRY_BATCH_SIZE = 200
+
+# Retry backoff: base * 2^attempt seconds, capped, with +/-50% jitter
+RETRY_BASE_DELAY = 60
+RETRY_MAX_DELAY = 3600
+
+
+def _next_retry_delay(attempt: int) -> timedelta:
+    """
+    Delay before retrying a failed send, growing with each attempt.
+    Jitter keeps a provider outage from turning into synchronized retry waves.
+    """
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt))
+    return timedelta(seconds=delay * random.uniform(0.5, 1.5))
+
 
 class NotificationService:
     """Service for sending and tracking notifications."""
     
-    def __init__(self, db: AsyncSession, business_id: UUID):
+    def __init__(
+        self,
+        db: AsyncSession,
+        business_id: UUID,
+        business: Optional[Business] = None,
+    ):
         self.db = db
         self.business_id = business_id
         self.twilio = TwilioClient()
+        # Channel -> sender; each returns the provider's message id (if any)
+        self._senders = {
+            NotificationChannel.SMS: self._send_sms,
+            NotificationChannel.VOICE_CALL: self._send_voice_call,
+            NotificationChannel.PUSH: self._send_push,
+            NotificationChannel.EMAIL: self._send_email,
+        }
+        # Callers that already hold the business can pass it in
+        self._business = business
     
     async def notify_customer(
         self,
@@ -42,13 +128,114 @@ class NotificationService:
         Send notification to customer via multiple channels.
         Default: Push + SMS for reliability.
         """
-        if channels is None:
-            channels = [NotificationChannel.PUSH, NotificationChannel.SMS]
+        return await self._send_bulk(self._customer_notifications(
+            customer, message, job_id, trigger_event, channels
+        ))
+    
+    async def notify_technician(
+        self,
+        technician: Technician,
+        message: str,
+        job_id: Optional[UUID] = None,
+        trigger_event: str = "general",
+        channels: List[NotificationChannel] = None,
+    ) -> List[Notification]:
+        """Send notification to technician."""
+        return await self._send_bulk(self._technician_notifications(
+            technician, message, job_id, trigger_event, channels
+        ))
+    
+    async def notify_owner(
+        self,
+        message: str,
+        job_id: Optional[UUID] = None,
+        trigger_event: str = "general",
+        channels: List[NotificationChannel] = None,
+        urgent: bool = False,
+    ) -> List[Notification]:
+        """
+        Send notification to business owner.
+        For urgent notifications, includes voice call.
+        """
+        business = await self._get_business()
+        if not business or not business.owner_phone:
+            return []
+        
+        return await self._send_bulk(self._owner_notifications(
+            business, message, job_id, trigger_event, channels, urgent
+        ))
+    
+    async def notify_owner_bulk(
+        self, alerts: List[dict], commit: bool = True
+    ) -> List[Notification]:
+        """
+        Send several owner notifications at once (e.g. an escalation sweep).
+        Each alert is a dict with message, job_id, trigger_event and urgent,
+        handled like notify_owner, but the rows are inserted together.
+        With commit=False the rows are only flushed; the caller commits and
+        then passes them to enqueue_dispatch.
+        """
+        if not alerts:
+            return []
+        
+        business = await self._get_business()
+        if not business or not business.owner_phone:
+            return []
         
         notifications = []
+        for alert in alerts:
+            notifications.extend(self._owner_notifications(
+                business,
+                alert["message"],
+                alert.get("job_id"),
+                alert.get("trigger_event", "general"),
+                urgent=alert.get("urgent", False),
+            ))
         
-        for channel in channels:
-            notification = await self._send_notification(
+        return await self._send_bulk(notifications, commit)
+    
+    async def notify_customer_bulk(
+        self, alerts: List[dict], commit: bool = True
+    ) -> List[Notification]:
+        """
+        Send several customer notifications at once.
+        Each alert is a dict with customer, message, job_id and trigger_event
+        (channels as in notify_customer: push + SMS).
+        """
+        notifications = []
+        for alert in alerts:
+            notifications.extend(self._customer_notifications(
+                alert["customer"],
+                alert["message"],
+                alert.get("job_id"),
+                alert.get("trigger_event", "general"),
+            ))
+        
+        return await self._send_bulk(notifications, commit)
+    
+    async def _get_business(self) -> Optional[Business]:
+        """Get the business (for owner contact details), loaded once per instance."""
+        if self._business is None:
+            result = await self.db.execute(
+                select(Business).where(Business.id == self.business_id)
+            )
+            self._business = result.scalar_one_or_none()
+        return self._business
+    
+    def _customer_notifications(
+        self,
+        customer: Customer,
+        message: str,
+        job_id: Optional[UUID] = None,
+        trigger_event: str = "general",
+        channels: List[NotificationChannel] = None,
+    ) -> List[Notification]:
+        """Pending notifications for a customer, one per channel."""
+        if channels is None:
+            channels = [NotificationChannel.PUSH, NotificationChannel.SMS]
+        
+        return [
+            self._build_notification(
                 recipient_type=NotificationRecipientType.CUSTOMER,
                 recipient_id=customer.id,
                 recipient_contact=customer.phone if channel == NotificationChannel.SMS else customer.push_token,
@@ -57,11 +244,10 @@ class NotificationService:
                 job_id=job_id,
                 trigger_event=trigger_event,
             )
-            notifications.append(notification)
-        
-        return notifications
+            for channel in channels
+        ]
     
-    async def notify_technician(
+    def _technician_notifications(
         self,
         technician: Technician,
         message: str,
@@ -69,18 +255,17 @@ class NotificationService:
         trigger_event: str = "general",
         channels: List[NotificationChannel] = None,
     ) -> List[Notification]:
-        """Send notification to technician."""
+        """Pending notifications for a technician (channels without a contact are skipped)."""
         if channels is None:
             channels = [NotificationChannel.PUSH, NotificationChannel.SMS]
         
         notifications = []
-        
         for channel in channels:
             contact = technician.phone if channel == NotificationChannel.SMS else technician.push_token
             if not contact:
                 continue
-                
-            notification = await self._send_notification(
+            
+            notifications.append(self._build_notification(
                 recipient_type=NotificationRecipientType.TECHNICIAN,
                 recipient_id=technician.id,
                 recipient_contact=contact,
@@ -88,40 +273,27 @@ class NotificationService:
                 message=message,
                 job_id=job_id,
                 trigger_event=trigger_event,
-            )
-            notifications.append(notification)
+            ))
         
         return notifications
     
-    async def notify_owner(
+    def _owner_notifications(
         self,
+        business: Business,
         message: str,
         job_id: Optional[UUID] = None,
         trigger_event: str = "general",
         channels: List[NotificationChannel] = None,
         urgent: bool = False,
     ) -> List[Notification]:
-        """
-        Send notification to business owner.
-        For urgent notifications, includes voice call.
-        """
+        """Pending notifications for the business owner (plus backup if urgent)."""
         if channels is None:
             channels = [NotificationChannel.SMS]
             if urgent:
                 channels.append(NotificationChannel.VOICE_CALL)
         
-        # Get business owner info
-        result = await self.db.execute(
-            select(Business).where(Business.id == self.business_id)
-        )
-        business = result.scalar_one_or_none()
-        if not business or not business.owner_phone:
-            return []
-        
-        notifications = []
-        
-        for channel in channels:
-            notification = await self._send_notification(
+        notifications = [
+            self._build_notification(
                 recipient_type=NotificationRecipientType.OWNER,
                 recipient_id=self.business_id,  # Use business ID for owner
                 recipient_contact=business.owner_phone,
@@ -130,11 +302,12 @@ class NotificationService:
                 job_id=job_id,
                 trigger_event=trigger_event,
             )
-            notifications.append(notification)
+            for channel in channels
+        ]
         
-        # If urgent and primary fails, try backup contact
+        # If urgent, also alert the backup contact
         if urgent and business.backup_contact_phone:
-            backup_notification = await self._send_notification(
+            notifications.append(self._build_notification(
                 recipient_type=NotificationRecipientType.OWNER,
                 recipient_id=self.business_id,
                 recipient_contact=business.backup_contact_phone,
@@ -142,12 +315,47 @@ class NotificationService:
                 message=f"[BACKUP] {message}",
                 job_id=job_id,
                 trigger_event=f"{trigger_event}_backup",
-            )
-            notifications.append(backup_notification)
+            ))
+        
+        return notifications
+    
+    async def _send_bulk(
+        self, notifications: List[Notification], commit: bool = True
+    ) -> List[Notification]:
+        """
+        Insert notification rows as PENDING and queue them for the dispatch
+        worker, which makes the provider calls off the request path.
+        With commit=False the rows are only flushed and nothing is queued
+        until the caller commits and calls enqueue_dispatch.
+        """
+        if not notifications:
+            return []
+        
+        self.db.add_all(notifications)
+        if not commit:
+            await self.db.flush()
+            return notifications
+        
+        await self.db.commit()
+        await self.enqueue_dispatch(notifications)
         
         return notifications
     
-    async def _send_notification(
+    async def enqueue_dispatch(self, notifications: List[Notification]) -> None:
+        """Queue committed notifications for delivery."""
+        await enqueue_dispatch([notification.id for notification in notifications])
+    
+    async def deliver_all(self, notifications: List[Notification]) -> None:
+        """Deliver notifications concurrently (bounded); touches no DB state."""
+        semaphore = asyncio.Semaphore(BULK_SEND_CONCURRENCY)
+        
+        async def deliver(notification: Notification):
+            async with semaphore:
+                await self._deliver(notification)
+        
+        await asyncio.gather(*(deliver(n) for n in notifications))
+    
+    def _build_notification(
         self,
         recipient_type: NotificationRecipientType,
         recipient_id: UUID,
@@ -157,10 +365,8 @@ class NotificationService:
         job_id: Optional[UUID] = None,
         trigger_event: str = "general",
     ) -> Notification:
-        """Send a single notification and track it."""
-        
-        # Create notification record
-        notification = Notification(
+        """Create a pending notification record (not yet added or sent)."""
+        return Notification(
             business_id=self.business_id,
             job_id=job_id,
             trigger_event=trigger_event,
@@ -170,67 +376,105 @@ class NotificationService:
             channel=channel,
             status=NotificationStatus.PENDING,
             message=message,
+            next_retry_at=datetime.utcnow() + timedelta(minutes=DISPATCH_TIMEOUT_MINUTES),
         )
-        self.db.add(notification)
-        await self.db.flush()
-        
+    
+    async def _deliver(self, notification: Notification) -> None:
+        """Send a notification through its channel and record the outcome."""
         # Actually send the notification
-        if not recipient_contact:
+        if not notification.recipient_contact:
             notification.status = NotificationStatus.FAILED
             notification.error_message = "No contact information available"
             notification.failed_at = datetime.utcnow()
+            notification.next_retry_at = None  # retrying can't help
         else:
             try:
-                if channel == NotificationChannel.SMS:
-                    result = await self.twilio.send_sms(recipient_contact, message)
-                    notification.external_id = result.get("sid")
-                    notification.status = NotificationStatus.SENT
-                    notification.sent_at = datetime.utcnow()
-                    
-                elif channel == NotificationChannel.VOICE_CALL:
-                    result = await self.twilio.make_call(recipient_contact, message)
-                    notification.external_id = result.get("sid")
-                    notification.status = NotificationStatus.SENT
-                    notification.sent_at = datetime.utcnow()
-                    
-                elif channel == NotificationChannel.PUSH:
-                    # TODO: Implement push notification (FCM/APNs)
-                    notification.status = NotificationStatus.SENT
-                    notification.sent_at = datetime.utcnow()
-                    
-                elif channel == NotificationChannel.EMAIL:
-                    # TODO: Implement email (SendGrid)
-                    notification.status = NotificationStatus.SENT
-                    notification.sent_at = datetime.utcnow()
-                    
+                external_id = await self._senders[notification.channel](notification)
+                if external_id:
+                    notification.external_id = external_id
+                notification.status = NotificationStatus.SENT
+                notification.sent_at = datetime.utcnow()
             except Exception as e:
                 notification.status = NotificationStatus.FAILED
                 notification.error_message = str(e)
                 notification.failed_at = datetime.utcnow()
-                notification.next_retry_at = datetime.utcnow() + timedelta(minutes=5)
-        
-        await self.db.commit()
-        await self.db.refresh(notification)
-        
-        return notification
+                if isinstance(e, TwilioError) and not e.retryable:
+                    # Permanent (e.g. invalid number): never picked up for retry
+                    notification.next_retry_at = None
+                else:
+                    notification.next_retry_at = datetime.utcnow() + _next_retry_delay(
+                        notification.retry_count or 0
+                    )
     
-    async def get_failed_notifications_for_retry(self) -> List[Notification]:
-        """Get failed notifications that need retry."""
+    async def _send_sms(self, notification: Notification) -> Optional[str]:
+        """Send via Twilio SMS; returns the message SID."""
+        result = await self.twilio.send_sms(
+            notification.recipient_contact,
+            notification.message,
+            idempotency_key=str(notification.id),
+        )
+        return result.get("sid")
+    
+    async def _send_voice_call(self, notification: Notification) -> Optional[str]:
+        """Place a Twilio TTS call; returns the call SID."""
+        result = await self.twilio.make_call(
+            notification.recipient_contact,
+            notification.message,
+            idempotency_key=str(notification.id),
+        )
+        return result.get("sid")
+    
+    async def _send_push(self, notification: Notification) -> Optional[str]:
+        """Send a push notification."""
+        # TODO: Implement push notification (FCM/APNs)
+        return None
+    
+    async def _send_email(self, notification: Notification) -> Optional[str]:
+        """Send an email."""
+        # TODO: Implement email (SendGrid)
+        return None
+    
+    async def retry_due_notifications(self, limit: int = RETRY_BATCH_SIZE) -> List[Notification]:
+        """
+        Retry one batch of failed notifications that are due (including
+        queued ones the dispatcher never got to).
+        The batch is claimed with FOR UPDATE SKIP LOCKED so concurrent workers
+        never resend the same row; sends run concurrently and all outcomes are
+        written in one commit. Returns the retried notifications.
+        """
         result = await self.db.execute(
-            select(Notification).where(
+            select(Notification)
+            .where(
                 Notification.business_id == self.business_id,
                 Notification.status.in_([
                     NotificationStatus.FAILED, 
-                    NotificationStatus.RETRYING
+                    NotificationStatus.RETRYING,
+                    NotificationStatus.PENDING,
                 ]),
                 Notification.retry_count < Notification.max_retries,
                 Notification.next_retry_at <= datetime.utcnow()
             )
+            .order_by(Notification.next_retry_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
         )
-        return list(result.scalars())
+        notifications = list(result.scalars())
+        if not notifications:
+            return []
+        
+        for notification in notifications:
+            notification.status = NotificationStatus.RETRYING
+            notification.retry_count = (notification.retry_count or 0) + 1
+        
+        # On failure, _deliver schedules the next attempt further out, so a
+        # retried row is not due again within this run
+        await self.deliver_all(notifications)
+        await self.db.commit()
+        
+        return notifications
     
-    async def retry_notification(self, notification_id: UUID) -> Optional[Notification]:
-        """Retry a failed notification."""
+    async def retry_notification_by_id(self, notification_id: UUID) -> Optional[Notification]:
+        """Look up a notification and retry it now (manual retry)."""
         result = await self.db.execute(
             select(Notification).where(
                 Notification.id == notification_id,
@@ -242,26 +486,17 @@ class NotificationService:
         if not notification:
             return None
         
+        return await self.retry_notification(notification)
+    
+    async def retry_notification(self, notification: Notification) -> Notification:
+        """Retry an already-loaded failed notification now."""
         notification.status = NotificationStatus.RETRYING
-        notification.retry_count = str(int(notification.retry_count) + 1)
-        
-        # Attempt to resend
-        try:
-            if notification.channel == NotificationChannel.SMS:
-                result = await self.twilio.send_sms(
-                    notification.recipient_contact, 
-                    notification.message
-                )
-                notification.external_id = result.get("sid")
-                notification.status = NotificationStatus.SENT
-                notification.sent_at = datetime.utcnow()
-        except Exception as e:
-            notification.error_message = str(e)
-            notification.status = NotificationStatus.FAILED
-            notification.next_retry_at = datetime.utcnow() + timedelta(minutes=15)
+        notification.retry_count = (notification.retry_count or 0) + 1
+        
+        # Attempt to resend (on failure, the next attempt backs off further)
+        await self._deliver(notification)
         
         await self.db.commit()
-        await self.db.refresh(notification)
         
         return notification
     
@@ -269,28 +504,50 @@ class NotificationService:
     
     async def notify_job_created(self, job: Job, customer: Customer) -> None:
         """Notify when a new job is created."""
-        message = (
-            f"Your service request has been received! "
-            f"Confirmation: {job.confirmation_code}. "
-            f"We'll confirm your appointment shortly."
-        )
-        await self.notify_customer(
-            customer=customer,
-            message=message,
-            job_id=job.id,
-            trigger_event="job_created",
+        message = MESSAGE_TEMPLATES["job_created_customer"].format(code=job.confirmation_code)
+        notifications = self._customer_notifications(
+            customer, message, job.id, "job_created"
         )
         
         # Also notify owner
-        owner_msg = (
-            f"New job request: {job.service_type} - {job.confirmation_code}. "
-            f"Customer: {customer.name or customer.phone}"
+        owner_msg = MESSAGE_TEMPLATES["job_created_owner"].format(
+            service=job.service_type,
+            code=job.confirmation_code,
+            customer=customer.name or customer.phone,
         )
-        await self.notify_owner(
-            message=owner_msg,
-            job_id=job.id,
-            trigger_event="job_created",
+        business = await self._get_business()
+        if business and business.owner_phone:
+            notifications += self._owner_notifications(
+                business, owner_msg, job.id, "job_created"
+            )
+        
+        # One insert; customer and owner sends are queued for the dispatcher together
+        await self._send_bulk(notifications)
+    
+    async def notify_job_recovered(self, job: Job, customer: Customer) -> None:
+        """Notify when reconciliation recreates a job from a missed call."""
+        notifications = []
+        
+        # Owner gets an urgent alert (SMS + call) to review the details
+        business = await self._get_business()
+        if business and business.owner_phone:
+            notifications += self._owner_notifications(
+                business,
+                MESSAGE_TEMPLATES["job_recovered_owner"].format(code=job.confirmation_code),
+                job.id,
+                "job_recovered",
+                urgent=True,
+            )
+        
+        notifications += self._customer_notifications(
+            customer,
+            MESSAGE_TEMPLATES["job_recovered_customer"].format(code=job.confirmation_code),
+            job.id,
+            "job_recovered",
         )
+        
+        # One insert and one enqueue for both parties
+        await self._send_bulk(notifications)
     
     async def notify_tech_assigned(
         self, 
@@ -301,30 +558,30 @@ class NotificationService:
         """Notify when a technician is assigned."""
         
         # Notify customer
-        customer_msg = (
-            f"Great news! {technician.name} has been assigned to your "
-            f"{job.service_type} appointment on {job.scheduled_date} "
-            f"between {job.scheduled_time_start}-{job.scheduled_time_end}."
+        customer_msg = MESSAGE_TEMPLATES["tech_assigned_customer"].format(
+            tech=technician.name,
+            service=job.service_type,
+            date=job.scheduled_date,
+            start=job.scheduled_time_start,
+            end=job.scheduled_time_end,
         )
-        await self.notify_customer(
-            customer=customer,
-            message=customer_msg,
-            job_id=job.id,
-            trigger_event="tech_assigned",
+        notifications = self._customer_notifications(
+            customer, customer_msg, job.id, "tech_assigned"
         )
         
         # Notify technician
-        tech_msg = (
-            f"New job assigned: {job.service_type} at "
-            f"{job.address.full_address if job.address else 'TBD'}. "
-            f"Scheduled: {job.scheduled_date} {job.scheduled_time_start}."
+        address = job.address
+        tech_msg = MESSAGE_TEMPLATES["tech_assigned_technician"].format(
+            service=job.service_type,
+            address=address.full_address if address else "TBD",
+            date=job.scheduled_date,
+            start=job.scheduled_time_start,
         )
-        await self.notify_technician(
-            technician=technician,
-            message=tech_msg,
-            job_id=job.id,
-            trigger_event="tech_assigned",
+        notifications += self._technician_notifications(
+            technician, tech_msg, job.id, "tech_assigned"
         )
+        
+        await self._send_bulk(notifications)
     
     async def notify_tech_en_route(
         self, 
@@ -334,10 +591,8 @@ class NotificationService:
         eta_minutes: int
     ) -> None:
         """Notify customer that tech is on the way."""
-        message = (
-            f"{technician.name} is on the way! "
-            f"ETA: {eta_minutes} minutes. "
-            f"Track your technician in the app."
+        message = MESSAGE_TEMPLATES["tech_en_route_customer"].format(
+            tech=technician.name, eta=eta_minutes
         )
         await self.notify_customer(
             customer=customer,
@@ -356,40 +611,37 @@ class NotificationService:
         """Send emergency notifications to all parties."""
         
         # Customer
-        customer_msg = (
-            f"🚨 Emergency help is on the way! {technician.name} "
-            f"will arrive in approximately {eta_minutes} minutes. "
-            f"Confirmation: {job.confirmation_code}"
+        customer_msg = MESSAGE_TEMPLATES["emergency_dispatch_customer"].format(
+            tech=technician.name, eta=eta_minutes, code=job.confirmation_code
         )
-        await self.notify_customer(
-            customer=customer,
-            message=customer_msg,
-            job_id=job.id,
-            trigger_event="emergency_dispatch",
+        notifications = self._customer_notifications(
+            customer, customer_msg, job.id, "emergency_dispatch"
         )
         
         # Technician (urgent)
-        tech_msg = (
-            f"🚨 EMERGENCY DISPATCH: {job.service_type} at "
-            f"{job.address.full_address if job.address else 'See app'}. "
-            f"Customer: {customer.phone}. RESPOND IMMEDIATELY."
+        address = job.address
+        tech_msg = MESSAGE_TEMPLATES["emergency_dispatch_technician"].format(
+            service=job.service_type,
+            address=address.full_address if address else "See app",
+            phone=customer.phone,
         )
-        await self.notify_technician(
-            technician=technician,
-            message=tech_msg,
-            job_id=job.id,
-            trigger_event="emergency_dispatch",
+        notifications += self._technician_notifications(
+            technician, tech_msg, job.id, "emergency_dispatch"
         )
         
         # Owner (for awareness)
-        owner_msg = (
-            f"🚨 Emergency dispatched: {technician.name} sent to "
-            f"{customer.name or customer.phone} for {job.service_type}. "
-            f"Job: {job.confirmation_code}"
-        )
-        await self.notify_owner(
-            message=owner_msg,
-            job_id=job.id,
-            trigger_event="emergency_dispatch",
-            urgent=False,  # Owner doesn't need call for dispatched emergencies
+        owner_msg = MESSAGE_TEMPLATES["emergency_dispatch_owner"].format(
+            tech=technician.name,
+            customer=customer.name or customer.phone,
+            service=job.service_type,
+            code=job.confirmation_code,
         )
+        business = await self._get_business()
+        if business and business.owner_phone:
+            notifications += self._owner_notifications(
+                business, owner_msg, job.id, "emergency_dispatch",
+                urgent=False,  # Owner doesn't need call for dispatched emergencies
+            )
+        
+        # One insert; all three parties' sends are queued for the dispatcher together
+        await self._send_bulk(notifications)
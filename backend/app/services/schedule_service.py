@@ -1,8 +1,11 @@
 """Schedule service - handles availability and slot reservation."""
 
 import secrets
+import orjson
+from functools import lru_cache
+from math import radians, sin, cos, asin, sqrt
 from datetime import datetime, date, time, timedelta
-from typing import Optional, List
+from typing import Optional, List, Dict
 from uuid import UUID
 from sqlalchemy import select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -16,6 +19,88 @@ from app.config import get_settings
 
 settings = get_settings()
 
+# Availability is computed on a per-day bitmask, one bit per 15-minute cell
+SLOT_CELL_MINUTES = 15
+FULL_DAY_MASK = (1 << (24 * 60 // SLOT_CELL_MINUTES)) - 1
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Weekly working-hours masks are cached in Redis per business/technician
+SCHEDULE_MASK_TTL = 3600  # seconds; also invalidated when blocks change
+
+# Atomically hold a slot unless an unexpired hold overlaps it.
+# KEYS: day reservation index (ZSET scored by expiry), reservation record.
+# ARGV: now, start, end, index member, expiry score, TTL seconds, record.
+# Members are "start|end|token" with ISO times, which compare as strings.
+RESERVE_SLOT_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+for _, member in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    local held_start, held_end = string.match(member, '^([^|]*)|([^|]*)|')
+    if held_start < ARGV[3] and held_end > ARGV[2] then
+        return 0
+    end
+end
+redis.call('SET', KEYS[2], ARGV[7], 'EX', ARGV[6])
+redis.call('ZADD', KEYS[1], ARGV[5], ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[6])
+return 1
+"""
+
+
+@lru_cache(maxsize=4096)
+def _time_range_mask(start: time, end: time) -> int:
+    """
+    Bitmask of the 15-minute cells touched by [start, end).
+    Cached: the same windows and job times recur across days and requests.
+    """
+    start_minute = start.hour * 60 + start.minute
+    end_minute = end.hour * 60 + end.minute + (1 if end.second or end.microsecond else 0)
+    first = start_minute // SLOT_CELL_MINUTES
+    last = -(-end_minute // SLOT_CELL_MINUTES)  # ceil
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+@lru_cache(maxsize=4096)
+def _working_mask(start: time, end: time) -> int:
+    """
+    Bitmask of the 15-minute cells fully inside [start, end).
+    Used for working hours, so a window never starts before a block opens.
+    """
+    start_minute = start.hour * 60 + start.minute + (1 if start.second or start.microsecond else 0)
+    end_minute = end.hour * 60 + end.minute
+    first = -(-start_minute // SLOT_CELL_MINUTES)  # ceil
+    last = end_minute // SLOT_CELL_MINUTES
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def _haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points, in miles."""
+    lat1, lng1, lat2, lng2 = map(radians, (lat1, lng1, lat2, lng2))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * asin(sqrt(a))
+
+
+def _mask_runs(mask: int) -> List[tuple]:
+    """Split a day mask into contiguous (first_cell, last_cell) runs, end exclusive."""
+    runs = []
+    cell = 0
+    while mask:
+        if mask & 1:
+            run_start = cell
+            while mask & 1:
+                mask >>= 1
+                cell += 1
+            runs.append((run_start, cell))
+        else:
+            skip = (mask & -mask).bit_length() - 1
+            mask >>= skip
+            cell += skip
+    return runs
+
 
 class ScheduleService:
     """Service for schedule and availability operations."""
@@ -23,6 +108,7 @@ class ScheduleService:
     def __init__(self, db: AsyncSession, business_id: UUID):
         self.db = db
         self.business_id = business_id
+        self._active_technicians: Optional[List[Technician]] = None
     
     async def get_availability(
         self,
@@ -35,37 +121,52 @@ class ScheduleService:
         Get available time slots for a date range.
         Returns list of days with available windows.
         """
-        availability = []
-        current_date = date_from
+        week_masks = await self.get_week_masks(technician_id)
         
+        days = []
+        current_date = date_from
         while current_date <= date_to:
-            windows = await self._get_day_availability(
-                current_date, service_type, technician_id
-            )
+            days.append(current_date)
+            current_date += timedelta(days=1)
+        if not days:
+            return []
+        
+        # Jobs, time off and holds for the whole range, fetched up front
+        blocked_masks = await self._get_blocked_masks(days, technician_id)
+        
+        availability = []
+        for check_date in days:
+            # Convert to our format (0=Sunday; Python's weekday() is 0=Monday)
+            working_mask = week_masks[(check_date.weekday() + 1) % 7]
             availability.append(DayAvailability(
-                date=current_date,
-                windows=windows
+                date=check_date,
+                windows=self._day_windows(check_date, working_mask, blocked_masks[check_date]),
             ))
-            current_date += timedelta(days=1)
         
         return availability
     
-    async def _get_day_availability(
-        self,
-        check_date: date,
-        service_type: Optional[str] = None,
-        technician_id: Optional[UUID] = None,
-    ) -> List[TimeSlot]:
-        """Get available windows for a specific day."""
-        
-        day_of_week = check_date.weekday()  # 0=Monday in Python
-        # Convert to our format (0=Sunday)
-        day_of_week = (day_of_week + 1) % 7
-        
-        # Get schedule blocks for this day
-        query = select(ScheduleBlock).where(
+    def _week_mask_key(self, technician_id: Optional[UUID]) -> str:
+        """Redis key for the cached weekly masks (business-wide when no technician)."""
+        return f"schedule_mask:{self.business_id}:{technician_id or 'business'}"
+    
+    async def get_week_masks(self, technician_id: Optional[UUID] = None) -> List[int]:
+        """
+        Working-hours bitmask for each day of the week (index 0=Sunday).
+        Overlapping schedule blocks are merged by OR-ing them together.
+        Cached in Redis, since schedules rarely change.
+        """
+        redis = await get_redis()
+        key = self._week_mask_key(technician_id)
+        cached = await redis.get(key)
+        if cached:
+            return [int(day_mask, 16) for day_mask in cached.split(",")]
+        
+        query = select(
+            ScheduleBlock.day_of_week,
+            ScheduleBlock.start_time,
+            ScheduleBlock.end_time,
+        ).where(
             ScheduleBlock.business_id == self.business_id,
-            ScheduleBlock.day_of_week == day_of_week,
             ScheduleBlock.is_available == True
         )
         if technician_id:
@@ -76,34 +177,66 @@ class ScheduleService:
                 )
             )
         
-        result = await self.db.execute(query)
-        schedule_blocks = list(result.scalars())
-        
-        if not schedule_blocks:
-            # No schedule defined, return empty
-            return []
+        week_masks = [0] * 7
+        for day_of_week, start_time, end_time in await self.db.execute(query):
+            week_masks[day_of_week] |= _working_mask(start_time, end_time)
         
-        # Get existing jobs for this day
-        jobs_query = select(Job).where(
+        await redis.set(
+            key,
+            ",".join(format(day_mask, "x") for day_mask in week_masks),
+            ex=SCHEDULE_MASK_TTL,
+        )
+        return week_masks
+    
+    async def invalidate_week_masks(self):
+        """Drop cached weekly masks. Call after any ScheduleBlock write."""
+        redis = await get_redis()
+        keys = [key async for key in redis.scan_iter(match=f"schedule_mask:{self.business_id}:*")]
+        if keys:
+            await redis.delete(*keys)
+    
+    async def _get_blocked_masks(
+        self,
+        days: List[date],
+        technician_id: Optional[UUID] = None,
+    ) -> Dict[date, int]:
+        """
+        Mask of the cells taken out of each day by jobs, holds and time off.
+        One query each for jobs and time off across the range, one Redis
+        round trip for the holds.
+        """
+        date_from, date_to = days[0], days[-1]
+        blocked_masks = dict.fromkeys(days, 0)
+        
+        # Existing jobs in the range
+        jobs_query = select(
+            Job.scheduled_date,
+            Job.scheduled_time_start,
+            Job.scheduled_time_end,
+        ).where(
             Job.business_id == self.business_id,
-            Job.scheduled_date == check_date,
-            Job.status.not_in([JobStatus.CANCELLED])
+            Job.scheduled_date.between(date_from, date_to),
+            Job.status != JobStatus.CANCELLED,
+            Job.scheduled_time_start.is_not(None),
+            Job.scheduled_time_end.is_not(None),
         )
         if technician_id:
             jobs_query = jobs_query.where(Job.technician_id == technician_id)
         
-        jobs_result = await self.db.execute(jobs_query)
-        existing_jobs = list(jobs_result.scalars())
+        for scheduled_date, start_time, end_time in await self.db.execute(jobs_query):
+            blocked_masks[scheduled_date] |= _time_range_mask(start_time, end_time)
         
-        # Get active reservations
-        redis = await get_redis()
-        reserved_slots = await self._get_reserved_slots(check_date)
+        # Active reservations
+        reserved_slots = await self._get_reserved_slots(days)
+        for check_date, reservations in reserved_slots.items():
+            for reservation in reservations:
+                blocked_masks[check_date] |= _time_range_mask(reservation["start"], reservation["end"])
         
-        # Get time off
+        # Time off overlapping the range
         time_off_query = select(TimeOff).where(
             TimeOff.business_id == self.business_id,
-            TimeOff.start_date <= check_date,
-            TimeOff.end_date >= check_date
+            TimeOff.start_date <= date_to,
+            TimeOff.end_date >= date_from
         )
         if technician_id:
             time_off_query = time_off_query.where(
@@ -113,100 +246,89 @@ class ScheduleService:
                 )
             )
         time_off_result = await self.db.execute(time_off_query)
-        time_offs = list(time_off_result.scalars())
+        
+        for time_off in time_off_result.scalars():
+            if time_off.all_day:
+                time_off_mask = FULL_DAY_MASK
+            elif time_off.start_time and time_off.end_time:
+                time_off_mask = _time_range_mask(time_off.start_time, time_off.end_time)
+            else:
+                continue
+            
+            for check_date in days:
+                if time_off.start_date <= check_date <= time_off.end_date:
+                    blocked_masks[check_date] |= time_off_mask
+        
+        return blocked_masks
+    
+    def _day_windows(self, check_date: date, working_mask: int, blocked_mask: int) -> List[TimeSlot]:
+        """Available windows for a day, from its working and blocked masks."""
+        if not working_mask:
+            # No schedule defined, return empty
+            return []
         
         # Generate time slots (2-hour windows by default)
         windows = []
         slot_duration = timedelta(hours=2)
         
-        for block in schedule_blocks:
-            current_time = datetime.combine(check_date, block.start_time)
-            end_time = datetime.combine(check_date, block.end_time)
+        day_start = datetime.combine(check_date, time.min)
+        
+        for first_cell, last_cell in _mask_runs(working_mask):
+            current_time = day_start + timedelta(minutes=first_cell * SLOT_CELL_MINUTES)
+            end_time = day_start + timedelta(minutes=last_cell * SLOT_CELL_MINUTES)
             
             while current_time + slot_duration <= end_time:
                 slot_start = current_time.time()
                 slot_end = (current_time + slot_duration).time()
                 
-                # Check if slot is available
-                is_available = self._is_slot_available(
-                    slot_start, slot_end,
-                    existing_jobs, reserved_slots, time_offs
-                )
-                
                 windows.append(TimeSlot(
                     start=slot_start,
                     end=slot_end,
-                    available=is_available
+                    available=not (_time_range_mask(slot_start, slot_end) & blocked_mask)
                 ))
                 
                 current_time += slot_duration
         
         return windows
     
-    def _is_slot_available(
-        self,
-        slot_start: time,
-        slot_end: time,
-        existing_jobs: List[Job],
-        reserved_slots: List[dict],
-        time_offs: List[TimeOff],
-    ) -> bool:
-        """Check if a specific slot is available."""
-        
-        # Check against existing jobs
-        for job in existing_jobs:
-            if job.scheduled_time_start and job.scheduled_time_end:
-                if self._times_overlap(
-                    slot_start, slot_end,
-                    job.scheduled_time_start, job.scheduled_time_end
-                ):
-                    return False
-        
-        # Check against reservations
-        for reservation in reserved_slots:
-            if self._times_overlap(
-                slot_start, slot_end,
-                reservation["start"], reservation["end"]
-            ):
-                return False
-        
-        # Check against time off
-        for time_off in time_offs:
-            if time_off.all_day:
-                return False
-            if time_off.start_time and time_off.end_time:
-                if self._times_overlap(
-                    slot_start, slot_end,
-                    time_off.start_time, time_off.end_time
-                ):
-                    return False
-        
-        return True
-    
-    def _times_overlap(
-        self,
-        start1: time, end1: time,
-        start2: time, end2: time
-    ) -> bool:
-        """Check if two time ranges overlap."""
-        return start1 < end2 and end1 > start2
-    
-    async def _get_reserved_slots(self, check_date: date) -> List[dict]:
-        """Get active slot reservations from Redis."""
+    async def _get_reserved_slots(self, days: List[date]) -> Dict[date, List[dict]]:
+        """
+        Get active slot reservations from Redis, per day.
+        Reads each day's reservation index (scored by expiry) in one pipeline.
+        """
         redis = await get_redis()
-        pattern = f"slot_reservation:{self.business_id}:{check_date}:*"
-        
-        reserved = []
-        async for key in redis.scan_iter(match=pattern):
-            data = await redis.hgetall(key)
-            if data:
-                reserved.append({
-                    "start": time.fromisoformat(data["start_time"]),
-                    "end": time.fromisoformat(data["end_time"]),
+        now_ts = datetime.utcnow().timestamp()
+        
+        pipe = redis.pipeline(transaction=False)
+        for check_date in days:
+            pipe.zrangebyscore(self._reservation_index_key(check_date), now_ts, "+inf")
+        results = await pipe.execute()
+        
+        reserved = {}
+        for check_date, members in zip(days, results):
+            reserved[check_date] = []
+            for member in members:
+                start, end, _ = member.split("|", 2)
+                reserved[check_date].append({
+                    "start": time.fromisoformat(start),
+                    "end": time.fromisoformat(end),
                 })
         
         return reserved
     
+    def _reservation_token_key(self, token: str) -> str:
+        """Redis key holding a reservation's record."""
+        return f"slot_reservation_token:{self.business_id}:{token}"
+    
+    def _reservation_index_key(self, slot_date: date) -> str:
+        """Sorted set of a day's holds, scored by expiry timestamp."""
+        return f"slot_reservations:{self.business_id}:{slot_date}"
+    
+    @staticmethod
+    def _reservation_member(start_time: time, end_time: time, token: str) -> str:
+        """Index member for a hold: "start|end|token"."""
+        return f"{start_time.isoformat()}|{end_time.isoformat()}|{token}"
+    
     async def reserve_slot(
         self,
         customer_id: UUID,
@@ -216,25 +338,48 @@ class ScheduleService:
     ) -> SlotReservation:
         """
         Create a temporary slot reservation.
-        Stores in both Redis (for fast lookup) and DB (for persistence).
+        Holds live only in Redis (with TTL); the DB row is written when the
+        reservation is confirmed. Raises ValueError if the time overlaps a
+        current hold.
         """
         
         # Generate unique token
         token = secrets.token_urlsafe(32)
-        expires_at = datetime.utcnow() + timedelta(minutes=settings.SLOT_RESERVATION_MINUTES)
+        ttl_seconds = settings.SLOT_RESERVATION_MINUTES * 60
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
         
-        # Store in Redis for fast checking
         redis = await get_redis()
-        redis_key = f"slot_reservation:{self.business_id}:{slot_date}:{token}"
-        await redis.hset(redis_key, mapping={
+        reserve = redis.register_script(RESERVE_SLOT_SCRIPT)
+        
+        # The whole record in one string (never updated in place), so
+        # validation is a single GET
+        record = orjson.dumps({
             "customer_id": str(customer_id),
+            "slot_date": slot_date.isoformat(),
             "start_time": start_time.isoformat(),
             "end_time": end_time.isoformat(),
+            "expires_at": expires_at.isoformat(),
         })
-        await redis.expireat(redis_key, expires_at)
         
-        # Store in DB
-        reservation = SlotReservation(
+        # Overlap check and hold happen in one script, so two holds on
+        # overlapping times can't both succeed
+        reserved = await reserve(
+            keys=[self._reservation_index_key(slot_date), self._reservation_token_key(token)],
+            args=[
+                datetime.utcnow().timestamp(),
+                start_time.isoformat(),
+                end_time.isoformat(),
+                self._reservation_member(start_time, end_time, token),
+                expires_at.timestamp(),
+                ttl_seconds,
+                record,
+            ],
+        )
+        if not reserved:
+            raise ValueError("Time slot is already reserved")
+        
+        # Transient (unsaved) reservation describing the hold
+        return SlotReservation(
             business_id=self.business_id,
             reservation_token=token,
             customer_id=customer_id,
@@ -243,53 +388,52 @@ class ScheduleService:
             slot_end_time=end_time,
             expires_at=expires_at,
         )
-        self.db.add(reservation)
-        await self.db.commit()
-        await self.db.refresh(reservation)
-        
-        return reservation
     
     async def confirm_reservation(self, token: str, job_id: UUID) -> bool:
-        """Mark a reservation as confirmed (converted to job)."""
-        
-        # Find reservation
-        result = await self.db.execute(
-            select(SlotReservation).where(
-                SlotReservation.reservation_token == token,
-                SlotReservation.business_id == self.business_id,
-                SlotReservation.is_confirmed == False,
-                SlotReservation.expires_at > datetime.utcnow()
-            )
-        )
-        reservation = result.scalar_one_or_none()
+        """Persist a held reservation as confirmed (converted to job)."""
         
+        reservation = await self.validate_reservation(token)
         if not reservation:
             return False
         
-        # Update reservation
+        # Materialize the reservation now that it became a job
         reservation.is_confirmed = True
         reservation.job_id = job_id
         reservation.confirmed_at = datetime.utcnow()
+        self.db.add(reservation)
+        await self.db.commit()
         
-        # Remove from Redis
+        # Release the hold
         redis = await get_redis()
-        redis_key = f"slot_reservation:{self.business_id}:{reservation.slot_date}:{token}"
-        await redis.delete(redis_key)
-        
-        await self.db.commit()
+        pipe = redis.pipeline(transaction=True)
+        pipe.delete(self._reservation_token_key(token))
+        pipe.zrem(
+            self._reservation_index_key(reservation.slot_date),
+            self._reservation_member(reservation.slot_start_time, reservation.slot_end_time, token),
+        )
+        await pipe.execute()
         return True
     
     async def validate_reservation(self, token: str) -> Optional[SlotReservation]:
-        """Validate a reservation token is still valid."""
-        result = await self.db.execute(
-            select(SlotReservation).where(
-                SlotReservation.reservation_token == token,
-                SlotReservation.business_id == self.business_id,
-                SlotReservation.is_confirmed == False,
-                SlotReservation.expires_at > datetime.utcnow()
-            )
+        """
+        Validate a reservation token is still held.
+        Returns a transient SlotReservation, or None if expired/unknown.
+        """
+        redis = await get_redis()
+        record = await redis.get(self._reservation_token_key(token))
+        if not record:
+            return None
+        
+        data = orjson.loads(record)
+        return SlotReservation(
+            business_id=self.business_id,
+            reservation_token=token,
+            customer_id=UUID(data["customer_id"]),
+            slot_date=date.fromisoformat(data["slot_date"]),
+            slot_start_time=time.fromisoformat(data["start_time"]),
+            slot_end_time=time.fromisoformat(data["end_time"]),
+            expires_at=datetime.fromisoformat(data["expires_at"]),
         )
-        return result.scalar_one_or_none()
     
     async def find_available_technician(
         self,
@@ -304,10 +448,7 @@ class ScheduleService:
         """
         
         # Get active technicians
-        query = select(Technician).where(
-            Technician.business_id == self.business_id,
-            Technician.is_active == True
-        )
+        technicians = await self._get_active_technicians()
         
         # For emergencies after hours, only get on-call techs
         # (This logic would be enhanced based on time of day)
@@ -315,22 +456,49 @@ class ScheduleService:
             # Include all active techs for emergencies
             pass
         
-        result = await self.db.execute(query)
-        technicians = list(result.scalars())
-        
         if not technicians:
             return None
         
-        # For MVP, return first available tech
-        # TODO: Implement distance calculation with Google Maps
+        # Nearest tech by last reported position (straight-line distance);
+        # first tech when the job or no tech has a location
+        # TODO: Road distance/ETA with Google Maps
         # TODO: Check current job assignments
-        
-        best_tech = technicians[0]
+        located = [
+            tech for tech in technicians
+            if tech.current_latitude is not None and tech.current_longitude is not None
+        ]
+        best_tech, distance = technicians[0], None
+        if (location_lat or location_lng) and located:
+            best_tech, distance = min(
+                (
+                    (tech, _haversine_miles(
+                        location_lat, location_lng,
+                        tech.current_latitude, tech.current_longitude,
+                    ))
+                    for tech in located
+                ),
+                key=lambda pair: pair[1],
+            )
         
         return {
             "tech_id": best_tech.id,
             "tech_name": best_tech.name,
             "tech_phone": best_tech.phone,
             "eta_minutes": 30,  # Placeholder - would calculate actual ETA
-            "distance_miles": 5.0,  # Placeholder
+            "distance_miles": round(distance, 1) if distance is not None else 5.0,  # Placeholder when unknown
         }
+    
+    async def _get_active_technicians(self) -> List[Technician]:
+        """
+        Active technicians, loaded once per service instance so matching
+        several jobs (e.g. an escalation sweep) doesn't re-query per job.
+        """
+        if self._active_technicians is None:
+            result = await self.db.execute(
+                select(Technician).where(
+                    Technician.business_id == self.business_id,
+                    Technician.is_active == True
+                )
+            )
+            self._active_technicians = list(result.scalars())
+        return self._active_technicians
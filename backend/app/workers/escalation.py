@@ -7,37 +7,60 @@ Runs every 15 minutes.
 import asyncio
 from sqlalchemy import select
 
+from app.config import get_settings
 from app.database import AsyncSessionLocal
 from app.models.business import Business
 from app.services.escalation_service import EscalationService
 
+settings = get_settings()
+
+# Businesses processed at once; each holds its own DB connection, so stay
+# within the pool rather than queueing on it
+BUSINESS_CONCURRENCY = min(16, settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW)
+
+
+async def _escalate_business(business_id, business_name: str, semaphore: asyncio.Semaphore) -> list:
+    """Run one business's escalation sweep in its own session."""
+    async with semaphore, AsyncSessionLocal() as db:
+        escalation_service = EscalationService(db, business_id)
+        actions = await escalation_service.check_and_escalate_jobs()
+    
+    if actions:
+        print(f"Business {business_name}: {len(actions)} escalations")
+        for action in actions:
+            print(f"  - Job {action['confirmation_code']}: {action['action']}")
+    
+    return actions
+
 
 async def run_escalation_checks():
     """
     Main escalation job.
-    Checks all pending jobs across all businesses and escalates as needed.
+    Checks all pending jobs across all businesses and escalates as needed,
+    several businesses at a time.
     """
     async with AsyncSessionLocal() as db:
         # Get all active businesses
         result = await db.execute(
-            select(Business).where(Business.is_active == True)
+            select(Business.id, Business.name).where(Business.is_active == True)
         )
-        businesses = result.scalars().all()
-        
-        total_actions = []
-        
-        for business in businesses:
-            escalation_service = EscalationService(db, business.id)
-            actions = await escalation_service.check_and_escalate_jobs()
-            
-            if actions:
-                print(f"Business {business.name}: {len(actions)} escalations")
-                for action in actions:
-                    print(f"  - Job {action['confirmation_code']}: {action['action']}")
-            
-            total_actions.extend(actions)
-        
-        return total_actions
+        businesses = result.all()
+    
+    semaphore = asyncio.Semaphore(BUSINESS_CONCURRENCY)
+    # One failing business doesn't stop the others
+    results = await asyncio.gather(
+        *(_escalate_business(business_id, name, semaphore) for business_id, name in businesses),
+        return_exceptions=True,
+    )
+    
+    total_actions = []
+    for (business_id, name), outcome in zip(businesses, results):
+        if isinstance(outcome, Exception):
+            print(f"Escalation failed for business {name} ({business_id}): {outcome}")
+            continue
+        total_actions.extend(outcome)
+    
+    return total_actions
 
 
 # Entry point for running as standalone script
@@ -0,0 +1,155 @@
+"""
+Notification dispatch worker.
+NotificationService commits new notifications as PENDING and appends their
+ids to a Redis stream; this worker drains the stream and makes the provider
+calls, so Twilio latency never holds a request's DB connection.
+Runs continuously alongside the API (started from the app lifespan).
+Entries whose dispatch failed (or whose consumer died) stay pending in the
+group and are reclaimed with XAUTOCLAIM once idle.
+"""
+
+import asyncio
+import logging
+import socket
+import time
+from collections import defaultdict
+from typing import List
+from uuid import UUID
+from sqlalchemy import select
+from redis.exceptions import ResponseError
+
+from app.database import AsyncSessionLocal, get_redis
+from app.logging_config import start_log_listener
+from app.models.notification import Notification, NotificationStatus
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_STREAM = "notifications:dispatch"
+DISPATCH_GROUP = "dispatcher"
+BATCH_SIZE = 100
+BLOCK_MS = 1000
+CLAIM_IDLE_MS = 60_000  # pending this long means the reader failed or died
+CLAIM_INTERVAL = 30  # seconds between sweeps for reclaimable entries
+
+
+async def enqueue_dispatch(notification_ids: List[UUID]):
+    """Append committed notification ids to the dispatch stream."""
+    if not notification_ids:
+        return
+    
+    redis = await get_redis()
+    pipe = redis.pipeline(transaction=False)
+    for notification_id in notification_ids:
+        pipe.xadd(DISPATCH_STREAM, {"id": str(notification_id)})
+    await pipe.execute()
+
+
+async def dispatch_notifications(db, entries: list) -> int:
+    """
+    Deliver a batch of stream entries and record the outcomes in one commit.
+    Only rows still PENDING are sent; rows already claimed elsewhere are
+    skipped. Returns number of notifications delivered.
+    """
+    from app.services.notification_service import NotificationService
+    
+    ids = [UUID(fields["id"]) for _, fields in entries]
+    result = await db.execute(
+        select(Notification)
+        .where(
+            Notification.id.in_(ids),
+            Notification.status == NotificationStatus.PENDING,
+        )
+        .with_for_update(skip_locked=True)
+    )
+    
+    by_business = defaultdict(list)
+    for notification in result.scalars():
+        by_business[notification.business_id].append(notification)
+    
+    delivered = 0
+    for business_id, notifications in by_business.items():
+        await NotificationService(db, business_id).deliver_all(notifications)
+        delivered += len(notifications)
+    
+    await db.commit()
+    return delivered
+
+
+async def _claim_stale_entries(redis, consumer: str) -> list:
+    """
+    Take over up to BATCH_SIZE entries left pending by a failed dispatch or
+    a dead consumer. Entries deleted from the stream meanwhile are skipped.
+    """
+    response = await redis.xautoclaim(
+        DISPATCH_STREAM,
+        DISPATCH_GROUP,
+        consumer,
+        min_idle_time=CLAIM_IDLE_MS,
+        count=BATCH_SIZE,
+    )
+    return [(entry_id, fields) for entry_id, fields in response[1] if fields]
+
+
+async def run_notification_dispatcher():
+    """
+    Main dispatch loop.
+    Reads up to BATCH_SIZE entries at a time through a consumer group so
+    several API workers can share the stream. The consumer name is the
+    host's, so it survives restarts; stale pending entries are reclaimed
+    on startup and every CLAIM_INTERVAL seconds (re-dispatch is safe, only
+    rows still PENDING are delivered).
+    """
+    consumer = socket.gethostname()
+    group_ready = False
+    next_claim = 0.0
+    
+    while True:
+        try:
+            redis = await get_redis()
+            if not group_ready:
+                try:
+                    await redis.xgroup_create(DISPATCH_STREAM, DISPATCH_GROUP, id="0", mkstream=True)
+                except ResponseError as e:
+                    if "BUSYGROUP" not in str(e):
+                        raise
+                group_ready = True
+            
+            entries = []
+            if time.monotonic() >= next_claim:
+                entries = await _claim_stale_entries(redis, consumer)
+                if len(entries) < BATCH_SIZE:
+                    next_claim = time.monotonic() + CLAIM_INTERVAL
+            
+            if not entries:
+                response = await redis.xreadgroup(
+                    DISPATCH_GROUP,
+                    consumer,
+                    {DISPATCH_STREAM: ">"},
+                    count=BATCH_SIZE,
+                    block=BLOCK_MS,
+                )
+                if not response:
+                    continue
+                entries = response[0][1]
+            
+            async with AsyncSessionLocal() as db:
+                delivered = await dispatch_notifications(db, entries)
+            
+            await redis.xack(DISPATCH_STREAM, DISPATCH_GROUP, *[entry_id for entry_id, _ in entries])
+            await redis.xdel(DISPATCH_STREAM, *[entry_id for entry_id, _ in entries])
+            logger.info("Notification dispatch: %d queued, %d delivered", len(entries), delivered)
+        
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Notification dispatch error")
+            await asyncio.sleep(1)
+
+
+# Entry point for running as standalone script
+if __name__ == "__main__":
+    listener = start_log_listener()
+    try:
+        asyncio.run(run_notification_dispatcher())
+    finally:
+        listener.stop()
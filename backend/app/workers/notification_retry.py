@@ -7,46 +7,74 @@ Runs every 5 minutes.
 import asyncio
 from sqlalchemy import select
 
+from app.config import get_settings
 from app.database import AsyncSessionLocal
 from app.models.business import Business
-from app.services.notification_service import NotificationService
+from app.models.notification import NotificationStatus
+from app.services.notification_service import NotificationService, RETRY_BATCH_SIZE
+
+settings = get_settings()
+
+# Businesses processed at once; each holds its own DB connection, so stay
+# within the pool rather than queueing on it
+BUSINESS_CONCURRENCY = min(16, settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW)
+
+
+async def _retry_business(business_id, semaphore: asyncio.Semaphore) -> dict:
+    """Retry one business's failed notifications in its own session."""
+    async with semaphore, AsyncSessionLocal() as db:
+        notification_service = NotificationService(db, business_id)
+        
+        retries = 0
+        successes = 0
+        while True:
+            # Claim and retry due notifications a batch at a time
+            batch = await notification_service.retry_due_notifications(RETRY_BATCH_SIZE)
+            
+            for notification in batch:
+                retries += 1
+                if notification.status == NotificationStatus.SENT:
+                    successes += 1
+                    print(f"Retry successful: {notification.id}")
+                else:
+                    print(f"Retry failed: {notification.id}")
+            
+            if len(batch) < RETRY_BATCH_SIZE:
+                break
+        
+        return {"retries": retries, "successes": successes}
 
 
 async def retry_failed_notifications():
     """
     Main notification retry job.
-    Finds failed notifications and retries them.
+    Finds failed notifications and retries them, several businesses at a time.
     """
     async with AsyncSessionLocal() as db:
         # Get all active businesses
         result = await db.execute(
-            select(Business).where(Business.is_active == True)
+            select(Business.id).where(Business.is_active == True)
         )
-        businesses = result.scalars().all()
-        
-        total_retries = 0
-        total_successes = 0
-        
-        for business in businesses:
-            notification_service = NotificationService(db, business.id)
-            
-            # Get failed notifications that need retry
-            failed = await notification_service.get_failed_notifications_for_retry()
-            
-            for notification in failed:
-                result = await notification_service.retry_notification(notification.id)
-                total_retries += 1
-                
-                if result and result.status.value == "sent":
-                    total_successes += 1
-                    print(f"Retry successful: {notification.id}")
-                else:
-                    print(f"Retry failed: {notification.id}")
-        
-        return {
-            "retries_attempted": total_retries,
-            "successes": total_successes,
-        }
+        business_ids = result.scalars().all()
+    
+    semaphore = asyncio.Semaphore(BUSINESS_CONCURRENCY)
+    # One failing business doesn't stop the others
+    outcomes = await asyncio.gather(
+        *(_retry_business(business_id, semaphore) for business_id in business_ids),
+        return_exceptions=True,
+    )
+    
+    results = []
+    for business_id, outcome in zip(business_ids, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"Notification retry failed for business {business_id}: {outcome}")
+            continue
+        results.append(outcome)
+    
+    return {
+        "retries_attempted": sum(r["retries"] for r in results),
+        "successes": sum(r["successes"] for r in results),
+    }
 
 
 # Entry point for running as standalone script
@@ -0,0 +1,37 @@
+"""
+OTP cleanup worker.
+Purges expired OTP codes in one statement instead of deleting per request.
+Runs every minute.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import delete
+
+from app.database import AsyncSessionLocal
+from app.models.customer import OTPCode
+
+# Keep expired codes around briefly for debugging/auditing
+OTP_RETENTION = timedelta(hours=1)
+
+
+async def purge_expired_otps() -> int:
+    """
+    Main OTP cleanup job.
+    Deletes codes that expired more than OTP_RETENTION ago.
+    Returns number of codes deleted.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            delete(OTPCode).where(
+                OTPCode.expires_at < datetime.utcnow() - OTP_RETENTION
+            )
+        )
+        await db.commit()
+        return result.rowcount
+
+
+# Entry point for running as standalone script
+if __name__ == "__main__":
+    deleted = asyncio.run(purge_expired_otps())
+    print(f"Purged {deleted} expired OTP codes")
@@ -1,19 +1,55 @@
 """
 Call reconciliation worker.
 Recovers missed jobs from failed webhooks by checking Vapi call logs.
-Runs every 5 minutes.
+Runs continuously alongside the API (started from the app lifespan), with
+one pass every 5 minutes across all API processes, sharing the app's DB
+pool and Vapi HTTP client.
 """
 
 import asyncio
-from datetime import datetime, timedelta
-from sqlalchemy import select
+import logging
+import secrets
+from collections import defaultdict
+from datetime import datetime, date, time, timedelta
+from types import MappingProxyType
+from uuid import UUID
+from sqlalchemy import select, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import AsyncSessionLocal
+from app.config import get_settings
+from app.logging_config import start_log_listener
+from app.database import AsyncSessionLocal, close_db, get_redis, warm_db_pool
 from app.models.notification import CallLog
 from app.models.business import Business
-from app.integrations.vapi_client import VapiClient
+from app.models.job import JobSource
+from app.integrations.vapi_client import get_vapi_client, close_http_client as close_vapi_client
+from app.schemas.job import JobCreate
+from app.services.customer_service import CustomerService
 from app.services.job_service import JobService
+from app.services.notification_service import NotificationService
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Seconds between reconciliation passes
+RECONCILE_INTERVAL = 300
+
+# Claimed by whichever process runs the current pass; held for the whole
+# interval so other API workers skip it
+RECONCILE_LOCK_KEY = "reconciliation:pass"
+
+# Upper bound on calls fetched per run (covers every business)
+RECONCILE_FETCH_LIMIT = 1000
+
+# Businesses reconciled at once; each holds its own DB connection, so stay
+# within the pool rather than queueing on it
+BUSINESS_CONCURRENCY = min(16, settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW)
+
+# Call outcomes that should have produced a job
+JOB_OUTCOMES = frozenset({"booking_confirmed", "emergency_dispatched"})
+
+# Shared stand-in for missing (or null) nested objects in Vapi call payloads
+_EMPTY = MappingProxyType({})
 
 
 async def reconcile_calls():
@@ -21,125 +57,189 @@ async def reconcile_calls():
     Main reconciliation job.
     Fetches recent calls from Vapi and creates any missing jobs.
     """
-    async with AsyncSessionLocal() as db:
-        # Get all active businesses
-        result = await db.execute(
-            select(Business).where(Business.is_active == True)
-        )
-        businesses = result.scalars().all()
-        
-        vapi = VapiClient()
-        
-        for business in businesses:
-            await _reconcile_business_calls(db, business, vapi)
-
-
-async def _reconcile_business_calls(
-    db: AsyncSession,
-    business: Business,
-    vapi: VapiClient,
-):
-    """Reconcile calls for a specific business."""
+    vapi = get_vapi_client()
+    
+    # One timestamp for the whole run (reconciled_at matches the fetch window)
+    now = datetime.utcnow()
     
-    # Get calls from last 30 minutes
-    since = datetime.utcnow() - timedelta(minutes=30)
+    # Get calls from last 30 minutes in one fetch for all businesses
+    since = now - timedelta(minutes=30)
     
     try:
         calls = await vapi.list_calls(
             created_after=since,
             status="completed",
+            limit=RECONCILE_FETCH_LIMIT,
         )
     except Exception as e:
-        print(f"Failed to fetch Vapi calls for {business.id}: {e}")
+        logger.exception("Failed to fetch Vapi calls: %s", e)
         return
     
+    # Group calls by the business they were placed for
+    calls_by_business = defaultdict(list)
     for call in calls:
-        # Check if this call's business_id matches
-        call_business_id = call.get("metadata", {}).get("business_id")
-        if call_business_id != str(business.id):
+        call_business_id = (call.get("metadata") or _EMPTY).get("business_id")
+        if not call_business_id:
             continue
-        
-        call_id = call.get("id")
-        
-        # Check if we already have a record
-        existing = await db.execute(
-            select(CallLog).where(CallLog.external_call_id == call_id)
+        try:
+            business_id = UUID(str(call_business_id))
+        except ValueError:
+            # Malformed metadata skips this call, not the whole pass
+            logger.warning(
+                "Skipping call %s with invalid business_id %r",
+                call.get("id"), call_business_id,
+            )
+            continue
+        calls_by_business[business_id].append(call)
+    
+    if not calls_by_business:
+        return
+    
+    async with AsyncSessionLocal() as db:
+        # Get active businesses that have recent calls
+        result = await db.execute(
+            select(Business.id).where(
+                Business.is_active == True,
+                Business.id.in_(list(calls_by_business)),
+            )
         )
-        call_log = existing.scalar_one_or_none()
+        business_ids = result.scalars().all()
+    
+    semaphore = asyncio.Semaphore(BUSINESS_CONCURRENCY)
+    
+    async def reconcile(business_id: UUID):
+        async with semaphore, AsyncSessionLocal() as db:
+            await _reconcile_business_calls(
+                db, business_id, calls_by_business[business_id], now
+            )
+    
+    # One failing business doesn't stop the others
+    results = await asyncio.gather(
+        *(reconcile(business_id) for business_id in business_ids),
+        return_exceptions=True,
+    )
+    for business_id, outcome in zip(business_ids, results):
+        if isinstance(outcome, Exception):
+            logger.error(
+                "Reconciliation failed for business %s: %s", business_id, outcome,
+                exc_info=outcome,
+            )
+
+
+async def _reconcile_business_calls(
+    db: AsyncSession,
+    business_id: UUID,
+    calls: list,
+    now: datetime,
+):
+    """Reconcile calls for a specific business (in its own session)."""
+    
+    # Only calls whose outcome should have produced a job can need recovery;
+    # the rest never touch the database
+    booked_calls = []
+    for call in calls:
+        outcome = (call.get("analysis") or _EMPTY).get("outcome")
+        if outcome in JOB_OUTCOMES:
+            booked_calls.append((call.get("id"), outcome, call))
+    
+    if not booked_calls:
+        return
+    booked_call_ids = [call_id for call_id, _, _ in booked_calls]
+    
+    # Load existing call logs for the whole batch at once (only the columns
+    # the check needs; rows carry full transcripts)
+    existing = await db.execute(
+        select(
+            CallLog.external_call_id,
+            CallLog.id,
+            CallLog.webhook_processed,
+        ).where(
+            CallLog.external_call_id.in_(booked_call_ids)
+        )
+    )
+    call_logs = {row.external_call_id: row for row in existing}
+    
+    # Likewise which of those calls already produced a job
+    job_service = JobService(db, business_id)
+    call_ids_with_jobs = await job_service.get_call_ids_with_jobs(booked_call_ids)
+    
+    reconciled_log_ids = []
+    new_call_logs = []
+    
+    for call_id, outcome, call in booked_calls:
+        call_log = call_logs.get(call_id)
         
         if call_log and call_log.webhook_processed:
             # Already processed
             continue
         
-        # Check if outcome indicates a job should exist
-        outcome = call.get("analysis", {}).get("outcome")
+        if call_id in call_ids_with_jobs:
+            # Job exists
+            continue
+        
+        # MISSING JOB - attempt recovery
+        await _recover_job_from_call(db, business_id, call)
+        
+        # Log the reconciliation
+        if call_log:
+            reconciled_log_ids.append(call_log.id)
+        else:
+            new_call_logs.append({
+                "business_id": business_id,
+                "external_call_id": call_id,
+                "provider": "vapi",
+                "call_outcome": outcome,
+                "was_reconciled": True,
+                "reconciled_at": now,
+            })
         
-        if outcome in ["booking_confirmed", "emergency_dispatched"]:
-            # Check if job exists
-            job_service = JobService(db, business.id)
-            existing_job = await job_service.get_jobs_by_call_id(call_id)
-            
-            if not existing_job:
-                # MISSING JOB - attempt recovery
-                await _recover_job_from_call(db, business, call)
-                
-                # Log the reconciliation
-                if call_log:
-                    call_log.was_reconciled = "true"
-                    call_log.reconciled_at = datetime.utcnow()
-                else:
-                    call_log = CallLog(
-                        business_id=business.id,
-                        external_call_id=call_id,
-                        provider="vapi",
-                        call_outcome=outcome,
-                        was_reconciled="true",
-                        reconciled_at=datetime.utcnow(),
-                    )
-                    db.add(call_log)
-                
-                await db.commit()
-                
-                print(f"Reconciled missing job from call {call_id}")
+        logger.info("Reconciled missing job from call %s", call_id)
+    
+    # Call log writes go out together after all recoveries (each recovery
+    # commits, or rolls back, its own job/customer/notification rows)
+    if reconciled_log_ids:
+        await db.execute(
+            update(CallLog)
+            .where(CallLog.id.in_(reconciled_log_ids))
+            .values(was_reconciled=True, reconciled_at=now)
+        )
+    if new_call_logs:
+        # ORM bulk INSERT: one multi-row statement, no per-object flush
+        await db.execute(insert(CallLog), new_call_logs)
+    await db.commit()
 
 
 async def _recover_job_from_call(
     db: AsyncSession,
-    business: Business,
+    business_id: UUID,
     call: dict,
 ):
     """
     Attempt to create a job from a call that didn't get processed.
     This is a best-effort recovery.
     """
-    from app.services.customer_service import CustomerService
-    from app.services.job_service import JobService
-    from app.services.notification_service import NotificationService
-    from app.schemas.job import JobCreate
-    from app.models.job import JobSource, JobPriority
-    from datetime import date, time
-    
-    metadata = call.get("metadata", {})
-    transcript = call.get("transcript", "")
-    summary = call.get("summary", "")
+    call_id = call.get("id")
+    metadata = call.get("metadata") or _EMPTY
+    transcript = call.get("transcript") or ""
+    summary = call.get("summary") or ""
     
     # Get or create customer
-    customer_phone = call.get("customer", {}).get("number")
+    customer_phone = (call.get("customer") or _EMPTY).get("number")
     if not customer_phone:
-        print(f"Cannot recover job - no phone number in call {call.get('id')}")
+        logger.warning("Cannot recover job - no phone number in call %s", call_id)
         return
     
-    customer_service = CustomerService(db, business.id)
+    customer_service = CustomerService(db, business_id)
     customer = await customer_service.get_or_create_by_phone(customer_phone)
+    # Customer.addresses is lazy="raise"; one query loads them, default first
+    addresses = await customer_service.list_addresses(customer.id)
     
     # Try to extract details from summary/transcript
     # This is imperfect but better than losing the job
-    job_service = JobService(db, business.id)
+    job_service = JobService(db, business_id)
     
     # Create a basic job with what we know
     try:
-        from app.schemas.job import JobAddressInline
-        
         # Default to tomorrow 9-11am if we can't parse
         tomorrow = date.today() + timedelta(days=1)
         
@@ -148,36 +248,62 @@ async def _recover_job_from_call(
             data=JobCreate(
                 service_type="general",  # Default
                 description=f"[RECOVERED FROM CALL] {summary or 'See transcript'}",
-                address_id=customer.addresses[0].id if customer.addresses else None,
+                address_id=addresses[0].id if addresses else None,
                 preferred_date=tomorrow,
                 preferred_time_start=time(9, 0),
                 preferred_time_end=time(11, 0),
             ),
             source=JobSource.PHONE_AGENT,
-            source_call_id=call.get("id"),
-        )
-        
-        # Notify owner about recovered job
-        notification_service = NotificationService(db, business.id)
-        await notification_service.notify_owner(
-            message=f"⚠️ RECOVERED JOB: {job.confirmation_code} was created from a call that didn't process correctly. Please review and confirm details with customer.",
-            job_id=job.id,
-            trigger_event="job_recovered",
-            urgent=True,
+            source_call_id=call_id,
         )
         
-        # Notify customer
-        await notification_service.notify_customer(
-            customer=customer,
-            message=f"Your service request has been received. Confirmation: {job.confirmation_code}. We'll contact you shortly to confirm details.",
-            job_id=job.id,
-            trigger_event="job_recovered",
-        )
+        # Notify owner (urgent) and customer about the recovered job
+        notification_service = NotificationService(db, business_id)
+        await notification_service.notify_job_recovered(job, customer)
         
     except Exception as e:
-        print(f"Failed to recover job from call {call.get('id')}: {e}")
+        # Leave the session usable for the rest of the batch
+        await db.rollback()
+        logger.exception("Failed to recover job from call %s: %s", call_id, e)
+
 
+async def _claim_pass() -> bool:
+    """Claim this interval's pass (False if another process already has it)."""
+    redis = await get_redis()
+    return bool(await redis.set(
+        RECONCILE_LOCK_KEY, secrets.token_hex(8), ex=RECONCILE_INTERVAL, nx=True
+    ))
 
-# Entry point for running as standalone script
+
+async def run_reconciliation_loop():
+    """
+    Main reconciliation loop.
+    Every process runs it; only the one that claims the interval reconciles.
+    A failed pass is logged and the next one runs on schedule.
+    """
+    while True:
+        try:
+            if await _claim_pass():
+                await reconcile_calls()
+        except Exception:
+            logger.exception("Reconciliation pass failed")
+        await asyncio.sleep(RECONCILE_INTERVAL)
+
+
+async def _run_standalone():
+    """Run the loop in its own process (manual runs and debugging)."""
+    await warm_db_pool()
+    try:
+        await run_reconciliation_loop()
+    finally:
+        await close_vapi_client()
+        await close_db()
+
+
+# Entry point for running as standalone script (manual runs)
 if __name__ == "__main__":
-    asyncio.run(reconcile_calls())
+    listener = start_log_listener()
+    try:
+        asyncio.run(_run_standalone())
+    finally:
+        listener.stop()
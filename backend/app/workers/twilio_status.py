@@ -0,0 +1,178 @@
+"""
+Twilio status flush worker.
+The Twilio status webhook only appends to a Redis stream; this worker drains
+the stream in batches and applies the updates with one bulk UPDATE.
+Runs continuously alongside the API (started from the app lifespan).
+Entries whose flush failed (or whose consumer died) stay pending in the
+group and are reclaimed with XAUTOCLAIM once idle, so no update is lost.
+"""
+
+import asyncio
+import logging
+import socket
+import time
+from datetime import datetime
+from sqlalchemy import update, values, column, case, String, DateTime, Text
+from redis.exceptions import ResponseError
+
+from app.database import AsyncSessionLocal, get_redis
+from app.logging_config import start_log_listener
+from app.models.notification import Notification, NotificationStatus
+
+logger = logging.getLogger(__name__)
+
+STATUS_STREAM = "twilio:status"
+STATUS_GROUP = "status-flusher"
+BATCH_SIZE = 500
+BLOCK_MS = 1000
+CLAIM_IDLE_MS = 60_000  # pending this long means the reader failed or died
+CLAIM_INTERVAL = 30  # seconds between sweeps for reclaimable entries
+
+
+async def enqueue_status_update(
+    message_sid: str,
+    status: NotificationStatus,
+    external_status: str,
+    error_message: str = None,
+):
+    """Append a Twilio status callback to the stream."""
+    redis = await get_redis()
+    await redis.xadd(STATUS_STREAM, {
+        "sid": message_sid,
+        "status": status.name,
+        "external_status": external_status,
+        "error": error_message or "",
+        "received_at": datetime.utcnow().isoformat(),
+    })
+
+
+async def flush_status_updates(db, entries: list) -> int:
+    """
+    Apply a batch of stream entries with a single UPDATE ... FROM (VALUES ...).
+    Returns number of notifications updated.
+    """
+    # Later callbacks for the same message win (stream order is arrival order)
+    latest = {}
+    for _, fields in entries:
+        latest[fields["sid"]] = fields
+    
+    rows = [
+        (
+            sid,
+            NotificationStatus[fields["status"]],
+            fields["external_status"],
+            fields["error"] or None,
+            datetime.fromisoformat(fields["received_at"]),
+        )
+        for sid, fields in latest.items()
+    ]
+    
+    v = values(
+        column("sid", String),
+        column("status", Notification.status.type),
+        column("external_status", String),
+        column("error_message", Text),
+        column("received_at", DateTime),
+        name="v",
+    ).data(rows)
+    
+    stmt = (
+        update(Notification)
+        .where(Notification.external_id == v.c.sid)
+        .values(
+            status=v.c.status,
+            external_status=v.c.external_status,
+            error_message=v.c.error_message,
+            delivered_at=case(
+                (v.c.status == NotificationStatus.DELIVERED, v.c.received_at),
+                else_=None,
+            ),
+            failed_at=case(
+                (v.c.status == NotificationStatus.FAILED, v.c.received_at),
+                else_=None,
+            ),
+        )
+    )
+    
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
+
+
+async def _claim_stale_entries(redis, consumer: str) -> list:
+    """
+    Take over up to BATCH_SIZE entries left pending by a failed flush or a
+    dead consumer. Entries deleted from the stream meanwhile are skipped.
+    """
+    response = await redis.xautoclaim(
+        STATUS_STREAM,
+        STATUS_GROUP,
+        consumer,
+        min_idle_time=CLAIM_IDLE_MS,
+        count=BATCH_SIZE,
+    )
+    return [(entry_id, fields) for entry_id, fields in response[1] if fields]
+
+
+async def run_status_flusher():
+    """
+    Main flush loop.
+    Reads up to BATCH_SIZE entries at a time through a consumer group so
+    several API workers can share the stream. The consumer name is the
+    host's, so it survives restarts; stale pending entries are reclaimed
+    on startup and every CLAIM_INTERVAL seconds.
+    """
+    consumer = socket.gethostname()
+    group_ready = False
+    next_claim = 0.0
+    
+    while True:
+        try:
+            redis = await get_redis()
+            if not group_ready:
+                try:
+                    await redis.xgroup_create(STATUS_STREAM, STATUS_GROUP, id="0", mkstream=True)
+                except ResponseError as e:
+                    if "BUSYGROUP" not in str(e):
+                        raise
+                group_ready = True
+            
+            entries = []
+            if time.monotonic() >= next_claim:
+                entries = await _claim_stale_entries(redis, consumer)
+                if len(entries) < BATCH_SIZE:
+                    next_claim = time.monotonic() + CLAIM_INTERVAL
+            
+            if not entries:
+                response = await redis.xreadgroup(
+                    STATUS_GROUP,
+                    consumer,
+                    {STATUS_STREAM: ">"},
+                    count=BATCH_SIZE,
+                    block=BLOCK_MS,
+                )
+                if not response:
+                    continue
+                entries = response[0][1]
+            
+            async with AsyncSessionLocal() as db:
+                updated = await flush_status_updates(db, entries)
+            
+            await redis.xack(STATUS_STREAM, STATUS_GROUP, *[entry_id for entry_id, _ in entries])
+            await redis.xdel(STATUS_STREAM, *[entry_id for entry_id, _ in entries])
+            logger.info("Twilio status flush: %d callbacks, %d notifications", len(entries), updated)
+        
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Twilio status flush error")
+            await asyncio.sleep(1)
+
+
+# Entry point for running as standalone script
+if __name__ == "__main__":
+    listener = start_log_listener()
+    try:
+        asyncio.run(run_status_flusher())
+    finally:
+        listener.stop()
@@ -0,0 +1,22 @@
+"""Gunicorn configuration for the ServiceAI API (uvicorn workers)."""
+
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Tunable per deployment without rebuilding the image.
+# Keep workers * (DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW) under
+# Postgres max_connections (or use PgBouncer).
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+
+# Longer than typical load balancer idle timeouts so the LB closes first
+keepalive = 75
+timeout = 60
+graceful_timeout = 30
+
+# Import the app (and build every Pydantic schema/validator) once in the
+# master; forked workers start warm. Safe: DB/Redis connections are opened
+# lazily, after the fork.
+preload_app = True
@@ -0,0 +1,58 @@
+"""OTP issue/verify against a real database (skipped when none is reachable)."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+
+from app.database import AsyncSessionLocal, engine, init_db
+from app.models.business import Business
+from app.models.customer import OTPCode
+from app.services.customer_service import CustomerService
+
+PHONE = "+15555550123"
+
+
+@pytest_asyncio.fixture
+async def business():
+    try:
+        await init_db()
+    except (OSError, asyncio.TimeoutError) as e:
+        pytest.skip(f"database not available: {e}")
+    
+    async with AsyncSessionLocal() as db:
+        business = Business(name="OTP Test Plumbing", phone="+15555550100")
+        db.add(business)
+        await db.commit()
+    
+    yield business
+    
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(OTPCode).where(OTPCode.business_id == business.id))
+        await db.execute(delete(Business).where(Business.id == business.id))
+        await db.commit()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_new_code_invalidates_older_code(business):
+    async with AsyncSessionLocal() as db:
+        service = CustomerService(db, business.id)
+        old_code = await service.create_otp(PHONE)
+        new_code = await service.create_otp(PHONE)
+        if old_code == new_code:
+            pytest.skip("both codes drew the same digits")
+        
+        assert not await service.verify_otp(PHONE, old_code)
+        assert await service.verify_otp(PHONE, new_code)
+
+
+@pytest.mark.asyncio
+async def test_code_verifies_only_once(business):
+    async with AsyncSessionLocal() as db:
+        service = CustomerService(db, business.id)
+        code = await service.create_otp(PHONE)
+        
+        assert await service.verify_otp(PHONE, code)
+        assert not await service.verify_otp(PHONE, code)